@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Source Archive
+Stores each unique file once under its hash and maps friendly names to it
+"""
+
+import os
+import json
+import shutil
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+from source_store import atomic_write_json
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# linux/fs.h: share the source file's extents with the destination
+FICLONE = 0x40049409
+
+
+def _reflink(src, dst) -> bool:
+    """Clone a file copy-on-write (btrfs, XFS, ...); False when unsupported"""
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        return False
+
+
+def _copy_range(src, dst) -> bool:
+    """Copy inside the kernel with copy_file_range; False when unsupported"""
+    copy_file_range = getattr(os, 'copy_file_range', None)
+    if copy_file_range is None:
+        return False
+    try:
+        while copy_file_range(src.fileno(), dst.fileno(), 1 << 30):
+            pass
+        return True
+    except OSError:
+        src.seek(0)
+        dst.seek(0)
+        dst.truncate()
+        return False
+
+
+class SourceArchive:
+    """Archive of ingested files keyed by SHA-256
+
+    Objects live in ``<root>/objects/<hh>/<hash><suffix>`` and are written
+    once, however often the same content is ingested. ``<root>/index.json``
+    maps friendly names (``<category>/<path below the category>``) to
+    objects, and each
+    friendly name is also a hardlink to its object when the filesystem
+    allows it, so browsing the archive costs no extra space.
+
+    ``method`` chooses how new objects are created: ``auto`` tries a
+    reflink, then copy_file_range, then a plain copy; ``hardlink`` links
+    the input file itself, which is only safe when inputs are replaced
+    rather than edited in place; ``copy`` always copies. When the caller
+    already holds the file's bytes, they are written out instead of
+    copying, so the input is not read a second time.
+    """
+
+    def __init__(self, root: str, method: str = 'auto'):
+        self.root = Path(root)
+        self.objects_dir = self.root / 'objects'
+        self.index_path = self.root / 'index.json'
+        self.method = method
+        self.logger = logging.getLogger(__name__)
+        self.reset_stats()
+        self._index = None
+        self._index_dirty = False
+
+    def reset_stats(self):
+        """Start counting stored and deduplicated files afresh"""
+        self.stats = {'stored': 0, 'deduplicated': 0, 'bytes_stored': 0}
+
+    @property
+    def index(self) -> Dict[str, Dict]:
+        """Friendly name -> {'hash', 'object', 'source'}"""
+        if self._index is None:
+            self._index = {}
+            if self.index_path.exists():
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+        return self._index
+
+    def object_path(self, file_hash: str, suffix: str = '') -> Path:
+        """Where the content with this hash is stored"""
+        return self.objects_dir / file_hash[:2] / f"{file_hash}{suffix.lower()}"
+
+    def archive(self, file_path: Path, category: str, file_hash: str, stored: Optional[str] = None,
+                relative: Optional[str] = None) -> str:
+        """Archive a file unless its content is already stored; returns its archive path
+        
+        ``stored`` is the method an extraction worker already used to create
+        the object with ``store``; it is then only counted and named here.
+        ``relative`` is the file's path below its category directory, so
+        files with the same name in different subdirectories keep apart
+        names; it defaults to the file name.
+        """
+        obj = self.object_path(file_hash, file_path.suffix)
+        if stored is None and obj.exists():
+            self.stats['deduplicated'] += 1
+        else:
+            method = stored or self.store(file_path, file_hash)
+            self.stats['stored'] += 1
+            self.stats['bytes_stored'] += obj.stat().st_size
+            self.logger.debug(f"Archived {file_path} as {obj.name} ({method})")
+
+        name = f"{category}/{relative or file_path.name}"
+        entry = {'hash': file_hash, 'object': obj.relative_to(self.root).as_posix(),
+                 'source': file_path.as_posix()}
+        if self.index.get(name) != entry:
+            self.index[name] = entry
+            self._index_dirty = True
+        friendly = self.root / name
+        return str(friendly if self._link_name(obj, friendly) else obj)
+
+    def store(self, file_path: Path, file_hash: str, data=None) -> Optional[str]:
+        """Create the object for a file unless it exists; returns the method used
+        
+        Only writes the object, never the name index, so extraction workers
+        may call it concurrently. ``data`` is the file's content when the
+        caller has already read it.
+        """
+        obj = self.object_path(file_hash, file_path.suffix)
+        if obj.exists():
+            return None
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        return self._store(file_path, obj, data)
+
+    def _store(self, file_path: Path, obj: Path, data=None) -> str:
+        """Create an object from an input file; returns the method used"""
+        # Per process, as workers may store the same content at once
+        tmp_path = obj.with_name(f".{obj.name}.{os.getpid()}.tmp")
+        if tmp_path.exists():
+            tmp_path.unlink()
+        if self.method == 'hardlink':
+            try:
+                os.link(file_path, tmp_path)
+                os.replace(tmp_path, obj)
+                return 'hardlink'
+            except OSError:
+                pass
+
+        with open(file_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            if self.method != 'copy' and _reflink(src, dst):
+                method = 'reflink'
+            elif data is not None:
+                dst.write(data)
+                method = 'buffer'
+            elif self.method != 'copy' and _copy_range(src, dst):
+                method = 'copy_file_range'
+            else:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+                method = 'copy'
+        shutil.copystat(file_path, tmp_path)
+        os.replace(tmp_path, obj)
+        return method
+
+    def _link_name(self, obj: Path, friendly: Path) -> bool:
+        """Point a friendly name at an object with a hardlink"""
+        try:
+            if friendly.exists() and os.path.samefile(friendly, obj):
+                return True
+            friendly.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = friendly.with_name(f".{friendly.name}.tmp")
+            if tmp_path.exists():
+                tmp_path.unlink()
+            os.link(obj, tmp_path)
+            os.replace(tmp_path, friendly)
+            return True
+        except OSError as e:
+            self.logger.debug(f"No hardlink for {friendly}: {e}")
+            return False
+
+    def lookup(self, name: str) -> Optional[Path]:
+        """Object path for a friendly name"""
+        entry = self.index.get(name)
+        return self.root / entry['object'] if entry else None
+
+    def save(self):
+        """Persist the name index if it changed"""
+        if self._index_dirty:
+            self.root.mkdir(parents=True, exist_ok=True)
+            atomic_write_json(self.index_path, self.index, indent=2, sort_keys=True)
+            self._index_dirty = False
@@ -0,0 +1,4 @@
+"""
+Ingestion Benchmarks
+Synthetic corpora and a phase-timing harness with regression baselines
+"""
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Synthetic Corpus Generator
+Builds reproducible input/ trees for benchmarking the ingestion pipeline
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Dict, List
+
+import yaml
+
+# Relevance vocabulary mixed into the generated text so analysis has work to do
+KEYWORDS = ['autonomous', 'projectile', 'guidance', 'trajectory', 'ballistics',
+            'drone', 'multi-agent', 'sensor fusion', 'control theory',
+            'communication', 'telemetry', 'gps', 'navigation', 'optimization',
+            'kalman', 'filter', 'prediction', 'correction', 'aerodynamics']
+FILLER = ('the of and to in for with on by from as at is are was were be this that these '
+          'system model results data method analysis performance error velocity angle '
+          'spin rate stability test field range measurement estimate update signal').split()
+
+PRESETS = {
+    'small': {'briefings': 40, 'papers': 10, 'paper_kb': 64, 'json': 8, 'yaml': 8,
+              'csv': 4, 'csv_rows': 5000, 'changed_ratio': 0.1},
+    'medium': {'briefings': 400, 'papers': 60, 'paper_kb': 256, 'json': 40, 'yaml': 40,
+               'csv': 20, 'csv_rows': 50000, 'changed_ratio': 0.1},
+    'large': {'briefings': 2000, 'papers': 200, 'paper_kb': 1024, 'json': 100, 'yaml': 100,
+              'csv': 50, 'csv_rows': 200000, 'changed_ratio': 0.05},
+}
+
+
+def _sentence(rng: random.Random, length: int = 14) -> str:
+    """A sentence of filler with the occasional keyword"""
+    words = [rng.choice(KEYWORDS) if rng.random() < 0.08 else rng.choice(FILLER)
+             for _ in range(length)]
+    return ' '.join(words).capitalize() + '.'
+
+
+def _paragraph(rng: random.Random, sentences: int = 5) -> str:
+    return ' '.join(_sentence(rng, rng.randint(8, 20)) for _ in range(sentences))
+
+
+def write_briefing(path: Path, rng: random.Random, index: int):
+    """Markdown briefing with front matter and nested sections"""
+    front_matter = {
+        'title': f"Synthetic Briefing {index}",
+        'author': 'Benchmark Generator',
+        'date': f"2025-{index % 12 + 1:02d}-{index % 28 + 1:02d}",
+        'tags': rng.sample(KEYWORDS, 3),
+        'priority': rng.choice(['high', 'medium', 'low'])
+    }
+    lines = ['---', yaml.safe_dump(front_matter, sort_keys=False).strip(), '---', '']
+    lines += ['## Key Findings', _paragraph(rng, 3), '']
+    for section in range(rng.randint(3, 8)):
+        lines += [f"## Section {section}", _paragraph(rng), '']
+        for sub in range(rng.randint(0, 3)):
+            lines += [f"### Detail {section}.{sub}", _paragraph(rng, 3), '']
+    path.write_text('\n'.join(lines), encoding='utf-8')
+
+
+def write_paper(path: Path, rng: random.Random, size_kb: int):
+    """Plain text paper of roughly the requested size"""
+    with open(path, 'w', encoding='utf-8') as f:
+        written = 0
+        while written < size_kb * 1024:
+            paragraph = _paragraph(rng, 8) + '\n\n'
+            f.write(paragraph)
+            written += len(paragraph)
+
+
+def _nested(rng: random.Random, depth: int):
+    """Random nested JSON-compatible value"""
+    if depth <= 0:
+        return rng.choice([rng.randint(0, 10 ** 6), rng.random() * 1000, _sentence(rng, 5),
+                           rng.random() < 0.5, None])
+    if rng.random() < 0.5:
+        return {f"field_{i}": _nested(rng, depth - 1) for i in range(rng.randint(2, 5))}
+    return [_nested(rng, depth - 1) for _ in range(rng.randint(2, 6))]
+
+
+def write_structured(path: Path, rng: random.Random, index: int, records: int = 200):
+    """Nested JSON or YAML document with a top-level record list"""
+    document = {
+        'title': f"Synthetic Dataset {index}",
+        'type': 'telemetry',
+        'metadata': _nested(rng, 3),
+        'records': [{'id': i, 'values': _nested(rng, 2), 'note': _sentence(rng, 6)}
+                    for i in range(records)]
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        if path.suffix == '.json':
+            json.dump(document, f)
+        else:
+            yaml.safe_dump(document, f, sort_keys=False)
+
+
+def write_csv(path: Path, rng: random.Random, rows: int):
+    """Telemetry-style CSV with numeric, categorical, boolean and time columns"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('timestamp,sensor,altitude,velocity,locked,comment\n')
+        for row in range(rows):
+            f.write(f"2025-01-01T{row // 3600 % 24:02d}:{row // 60 % 60:02d}:{row % 60:02d},"
+                    f"s{rng.randint(1, 40)},{rng.gauss(1200, 150):.2f},{rng.random() * 900:.3f},"
+                    f"{rng.choice(['true', 'false'])},{'' if row % 9 else rng.choice(FILLER)}\n")
+
+
+def generate_corpus(root: Path, spec: Dict, seed: int = 42) -> List[Path]:
+    """Write a synthetic input/ tree below root and return the files created"""
+    rng = random.Random(seed)
+    root = Path(root)
+    for category in ('papers', 'briefings', 'data', 'references'):
+        (root / category).mkdir(parents=True, exist_ok=True)
+
+    files = []
+    for i in range(spec.get('briefings', 0)):
+        path = root / 'briefings' / f"briefing_{i:05d}.md"
+        write_briefing(path, rng, i)
+        files.append(path)
+    for i in range(spec.get('papers', 0)):
+        path = root / 'papers' / f"paper_{i:05d}.txt"
+        write_paper(path, rng, spec.get('paper_kb', 64))
+        files.append(path)
+    for i in range(spec.get('json', 0)):
+        path = root / 'data' / f"dataset_{i:05d}.json"
+        write_structured(path, rng, i)
+        files.append(path)
+    for i in range(spec.get('yaml', 0)):
+        path = root / 'data' / f"dataset_{i:05d}.yaml"
+        write_structured(path, rng, i, records=50)
+        files.append(path)
+    for i in range(spec.get('csv', 0)):
+        path = root / 'data' / f"telemetry_{i:05d}.csv"
+        write_csv(path, rng, spec.get('csv_rows', 5000))
+        files.append(path)
+    return files
+
+
+def mutate_corpus(root: Path, ratio: float, seed: int = 7) -> List[Path]:
+    """Append to a fraction of the files so they hash differently; returns them"""
+    rng = random.Random(seed)
+    files = sorted(p for p in Path(root).rglob('*') if p.is_file())
+    changed = rng.sample(files, int(len(files) * ratio)) if files else []
+    for path in changed:
+        with open(path, 'a', encoding='utf-8') as f:
+            if path.suffix == '.json':
+                # Keep the document valid: JSON allows trailing whitespace only
+                f.write(' ' * rng.randint(1, 8))
+            elif path.suffix == '.csv':
+                f.write("2025-01-02T00:00:00,s1,1000.00,1.000,true,edited\n")
+            else:
+                f.write(f"\n# edited {rng.random()}\n")
+    return changed
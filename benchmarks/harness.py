@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Ingestion Benchmark Harness
+Times each pipeline phase on a synthetic corpus and compares against JSON baselines
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import platform
+import argparse
+import resource
+import tempfile
+import contextlib
+import subprocess
+from pathlib import Path
+from typing import Dict, List
+
+import yaml
+
+from benchmarks.corpus import PRESETS, generate_corpus, mutate_corpus
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# The pipeline interleaves its stages, so phases are timed per call: 'scan'
+# is the per-file stat check, the rest are the stage functions themselves.
+# Runs in order against one workspace: first ingest, nothing changed,
+# then a fraction of files changed
+STEPS = ['cold', 'noop', 'incremental']
+PHASES = ['scan', 'hash', 'extract', 'relevance', 'index', 'archive', 'save', 'report']
+
+
+class PhaseTimer:
+    """Exclusive wall-clock time per phase for wrapped callables
+
+    Time spent in a wrapped call nested inside another (hashing inside the
+    scan, for example) is charged to the inner phase only.
+    """
+
+    def __init__(self):
+        self.totals = {phase: 0.0 for phase in PHASES}
+        self.calls = {phase: 0 for phase in PHASES}
+        self._stack = []
+
+    def wrap(self, owner, name: str, phase: str):
+        """Replace owner.name with a timed version"""
+        original = getattr(owner, name)
+
+        def timed(*args, **kwargs):
+            self._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = self._stack.pop()
+                self.totals[phase] += elapsed - nested
+                self.calls[phase] += 1
+                if self._stack:
+                    self._stack[-1] += elapsed
+
+        setattr(owner, name, timed)
+
+
+def instrument(manager, timer: PhaseTimer):
+    """Attach phase timers to a SourceManager and the extractor functions it calls"""
+    import extractors
+    import archive_store
+    timer.wrap(manager, '_prepare_file', 'scan')
+    timer.wrap(extractors, 'hash_buffer', 'hash')
+    timer.wrap(extractors, 'extract_source', 'extract')
+    timer.wrap(manager, 'analyze_relevance_batch', 'relevance')
+    timer.wrap(manager, 'index_source', 'index')
+    timer.wrap(manager.archive, 'archive', 'archive')
+    # Extraction writes new archive objects from the bytes it already read
+    timer.wrap(archive_store.SourceArchive, 'store', 'archive')
+    timer.wrap(manager, 'save_source_database', 'save')
+    timer.wrap(manager, 'generate_integration_report', 'report')
+
+
+def peak_rss_kb() -> int:
+    """Peak resident set size of this process in KiB (Linux reports KiB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_step(entry: str, workers: int) -> Dict:
+    """Run one ingestion in the current directory and return its measurements"""
+    timer = PhaseTimer()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if entry == 'session':
+            from session_ingestion import SessionIngestion
+            ingestion = SessionIngestion(workers=workers)
+            logging.getLogger().setLevel(logging.WARNING)
+            instrument(ingestion.source_manager, timer)
+            timer.wrap(ingestion, 'update_integration_report', 'report')
+            ingestion.run_session_ingestion()
+        else:
+            from source_manager import SourceManager
+            manager = SourceManager(workers=workers)
+            logging.getLogger().setLevel(logging.WARNING)
+            instrument(manager, timer)
+            manager.run_integration_cycle()
+    total = time.perf_counter() - start
+
+    phases = {phase: round(seconds, 4) for phase, seconds in timer.totals.items()}
+    phases['other'] = round(max(total - sum(timer.totals.values()), 0.0), 4)
+    return {
+        'total': round(total, 4),
+        'phases': phases,
+        'calls': timer.calls,
+        'peak_rss_kb': peak_rss_kb()
+    }
+
+
+def prepare_workspace(workspace: Path, spec: Dict, seed: int):
+    """Config, docs and a freshly generated input tree in an empty directory"""
+    with open(REPO_ROOT / 'config.yaml', 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    with open(workspace / 'config.yaml', 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+    shutil.copytree(REPO_ROOT / 'docs', workspace / config['DOCS_DIR'])
+    (workspace / 'tasks').mkdir(exist_ok=True)
+    generate_corpus(workspace / config['INPUT_DIR'], spec, seed)
+
+
+def run_preset(preset: str, entry: str, workers: int, seed: int, keep: bool) -> Dict:
+    """Run every step of a preset, each in a fresh interpreter for a clean peak RSS"""
+    spec = PRESETS[preset]
+    workspace = Path(tempfile.mkdtemp(prefix=f"superlead-bench-{preset}-"))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        [str(REPO_ROOT)] + [p for p in os.environ.get('PYTHONPATH', '').split(os.pathsep) if p]
+    ))
+    results = {}
+    try:
+        prepare_workspace(workspace, spec, seed)
+        for step in STEPS:
+            if step == 'incremental':
+                mutate_corpus(workspace / 'input', spec.get('changed_ratio', 0.1), seed)
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.harness', '_step', entry, str(workers)],
+                cwd=str(workspace), env=env, check=True, capture_output=True, text=True
+            ).stdout
+            results[step] = json.loads(output.strip().splitlines()[-1])
+    finally:
+        if keep:
+            print(f"Workspace kept at {workspace}")
+        else:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    return {
+        'preset': preset,
+        'entry': entry,
+        'workers': workers,
+        'spec': spec,
+        'machine': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count()
+        },
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'steps': results
+    }
+
+
+def best_of(runs: List[Dict]) -> Dict:
+    """Per-step minimum of each measurement across repeated preset runs
+
+    The minimum is the run least disturbed by other load on the machine,
+    which makes it the most stable number to hold a baseline against.
+    """
+    best = dict(runs[0], repeat=len(runs), steps={})
+    for step in runs[0]['steps']:
+        measured = [run['steps'][step] for run in runs]
+        best['steps'][step] = {
+            'total': min(m['total'] for m in measured),
+            'phases': {phase: min(m['phases'][phase] for m in measured)
+                       for phase in measured[0]['phases']},
+            'calls': measured[0]['calls'],
+            'peak_rss_kb': min(m['peak_rss_kb'] for m in measured)
+        }
+    return best
+
+
+def compare(result: Dict, baseline: Dict, tolerance: float, rss_tolerance: float,
+            min_seconds: float) -> List[str]:
+    """Regressions of a result against a baseline, as readable messages
+
+    A phase regresses when it is slower than the baseline by more than
+    ``tolerance`` (a fraction) and by more than ``min_seconds``, which keeps
+    timer noise on tiny phases from failing the suite.
+    """
+    regressions = []
+    for step, measured in result['steps'].items():
+        expected = baseline.get('steps', {}).get(step)
+        if not expected:
+            continue
+        timings = dict(measured['phases'], total=measured['total'])
+        reference = dict(expected['phases'], total=expected['total'])
+        for phase, seconds in timings.items():
+            base = reference.get(phase)
+            if base is None:
+                continue
+            if seconds > base * (1 + tolerance) and seconds - base > min_seconds:
+                regressions.append(
+                    f"{step}/{phase}: {seconds:.3f}s vs baseline {base:.3f}s "
+                    f"(+{(seconds / base - 1) * 100 if base else float('inf'):.0f}%)"
+                )
+        base_rss = expected.get('peak_rss_kb')
+        if base_rss and measured['peak_rss_kb'] > base_rss * (1 + rss_tolerance):
+            regressions.append(
+                f"{step}/peak_rss: {measured['peak_rss_kb']} KiB vs baseline {base_rss} KiB"
+            )
+    return regressions
+
+
+def print_result(result: Dict):
+    """Human-readable table of a preset run"""
+    print(f"\n{result['preset']} ({result['entry']}, workers={result['workers']}, "
+          f"best of {result['repeat']})")
+    header = f"{'step':<12}" + ''.join(f"{phase:>10}" for phase in PHASES + ['other', 'total']) + f"{'rss MiB':>10}"
+    print(header)
+    for step, measured in result['steps'].items():
+        row = f"{step:<12}" + ''.join(f"{measured['phases'][phase]:>10.3f}" for phase in PHASES + ['other'])
+        row += f"{measured['total']:>10.3f}{measured['peak_rss_kb'] / 1024:>10.1f}"
+        print(row)
+
+
+def load_settings(config_file: Path) -> Dict:
+    """BENCHMARKS block of config.yaml"""
+    with open(config_file, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    return config.get('BENCHMARKS') or {}
+
+
+def parse_args(argv=None):
+    """Command-line options"""
+    parser = argparse.ArgumentParser(description="Benchmark the ingestion pipeline on a synthetic corpus")
+    parser.add_argument('presets', nargs='*', default=['small'],
+                        help=f"corpus sizes to run: {', '.join(PRESETS)} (default: small)")
+    parser.add_argument('--entry', choices=['cycle', 'session'], default='cycle',
+                        help="run SourceManager.run_integration_cycle or SessionIngestion.run_session_ingestion")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="extraction processes; hash/extract phases are only attributed with 1")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=None,
+                        help="runs per preset, keeping the fastest of each phase (overrides config)")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="write the results as the new baselines")
+    parser.add_argument('--tolerance', type=float, default=None,
+                        help="allowed slowdown per phase as a fraction (overrides config)")
+    parser.add_argument('--keep', action='store_true', help="keep the generated workspaces")
+    parser.add_argument('--config', default=str(REPO_ROOT / 'config.yaml'))
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Run presets, then save or check baselines; returns the exit status"""
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ['_step']:
+        # Child process: one step in the current workspace, result as JSON
+        print(json.dumps(run_step(argv[1], int(argv[2]))))
+        return 0
+
+    args = parse_args(argv)
+    unknown = [preset for preset in args.presets if preset not in PRESETS]
+    if unknown:
+        print(f"Unknown preset(s): {', '.join(unknown)}")
+        return 2
+    settings = load_settings(Path(args.config))
+    tolerance = args.tolerance if args.tolerance is not None else settings.get('tolerance', 0.25)
+    repeat = max(args.repeat or settings.get('repeat', 3), 1)
+    baseline_dir = REPO_ROOT / settings.get('baseline_dir', 'benchmarks/baselines')
+
+    failed = False
+    for preset in args.presets:
+        result = best_of([run_preset(preset, args.entry, args.workers, args.seed, args.keep)
+                          for _ in range(repeat)])
+        print_result(result)
+        baseline_path = baseline_dir / f"{preset}-{args.entry}.json"
+
+        if args.save_baseline:
+            baseline_dir.mkdir(parents=True, exist_ok=True)
+            with open(baseline_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2)
+            print(f"Baseline saved: {baseline_path}")
+            continue
+        if not baseline_path.exists():
+            print(f"No baseline at {baseline_path}; run with --save-baseline first")
+            continue
+
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, tolerance,
+                              settings.get('rss_tolerance', 0.2),
+                              settings.get('min_seconds', 0.05))
+        if regressions:
+            failed = True
+            print(f"REGRESSIONS against {baseline_path}:")
+            for message in regressions:
+                print(f"  {message}")
+        else:
+            print(f"OK: within {tolerance:.0%} of {baseline_path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
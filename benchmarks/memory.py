@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Record Memory Benchmark
+Compares plain dict records with compact SourceRecords loaded from the JSON store
+"""
+
+import io
+import os
+import sys
+import gc
+import json
+import time
+import shutil
+import hashlib
+import logging
+import argparse
+import tempfile
+import contextlib
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from benchmarks.corpus import PRESETS
+from benchmarks.harness import prepare_workspace
+
+
+def template_records(seed: int) -> List[Dict]:
+    """Records of the ingested 'small' corpus, as plain dicts"""
+    from source_manager import SourceManager
+    workspace = Path(tempfile.mkdtemp(prefix="superlead-memory-"))
+    cwd = os.getcwd()
+    try:
+        prepare_workspace(workspace, PRESETS['small'], seed)
+        os.chdir(workspace)
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager = SourceManager()
+            logging.getLogger().setLevel(logging.WARNING)
+            manager.run_integration_cycle()
+            records = [record.to_dict() for record in manager.source_db['sources'].values()]
+            manager.store.close()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workspace, ignore_errors=True)
+    return records
+
+
+def synthesize(templates: List[Dict], count: int) -> Dict[str, Dict]:
+    """``count`` records cycling through the templates, each with its own path, hash and title"""
+    sources = {}
+    for i in range(count):
+        record = dict(templates[i % len(templates)])
+        directory, name = os.path.split(record['file_path'])
+        record['file_path'] = f"{directory}/batch_{i // 1000:03d}/{name}"
+        record['hash'] = hashlib.sha256(record['file_path'].encode('utf-8')).hexdigest()
+        record['title'] = f"{record.get('title', name)} {i}"
+        sources[record['file_path']] = record
+    return sources
+
+
+def load_plain(text: str) -> Dict:
+    """The source map as the JSON store built it before SourceRecord"""
+    return json.loads(text)['sources']
+
+
+def load_compact(text: str) -> Dict:
+    """The source map as the JSON store builds it now"""
+    from source_record import decode_record
+    return {path: decode_record(record) for path, record in json.loads(text)['sources'].items()}
+
+
+def measure(load: Callable[[str], Dict], text: str) -> Dict:
+    """Load time, then memory still allocated by the loaded source map"""
+    gc.collect()
+    start = time.perf_counter()
+    loaded = load(text)
+    seconds = time.perf_counter() - start
+    del loaded
+    gc.collect()
+
+    tracemalloc.start()
+    loaded = load(text)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del loaded
+    return {'bytes': retained, 'seconds': round(seconds, 3)}
+
+
+def parse_args(argv=None):
+    """Command-line options"""
+    parser = argparse.ArgumentParser(description="Measure source record memory at scale")
+    parser.add_argument('--records', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Build a synthetic database and print encoded size and loaded memory for both models"""
+    args = parse_args(argv)
+    from source_record import encode_record, json_default
+    templates = template_records(args.seed)
+    sources = synthesize(templates, args.records)
+    plain_text = json.dumps({'sources': sources, 'last_update': None}, default=str)
+    compact_text = json.dumps({'sources': {path: encode_record(record) for path, record in sources.items()},
+                               'last_update': None}, default=json_default)
+    del sources
+
+    results = {
+        'plain dicts': dict(measure(load_plain, plain_text), encoded=len(plain_text)),
+        'SourceRecord': dict(measure(load_compact, compact_text), encoded=len(compact_text))
+    }
+    print(f"\n{args.records} records from {len(templates)} templates")
+    print(f"{'model':<14}{'memory MiB':>12}{'per record':>12}{'encoded MiB':>13}{'load s':>9}")
+    for model, result in results.items():
+        print(f"{model:<14}{result['bytes'] / 2 ** 20:>12.1f}{result['bytes'] // args.records:>12}"
+              f"{result['encoded'] / 2 ** 20:>13.1f}{result['seconds']:>9.2f}")
+    plain, compact = results['plain dicts'], results['SourceRecord']
+    print(f"memory -{1 - compact['bytes'] / plain['bytes']:.0%}, "
+          f"encoded -{1 - compact['encoded'] / plain['encoded']:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Blob Store
+Keeps extracted source bodies out of the source database, keyed by file hash
+"""
+
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from source_record import json_default
+from source_store import atomic_write_json, atomic_write_text
+
+# Record fields holding bulk extracted text rather than metadata
+BODY_FIELDS = ('content', 'data', 'sections')
+
+
+class BlobStore:
+    """Stores one JSON body per content hash under <root>/<hh>/<name>
+
+    Bodies are named by ``extraction_key`` (hash, extractor and extractor
+    version), so the output of each extractor version is kept apart and
+    doubles as the extraction cache; records from before extractors were
+    versioned use the bare hash.
+    """
+
+    def __init__(self, root: str, cache_size: int = 32):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def _path(self, digest: str) -> Path:
+        """Fan out by hash prefix to keep directories small"""
+        return self.root / digest[:2] / digest
+
+    def has(self, digest: str) -> bool:
+        """Check whether a body is stored for the hash"""
+        return self._path(digest).exists()
+
+    def put(self, digest: str, body: Dict) -> bool:
+        """Store a body once; returns False when it was already present"""
+        path = self._path(digest)
+        if path.exists():
+            return False
+        path.parent.mkdir(exist_ok=True)
+        atomic_write_json(path, body)
+        return True
+
+    def put_text(self, digest: str, fields: Dict, field: str, chunks: Iterable[str]) -> bool:
+        """Store a body whose ``field`` is the text ``chunks`` joined, writing one chunk at a time
+
+        Used for documents too large to hold whole; returns False when the
+        body was already present.
+        """
+        path = self._path(digest)
+        if path.exists():
+            return False
+        path.parent.mkdir(exist_ok=True)
+        atomic_write_text(path, _json_with_text(fields, field, chunks))
+        return True
+
+    def get(self, digest: str) -> Optional[Dict]:
+        """Load a body, keeping the most recently used ones in memory"""
+        if digest in self._cache:
+            self._cache.move_to_end(digest)
+            return self._cache[digest]
+        path = self._path(digest)
+        if not path.exists():
+            return None
+        with open(path, 'r') as f:
+            body = json.load(f)
+        self._cache[digest] = body
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return body
+
+
+def _json_with_text(fields: Dict, field: str, chunks: Iterable[str]):
+    """JSON text of ``fields`` plus ``field`` set to the joined chunks, produced piece by piece"""
+    head = json.dumps(fields, default=json_default)
+    yield head[:-1]
+    yield f"{', ' if fields else ''}{json.dumps(field)}: \""
+    for chunk in chunks:
+        yield json.dumps(chunk)[1:-1]
+    yield '"}'
+
+
+def split_body(record: Dict) -> Dict:
+    """Move bulk fields out of a record, returning them as the body
+
+    Markdown sections keep their names in the record so the section layout
+    stays queryable without loading the body.
+    """
+    body = {}
+    for field in BODY_FIELDS:
+        if field not in record:
+            continue
+        value = record[field]
+        if field == 'sections' and not isinstance(value, dict):
+            continue  # already reduced to section names
+        body[field] = value
+        if field == 'sections':
+            record[field] = list(value)
+        else:
+            del record[field]
+    return body
+
+
+def extraction_key(file_hash: str, extractor: Optional[str], version: Optional[int]) -> str:
+    """Blob name of one extractor version's output for a file's content"""
+    return f"{file_hash}.{extractor}.v{version}"
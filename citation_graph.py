@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Source Citation Graph
+Which documentation sections cite which sources, kept current one changed document at a time
+"""
+
+import io
+import os
+import re
+import json
+import sqlite3
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import unquote
+
+from keyword_matcher import KeywordMatcher
+
+# Opened before config.yaml is parsed on the session fast path, so it cannot
+# follow a custom STATE_DIR; the manager passes its own path
+CITATIONS_PATH = Path('.superlead') / 'citations.sqlite3'
+GRAPH_VERSION = 1
+
+WORD_PATTERN = re.compile(r'\w+')
+# Any input or archive path, so citations of files never ingested are kept too
+PATH_PATTERN = re.compile(r"(?<![\w/])(?:\.\./)*((?:input|sources)/[^\s()\[\]<>\"'`|*]*[^\s()\[\]<>\"'`|*/.,:;])")
+LINK_TARGET = re.compile(r'\]\(([^)\s]*%[^)\s]*)\)')
+
+
+def normalize_key(text: str) -> str:
+    """Lowercase, single-spaced, '/'-separated form of a title, path or hash"""
+    return ' '.join(str(text).replace('\\', '/').lower().split())
+
+
+def key_word(key: str) -> str:
+    """Longest word of a key, used to find documents that might contain it"""
+    return max(WORD_PATTERN.findall(key), key=len, default='')
+
+
+def source_keys(record: Dict, min_title_length: int = 12) -> List[str]:
+    """Every string a document can cite a source by
+
+    The hash, the input path and the archive path always count; the title
+    and file name only when at least ``min_title_length`` characters, so
+    short generic titles ("notes") are not found in every section.
+    """
+    keys = set()
+    for field in ('hash', 'file_path', 'archived_path'):
+        if record.get(field):
+            keys.add(normalize_key(record[field]))
+    for name in (record.get('title'), os.path.basename(str(record.get('file_path', '')))):
+        if name and len(str(name).strip()) >= min_title_length:
+            keys.add(normalize_key(name))
+    return sorted(key for key in keys if key_word(key))
+
+
+class CitationGraph:
+    """Bipartite graph between sources and the documentation sections citing them
+
+    Each markdown section of ``docs_dir`` is scanned for the titles, file
+    names, paths and hashes of known sources (``source_keys``) and for
+    any other input or archive path. Only documents whose content hash
+    changed are scanned in full; when new sources appear, the other
+    documents are only checked for the new keys. Citations of keys that no
+    longer belong to a source are orphaned, which is how a removed source
+    that the docs still cite shows up. Sources are mirrored from the
+    source database as records are saved, keyed by path with their hash.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS docs (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            hash TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS citations (
+            doc TEXT NOT NULL,
+            anchor TEXT NOT NULL,
+            key TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (doc, anchor, key)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS sources (
+            path TEXT PRIMARY KEY,
+            hash TEXT,
+            title TEXT,
+            level TEXT,
+            status TEXT,
+            changed INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS source_keys (
+            key TEXT NOT NULL,
+            path TEXT NOT NULL,
+            PRIMARY KEY (key, path)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS vocabulary (
+            key TEXT PRIMARY KEY,
+            word TEXT NOT NULL
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_citations_key ON citations(key);
+        CREATE INDEX IF NOT EXISTS idx_sources_level ON sources(level);
+        CREATE INDEX IF NOT EXISTS idx_source_keys_path ON source_keys(path);
+        CREATE INDEX IF NOT EXISTS idx_vocabulary_word ON vocabulary(word);
+    """
+
+    def __init__(self, path=CITATIONS_PATH, docs_dir: Optional[str] = None,
+                 exclude: Optional[List[str]] = None, min_title_length: int = 12):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+
+        # Without a docs_dir the graph is opened with the settings it was built with
+        settings = {'version': GRAPH_VERSION, 'docs_dir': docs_dir,
+                    'exclude': sorted(exclude or []), 'min_title_length': min_title_length}
+        stored = self._meta('settings')
+        if docs_dir is None:
+            settings = stored or dict(settings, docs_dir='docs')
+        elif stored != settings:
+            self.clear()
+            self._set_meta('settings', settings)
+            self.conn.commit()
+        self.docs_dir = Path(settings['docs_dir'])
+        self.exclude = set(settings['exclude'])
+        self.min_title_length = settings['min_title_length']
+
+    def _meta(self, key: str):
+        """A JSON value from the meta table"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _set_meta(self, key: str, value):
+        """Store a JSON value in the meta table"""
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def clear(self):
+        """Forget every document, citation and source"""
+        with self.conn:
+            for table in ('meta', 'docs', 'citations', 'sources', 'source_keys', 'vocabulary'):
+                self.conn.execute(f"DELETE FROM {table}")
+
+    @property
+    def synced(self) -> bool:
+        """Whether every source of the database has been mirrored"""
+        return bool(self._meta('synced'))
+
+    def mark_synced(self):
+        """Record that the source mirror is complete"""
+        self._set_meta('synced', True)
+
+    def update_sources(self, records: Iterable[Dict]):
+        """Mirror new or changed source records
+
+        A source whose hash differs from the mirrored one is flagged as
+        changed until it moves past the 'new' status.
+        """
+        for record in records:
+            path = record['file_path']
+            row = self.conn.execute("SELECT hash, changed FROM sources WHERE path = ?", (path,)).fetchone()
+            status = record.get('status', 'new')
+            changed = bool(row) and (row[0] != record.get('hash') or bool(row[1])) and status == 'new'
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sources (path, hash, title, level, status, changed) VALUES (?, ?, ?, ?, ?, ?)",
+                (path, record.get('hash'), record.get('title'),
+                 (record.get('relevance') or {}).get('level'), status, int(changed))
+            )
+            self.conn.execute("DELETE FROM source_keys WHERE path = ?", (path,))
+            self.conn.executemany(
+                "INSERT INTO source_keys (key, path) VALUES (?, ?)",
+                [(key, path) for key in source_keys(record, self.min_title_length)]
+            )
+
+    def remove_sources(self, paths: Iterable[str]):
+        """Drop sources from the mirror; citations of them become orphaned"""
+        for path in paths:
+            self.conn.execute("DELETE FROM sources WHERE path = ?", (path,))
+            self.conn.execute("DELETE FROM source_keys WHERE path = ?", (path,))
+
+    def commit(self):
+        """Commit pending changes"""
+        self.conn.commit()
+
+    def refresh(self) -> int:
+        """Rescan documents whose content changed and look for new source keys; returns documents rescanned"""
+        with self.conn:
+            # Keys of sources added since the last refresh, and keys nothing needs any more
+            new_keys = [(row[0], key_word(row[0])) for row in self.conn.execute(
+                "SELECT DISTINCT key FROM source_keys WHERE key NOT IN (SELECT key FROM vocabulary)"
+            )]
+            self.conn.executemany("INSERT INTO vocabulary (key, word) VALUES (?, ?)", new_keys)
+            self.conn.execute(
+                """DELETE FROM vocabulary WHERE key NOT IN (SELECT key FROM source_keys)
+                   AND key NOT IN (SELECT key FROM citations)"""
+            )
+
+            stored = {path: (size, mtime_ns, doc_hash) for path, size, mtime_ns, doc_hash
+                      in self.conn.execute("SELECT path, size, mtime_ns, hash FROM docs")}
+            seen = set()
+            rescanned = 0
+            for doc_path in sorted(self.docs_dir.glob('*.md')):
+                if doc_path.name in self.exclude:
+                    continue
+                key = doc_path.as_posix()
+                seen.add(key)
+                st = doc_path.stat()
+                cached = stored.get(key)
+                if cached and cached[:2] == (st.st_size, st.st_mtime_ns) and not new_keys:
+                    continue
+
+                with open(doc_path, 'rb') as f:
+                    data = f.read()
+                doc_hash = hashlib.sha256(data).hexdigest()
+                sections = None
+                if cached and cached[2] == doc_hash:
+                    # Unchanged text: only a mention of a new key calls for a rescan
+                    sections = self._sections(data)
+                    if not self._mentions(sections, new_keys):
+                        sections = None
+                if sections is not None or not cached or cached[2] != doc_hash:
+                    self._scan(key, sections if sections is not None else self._sections(data))
+                    rescanned += 1
+                self.conn.execute("INSERT OR REPLACE INTO docs (path, size, mtime_ns, hash) VALUES (?, ?, ?, ?)",
+                                  (key, st.st_size, st.st_mtime_ns, doc_hash))
+
+            for key in set(stored) - seen:
+                self.conn.execute("DELETE FROM docs WHERE path = ?", (key,))
+                self.conn.execute("DELETE FROM citations WHERE doc = ?", (key,))
+        return rescanned
+
+    @staticmethod
+    def _sections(data: bytes) -> List[tuple]:
+        """(anchor, text) of the preamble and of every section's own text"""
+        from markdown_parser import iter_lines, parse_markdown, section_text
+        parsed = parse_markdown(iter_lines(io.BytesIO(data)))['sections']
+        preamble = data[:parsed[0]['start']] if parsed else data
+        sections = [('', preamble.decode('utf-8', errors='replace'))]
+        sections += [(section['anchor'], f"{section['title']}\n{section_text(data, section)}")
+                     for section in parsed]
+        # Link targets are often percent-encoded ("Coning%20Theory.md")
+        return [(anchor, LINK_TARGET.sub(lambda m: f"]({unquote(m.group(1))})", text))
+                for anchor, text in sections]
+
+    @staticmethod
+    def _mentions(sections: List[tuple], keys: List[tuple]) -> bool:
+        """Whether any section contains any of the (key, word) pairs"""
+        words = {word for _, text in sections for word in WORD_PATTERN.findall(text.lower())}
+        candidates = [key for key, word in keys if word in words]
+        if not candidates:
+            return False
+        pattern = KeywordMatcher(candidates).pattern
+        return any(pattern.search(text) for _, text in sections)
+
+    def _candidates(self, words: set) -> List[str]:
+        """Vocabulary keys whose longest word occurs in a document"""
+        words = sorted(words)
+        keys = []
+        for start in range(0, len(words), 500):
+            chunk = words[start:start + 500]
+            keys += [row[0] for row in self.conn.execute(
+                f"SELECT key FROM vocabulary WHERE word IN ({','.join('?' * len(chunk))})", chunk
+            )]
+        return keys
+
+    def _scan(self, doc: str, sections: List[tuple]):
+        """Replace a document's citations"""
+        self.conn.execute("DELETE FROM citations WHERE doc = ?", (doc,))
+        words = {word for _, text in sections for word in WORD_PATTERN.findall(text.lower())}
+        candidates = self._candidates(words)
+        pattern = KeywordMatcher(candidates).pattern if candidates else None
+        rows = []
+        for anchor, text in sections:
+            counts = {}
+            covered = []
+            if pattern is not None:
+                for match in pattern.finditer(text):
+                    key = normalize_key(match.group(0))
+                    counts[key] = counts.get(key, 0) + 1
+                    covered.append(match.span())
+            for match in PATH_PATTERN.finditer(text):
+                start = match.start(1)
+                if any(begin <= start < end for begin, end in covered):
+                    continue
+                key = normalize_key(match.group(1))
+                counts[key] = counts.get(key, 0) + 1
+            rows += [(doc, anchor, key, count) for key, count in counts.items()]
+        self.conn.executemany("INSERT INTO citations (doc, anchor, key, count) VALUES (?, ?, ?, ?)", rows)
+
+    def citations_of(self, paths: Iterable[str]) -> Dict[str, List[str]]:
+        """Source path -> 'docs/<file>.md#<anchor>' targets citing it"""
+        cited = {}
+        paths = list(paths)
+        for start in range(0, len(paths), 500):
+            chunk = paths[start:start + 500]
+            for path, doc, anchor in self.conn.execute(
+                f"""SELECT DISTINCT k.path, c.doc, c.anchor FROM source_keys k
+                    JOIN citations c ON c.key = k.key
+                    WHERE k.path IN ({','.join('?' * len(chunk))}) ORDER BY c.doc, c.anchor""", chunk
+            ):
+                cited.setdefault(path, []).append(f"{doc}#{anchor}" if anchor else doc)
+        return cited
+
+    def changed_sources(self, paths: Iterable[str]) -> List[str]:
+        """The paths whose content changed while they were still new"""
+        paths = list(paths)
+        changed = []
+        for start in range(0, len(paths), 500):
+            chunk = paths[start:start + 500]
+            changed += [row[0] for row in self.conn.execute(
+                f"SELECT path FROM sources WHERE changed = 1 AND path IN ({','.join('?' * len(chunk))})", chunk
+            )]
+        return sorted(changed)
+
+    def affected_docs(self, paths: Iterable[str]) -> Dict[str, List[str]]:
+        """'docs/<file>.md#<anchor>' -> the given sources it cites, for reviewing changed sources"""
+        affected = {}
+        for path, targets in self.citations_of(paths).items():
+            for target in targets:
+                affected.setdefault(target, []).append(path)
+        return dict(sorted(affected.items()))
+
+    def uncited(self, levels: Iterable[str] = ('high',), limit: Optional[int] = None) -> List[Dict]:
+        """Sources of the given relevance levels that no documentation section cites"""
+        levels = list(levels)
+        query = f"""SELECT path, hash, title, level, status FROM sources s
+                    WHERE level IN ({','.join('?' * len(levels))})
+                    AND NOT EXISTS (SELECT 1 FROM source_keys k JOIN citations c ON c.key = k.key
+                                    WHERE k.path = s.path)
+                    ORDER BY path"""
+        params = levels
+        if limit is not None:
+            query += " LIMIT ?"
+            params = levels + [limit]
+        return [dict(zip(('file_path', 'hash', 'title', 'level', 'status'), row))
+                for row in self.conn.execute(query, params)]
+
+    def orphaned(self) -> List[Dict]:
+        """Citations of keys no current source has: removed sources and paths never ingested"""
+        return [{'target': f"{doc}#{anchor}" if anchor else doc, 'key': key, 'count': count}
+                for doc, anchor, key, count in self.conn.execute(
+                    """SELECT doc, anchor, key, count FROM citations c
+                       WHERE NOT EXISTS (SELECT 1 FROM source_keys k WHERE k.key = c.key)
+                       ORDER BY doc, anchor, key"""
+                )]
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
@@ -6,9 +6,12 @@ Connects Python automation with Claude Code workflow
 
 import os
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
-from session_ingestion import SessionIngestion
+# Only the manifest check is imported up front; the ingestion stack (yaml,
+# hashlib, extractors, SQLite) loads only when something actually changed
+from session_manifest import format_near_duplicates, load_current_manifest
 
 class ClaudeSessionBridge:
     """Bridge between Python ingestion and Claude Code workflow"""
@@ -16,6 +19,8 @@ class ClaudeSessionBridge:
     def __init__(self):
         self.session_start = datetime.now()
         self.tasks_dir = Path("tasks")
+        # Which doc sections already cite which sources (None until built)
+        self.citations = None
 
     def ensure_task_structure(self):
         """Ensure /tasks/ directory structure exists"""
@@ -38,8 +43,8 @@ class ClaudeSessionBridge:
             if not file_path.exists():
                 print(f"⚠️  Warning: {file_name} not found. Run full setup first.")
 
-    def run_session_ingestion(self):
-        """Run Python ingestion system"""
+    def print_header(self):
+        """Print the session banner and check the task files"""
         print("=" * 60)
         print("CLAUDE CODE SESSION STARTUP")
         print("=" * 60)
@@ -49,12 +54,55 @@ class ClaudeSessionBridge:
         # Ensure directory structure
         self.ensure_task_structure()
 
+    def run_fast_path(self):
+        """Skip ingestion when nothing changed since the last session start
+
+        Returns the pending new-source summaries from the session manifest,
+        or None when inputs, config or database changed and a full run is
+        needed.
+        """
+        start = time.perf_counter()
+        manifest = load_current_manifest()
+        if manifest is None:
+            return None
+
+        self.print_header()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"No changes since last session: {len(manifest['files'])} source files checked "
+              f"in {elapsed_ms:.0f} ms")
+        self.citations = self.open_citations()
+        return manifest['new_sources']
+
+    def open_citations(self):
+        """Citation graph rescanned for edited docs, or None before a full ingestion built it"""
+        from citation_graph import CitationGraph
+        graph = CitationGraph()
+        if not graph.synced:
+            graph.close()
+            return None
+        graph.refresh()
+        return graph
+
+    def run_session_ingestion(self):
+        """Run Python ingestion system; returns the sources still marked new"""
+        from session_ingestion import SessionIngestion
+
+        self.print_header()
+
         # Run Python ingestion
         print("Running source ingestion system...")
         print("-" * 40)
         ingestion = SessionIngestion()
         ingestion.run_session_ingestion()
 
+        # The ingestion's own database handle answers the status query, and
+        # the manifest lets an unchanged next session skip all of this
+        manager = ingestion.source_manager
+        self.citations = manager.citations
+        new_sources = manager.new_source_summaries()
+        manager.write_session_manifest(new_sources)
+        return new_sources
+
     def generate_claude_suggestions(self, new_sources):
         """Generate Claude-friendly suggestions file"""
         suggestions_path = self.tasks_dir / "session_ingestion_suggestions.md"
@@ -74,10 +122,21 @@ class ClaudeSessionBridge:
 
             f.write(f"## New Sources Detected: {len(new_sources)}\n\n")
 
+            # Sources the docs already cite were integrated before; only
+            # changed ones need another look, at the sections citing them
+            cited, changed = {}, set()
+            if self.citations is not None:
+                paths = [s['file_path'] for s in new_sources if s.get('file_path')]
+                cited = self.citations.citations_of(paths)
+                changed = set(self.citations.changed_sources(paths))
+            already_cited = [s for s in new_sources if s.get('file_path') in cited
+                             and s.get('file_path') not in changed]
+            pending = [s for s in new_sources if s not in already_cited]
+
             # Group by relevance
-            high_rel = [s for s in new_sources if s.get('relevance', {}).get('level') == 'high']
-            med_rel = [s for s in new_sources if s.get('relevance', {}).get('level') == 'medium']
-            low_rel = [s for s in new_sources if s.get('relevance', {}).get('level') == 'low']
+            high_rel = [s for s in pending if s.get('relevance', {}).get('level') == 'high']
+            med_rel = [s for s in pending if s.get('relevance', {}).get('level') == 'medium']
+            low_rel = [s for s in pending if s.get('relevance', {}).get('level') == 'low']
 
             if high_rel:
                 f.write("### 🔴 High Relevance (Integrate Immediately)\n\n")
@@ -94,21 +153,55 @@ class ClaudeSessionBridge:
                 for source in low_rel:
                     self._write_source_detail(f, source)
 
+            if already_cited:
+                f.write("### ✅ Already Cited in Documentation\n\n")
+                for source in already_cited:
+                    f.write(f"- '{source.get('title', 'Unknown')}' in "
+                            f"{', '.join(f'`{target}`' for target in cited[source['file_path']])}\n")
+                f.write("\nMark them integrated: `python source_manager.py mark integrated "
+                        + ' '.join(f'"{s["file_path"]}"' for s in already_cited) + "`\n\n")
+
+            affected = self.citations.affected_docs(sorted(changed)) if changed else {}
+            if affected:
+                f.write("### 🔁 Sections Citing Changed Sources\n\n")
+                for target, paths in affected.items():
+                    f.write(f"- `{target}`: {', '.join(paths)}\n")
+                f.write("\n")
+
+            orphaned = self.citations.orphaned() if self.citations is not None else []
+            if orphaned:
+                f.write("### ⚠️ Orphaned Citations\n\n")
+                for citation in orphaned:
+                    f.write(f"- `{citation['target']}` cites `{citation['key']}`, which is not an ingested source\n")
+                f.write("\n")
+
             # Recommended actions
             f.write("\n## Recommended Next Actions\n\n")
 
+            if affected:
+                f.write("**First**: Re-check the sections citing changed sources\n")
+                for target in affected:
+                    f.write(f"- Review `{target}`\n")
+                f.write("\n")
+
             if high_rel:
                 f.write("**Priority 1**: Integrate high-relevance sources\n")
                 for source in high_rel:
                     sections = source.get('relevance', {}).get('recommended_sections', [])
                     if sections:
-                        f.write(f"- Update {sections[0]} section with findings from '{source.get('title', 'Unknown')}'\n")
+                        f.write(f"- Update `{sections[0]}` with findings from '{source.get('title', 'Unknown')}'\n")
 
             if med_rel:
                 f.write("\n**Priority 2**: Review medium-relevance sources for specific insights\n")
                 for source in med_rel[:3]:  # Limit to top 3
                     f.write(f"- Scan '{source.get('title', 'Unknown')}' for relevant details\n")
 
+            duplicates = [s for s in new_sources if s.get('near_duplicates')]
+            if duplicates:
+                f.write("\n**Skim Only**: suspected near-duplicates of sources already ingested\n")
+                for source in duplicates:
+                    f.write(f"- '{source.get('title', 'Unknown')}' ≈ {format_near_duplicates(source)}\n")
+
             f.write("\n**After Integration**:\n")
             f.write("1. Update `tasks/context.md` with key discoveries (2-Action Rule)\n")
             f.write("2. Mark completed tasks in `tasks/todo.md`\n")
@@ -127,7 +220,13 @@ class ClaudeSessionBridge:
 
         sections = relevance.get('recommended_sections', [])
         if sections:
-            f.write(f"- Suggested Sections: {', '.join(sections)}\n")
+            scores = relevance.get('section_scores', [])
+            suggested = [f"`{section}` ({scores[i]:.2f})" if i < len(scores) else f"`{section}`"
+                         for i, section in enumerate(sections)]
+            f.write(f"- Suggested Sections: {', '.join(suggested)}\n")
+
+        if source.get('near_duplicates'):
+            f.write(f"- ⚠️ Possible Duplicate Of: {format_near_duplicates(source)}\n")
 
         summary = source.get('summary', '')
         if summary:
@@ -175,22 +274,14 @@ def main():
     try:
         bridge = ClaudeSessionBridge()
 
-        # Run ingestion
-        bridge.run_session_ingestion()
-
-        # Check for new sources and generate suggestions
-        # Note: SessionIngestion already processed sources, we need to read results
-        import json
-        if os.path.exists('source_database.json'):
-            with open('source_database.json', 'r') as f:
-                db = json.load(f)
-                new_sources = [
-                    src for src in db.get('sources', {}).values()
-                    if src.get('status') == 'new'
-                ]
-                bridge.generate_claude_suggestions(new_sources)
-        else:
-            bridge.generate_claude_suggestions([])
+        # Run ingestion unless the manifest shows nothing changed
+        # (--full forces a complete run)
+        new_sources = None if '--full' in sys.argv[1:] else bridge.run_fast_path()
+        if new_sources is None:
+            new_sources = bridge.run_session_ingestion()
+
+        # Generate suggestions for the sources still marked new
+        bridge.generate_claude_suggestions(new_sources)
 
         # Display quick start guide
         bridge.display_quick_start()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Streaming CSV Profiler
+Infers column types and collects per-column statistics in one constant-memory pass
+"""
+
+import csv
+import heapq
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from source_reader import text_stream
+
+NULL_TOKENS = {'', 'na', 'n/a', 'nan', 'null', 'none', '-'}
+BOOLEAN_TOKENS = {'true': True, 'false': False, 'yes': True, 'no': False}
+SNIFF_BYTES = 64 * 1024
+MAX_VALUE_LENGTH = 100  # longer values are truncated in min/max and top-k
+
+# Narrowest first; a column takes the first type every sampled value fits
+TYPE_ORDER = ['boolean', 'integer', 'float', 'datetime', 'string']
+
+
+def _parse_boolean(value: str) -> bool:
+    """Parse true/false/yes/no"""
+    return BOOLEAN_TOKENS[value.lower()]
+
+
+def _parse_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 date or timestamp"""
+    if len(value) < 8 or value[0] not in '0123456789':
+        raise ValueError(value)
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+PARSERS = {
+    'boolean': _parse_boolean,
+    'integer': int,
+    'float': float,
+    'datetime': _parse_datetime,
+    'string': str,
+}
+
+
+def infer_type(values: List[str]) -> str:
+    """Narrowest type that parses every non-null sample value"""
+    candidates = list(TYPE_ORDER)
+    for value in values:
+        while candidates[0] != 'string':
+            try:
+                PARSERS[candidates[0]](value)
+                break
+            except (ValueError, KeyError):
+                candidates.pop(0)
+    return candidates[0] if values else 'string'
+
+
+class DistinctSketch:
+    """K-minimum-values estimate of the number of distinct values
+
+    Keeps the ``k`` smallest 64-bit hashes seen; below ``k`` distinct values
+    the count is exact.
+    """
+
+    def __init__(self, k: int = 1024):
+        self.k = k
+        self._heap = []  # negated hashes, so the root is the largest kept
+        self._members = set()
+
+    def add(self, value: str):
+        """Record one value"""
+        digest = hashlib.blake2b(value.encode('utf-8', errors='replace'), digest_size=8).digest()
+        h = int.from_bytes(digest, 'big')
+        if h in self._members:
+            return
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, -h)
+            self._members.add(h)
+        elif h < -self._heap[0]:
+            self._members.discard(-heapq.heapreplace(self._heap, -h))
+            self._members.add(h)
+
+    def estimate(self) -> int:
+        """Approximate distinct count"""
+        if len(self._heap) < self.k:
+            return len(self._heap)
+        return int((self.k - 1) * 2 ** 64 / -self._heap[0])
+
+    @property
+    def exact(self) -> bool:
+        return len(self._heap) < self.k
+
+
+class TopK:
+    """Misra-Gries frequent values with a fixed number of counters
+
+    Counts are lower bounds, short by at most rows / capacity; any value
+    more frequent than that is guaranteed to be kept.
+    """
+
+    def __init__(self, k: int = 10, capacity: Optional[int] = None):
+        self.k = k
+        self.capacity = capacity or k * 10
+        self.counts = {}
+
+    def add(self, value: str):
+        """Record one value"""
+        counts = self.counts
+        if value in counts:
+            counts[value] += 1
+        elif len(counts) < self.capacity:
+            counts[value] = 1
+        else:
+            # Decrement every counter by the smallest one at once; each
+            # decrement is paid for by an earlier increment
+            floor = min(counts.values())
+            self.counts = {v: c - floor for v, c in counts.items() if c > floor}
+            self.counts[value] = 1
+
+    def top(self) -> List[List]:
+        """The k most frequent values as [value, count] pairs"""
+        ranked = sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))
+        return [[value, count] for value, count in ranked[:self.k]]
+
+
+class ColumnProfile:
+    """Running statistics for one column"""
+
+    def __init__(self, name: str, column_type: str, top_k: int, sketch_size: int):
+        self.name = name
+        self.type = column_type
+        self.count = 0
+        self.nulls = 0
+        self.invalid = 0
+        self.numeric_count = 0
+        self.numeric_sum = 0.0
+        self.numeric_min = None
+        self.numeric_max = None
+        self.text_min = None
+        self.text_max = None
+        self.distinct = DistinctSketch(sketch_size)
+        self.top_values = TopK(top_k)
+
+    def add(self, raw: str):
+        """Fold one cell into the profile"""
+        self.count += 1
+        value = raw.strip()
+        if value.lower() in NULL_TOKENS:
+            self.nulls += 1
+            return
+
+        if self.type != 'string':
+            try:
+                parsed = PARSERS[self.type](value)
+            except (ValueError, KeyError):
+                parsed = None
+                if self.type == 'integer':
+                    try:
+                        parsed = float(value)
+                        self.type = 'float'
+                    except ValueError:
+                        pass
+                if parsed is None:
+                    self.invalid += 1
+                    self.distinct.add(value)
+                    self.top_values.add(value[:MAX_VALUE_LENGTH])
+                    return
+            if self.type in ('integer', 'float') and parsed is not None:
+                self.numeric_count += 1
+                self.numeric_sum += parsed
+                if self.numeric_min is None or parsed < self.numeric_min:
+                    self.numeric_min = parsed
+                if self.numeric_max is None or parsed > self.numeric_max:
+                    self.numeric_max = parsed
+
+        short = value[:MAX_VALUE_LENGTH]
+        if self.text_min is None or short < self.text_min:
+            self.text_min = short
+        if self.text_max is None or short > self.text_max:
+            self.text_max = short
+        self.distinct.add(value)
+        self.top_values.add(short)
+
+    def to_dict(self) -> Dict:
+        """Compact profile for the source record"""
+        profile = {
+            'name': self.name,
+            'type': self.type,
+            'count': self.count,
+            'nulls': self.nulls,
+            'invalid': self.invalid
+        }
+        if self.type in ('integer', 'float') and self.numeric_count:
+            profile['min'] = self.numeric_min
+            profile['max'] = self.numeric_max
+            profile['mean'] = round(self.numeric_sum / self.numeric_count, 6)
+        else:
+            profile['min'] = self.text_min
+            profile['max'] = self.text_max
+        profile['distinct'] = self.distinct.estimate()
+        profile['distinct_exact'] = self.distinct.exact
+        profile['top_values'] = self.top_values.top()
+        return profile
+
+
+def _detect_dialect(f) -> csv.Dialect:
+    """Sniff the delimiter from the start of the file"""
+    sample = f.read(SNIFF_BYTES)
+    f.seek(0)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=',;\t|')
+    except csv.Error:
+        return csv.excel
+
+
+def profile_csv(file_path: Path, settings: Optional[Dict] = None, data=None) -> Dict:
+    """Profile a CSV file with a header row in a single streaming pass
+
+    Column types are inferred from the first ``sample_rows`` rows, which are
+    the only rows held in memory. Integer columns widen to float when a
+    later value needs it; other values that do not fit the inferred type
+    are counted as ``invalid`` and left out of the numeric statistics.
+    ``data`` is the file's bytes when the caller has already read them.
+    """
+    settings = settings or {}
+    sample_rows = settings.get('sample_rows', 1000)
+    top_k = settings.get('top_k', 10)
+    sketch_size = settings.get('distinct_sketch_size', 1024)
+
+    if data is not None:
+        stream = text_stream(data, errors='replace', newline='')
+    else:
+        stream = open(file_path, 'r', encoding='utf-8', errors='replace', newline='')
+    with stream as f:
+        dialect = _detect_dialect(f)
+        reader = csv.reader(f, dialect)
+        header = next(reader, [])
+        names = [name.strip() or f"column_{i + 1}" for i, name in enumerate(header)]
+
+        sample = []
+        for row in reader:
+            sample.append(row)
+            if len(sample) >= sample_rows:
+                break
+
+        columns = []
+        for index, name in enumerate(names):
+            values = [row[index].strip() for row in sample if index < len(row)]
+            values = [value for value in values if value.lower() not in NULL_TOKENS]
+            columns.append(ColumnProfile(name, infer_type(values), top_k, sketch_size))
+
+        row_count = 0
+        ragged_rows = 0
+
+        def consume(row):
+            nonlocal row_count, ragged_rows
+            row_count += 1
+            if len(row) != len(columns):
+                ragged_rows += 1
+            for column, value in zip(columns, row):
+                column.add(value)
+
+        for row in sample:
+            consume(row)
+        sample = None
+        for row in reader:
+            consume(row)
+
+    profiles = [column.to_dict() for column in columns]
+    described = ', '.join(f"{p['name']} ({p['type']})" for p in profiles)
+    return {
+        'title': file_path.stem,
+        'type': 'tabular_data',
+        'schema': names,
+        'delimiter': dialect.delimiter,
+        'row_count': row_count,
+        'ragged_rows': ragged_rows,
+        'columns': profiles,
+        'summary': f"{row_count} rows x {len(names)} columns: {described}"[:500]
+    }
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Input Directory Discovery
+Recursive scandir walk of input/ with per-category globs and a directory mtime index
+"""
+
+import os
+import re
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+INDEX_VERSION = 1
+
+
+def glob_to_regex(pattern: str):
+    """Compile a glob where ``*`` and ``?`` stop at '/' and ``**`` spans directories"""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            out.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            out.append('[^/]')
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile(''.join(out) + r'\Z')
+
+
+class InputFilter:
+    """Decides which files and directories below a category directory are sources
+
+    Paths are relative to the category directory and use '/'. A pattern
+    without a '/' matches a file or directory name at any depth
+    (``*.tmp``, ``drafts``); a pattern with one matches the whole relative
+    path (``2026/**``, ``**/old/*.pdf``). A file is a source when its
+    suffix is supported, it matches an ``include`` pattern (or there are
+    none) and no ``exclude`` pattern; excluded directories are not entered.
+    """
+
+    def __init__(self, suffixes: List[str], include: Optional[List[str]] = None,
+                 exclude: Optional[List[str]] = None):
+        self.suffixes = {suffix.lower() for suffix in suffixes}
+        self.include = [(('/' in p), glob_to_regex(p)) for p in include or []]
+        self.exclude = [(('/' in p), glob_to_regex(p)) for p in exclude or []]
+
+    @staticmethod
+    def _matches(patterns, relative: str, name: str) -> bool:
+        """Whether any pattern matches the relative path or name"""
+        return any(regex.match(relative if has_slash else name) for has_slash, regex in patterns)
+
+    def accepts_file(self, relative: str, name: str) -> bool:
+        """Whether a file is a source"""
+        if os.path.splitext(name)[1].lower() not in self.suffixes:
+            return False
+        if self.include and not self._matches(self.include, relative, name):
+            return False
+        return not self._matches(self.exclude, relative, name)
+
+    def accepts_dir(self, relative: str, name: str) -> bool:
+        """Whether a directory is walked"""
+        return not self._matches(self.exclude, relative + '/', name)
+
+    def accepts_path(self, relative: str) -> bool:
+        """Whether a file found by other means than a walk is a source"""
+        parts = relative.split('/')
+        for depth in range(1, len(parts)):
+            if not self.accepts_dir('/'.join(parts[:depth]), parts[depth - 1]):
+                return False
+        return self.accepts_file(relative, parts[-1])
+
+
+def category_filters(config: Dict, categories: List[str]) -> Dict[str, InputFilter]:
+    """InputFilter per category from SUPPORTED_FORMATS and the DISCOVERY block"""
+    settings = config.get('DISCOVERY') or {}
+    include = settings.get('include') or {}
+    exclude = settings.get('exclude') or {}
+    return {
+        category: InputFilter(config['SUPPORTED_FORMATS'].get(category, []),
+                              include.get(category), exclude.get(category))
+        for category in categories
+    }
+
+
+def filter_settings(config: Dict, categories: List[str]) -> Dict:
+    """Everything that decides which files are sources, as JSON-compatible data"""
+    settings = config.get('DISCOVERY') or {}
+    return {
+        'formats': {category: list(config['SUPPORTED_FORMATS'].get(category, [])) for category in categories},
+        'include': {category: list((settings.get('include') or {}).get(category) or []) for category in categories},
+        'exclude': {category: list((settings.get('exclude') or {}).get(category) or []) for category in categories}
+    }
+
+
+def walk_files(root: str, input_filter: InputFilter,
+               index: Optional['DirectoryIndex'] = None) -> Iterator[Tuple[str, Optional[os.stat_result]]]:
+    """(relative path, stat) of every source file below root, depth first in name order
+
+    Stat results come from the scandir entries. With an ``index``, a
+    directory whose mtime matches its entry is not listed: its files come
+    from the index with a stat of None, and only its subdirectories are
+    stat'ed. Paths use the OS separator.
+    """
+    stack = ['']
+    while stack:
+        relative_dir = stack.pop()
+        directory = os.path.join(root, relative_dir) if relative_dir else root
+        mtime_ns, listing = index.lookup(directory) if index is not None else (None, None)
+        if listing is not None:
+            files, dirs = listing
+            for name in files:
+                yield os.path.join(relative_dir, name), None
+        else:
+            files, dirs = [], []
+            try:
+                with os.scandir(directory) as entries:
+                    entries = sorted(entries, key=lambda entry: entry.name)
+            except OSError:
+                continue
+            prefix = relative_dir.replace(os.sep, '/') + '/' if relative_dir else ''
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if input_filter.accepts_dir(prefix + entry.name, entry.name):
+                            dirs.append(entry.name)
+                    elif input_filter.accepts_file(prefix + entry.name, entry.name) and entry.is_file():
+                        st = entry.stat()
+                        files.append(entry.name)
+                        yield os.path.join(relative_dir, entry.name), st
+                except OSError:
+                    continue
+            if index is not None:
+                index.record(directory, mtime_ns, files, dirs)
+        stack.extend(os.path.join(relative_dir, name) for name in reversed(dirs))
+
+
+class DirectoryIndex:
+    """Listings of input directories, reused while a directory's mtime is unchanged
+
+    Adding, removing or renaming an entry changes its directory's mtime,
+    so an unchanged mtime means the same names; editing a file in place
+    does not, which is why listed files are still stat'ed by the caller.
+    Directories modified within ``settle_ns`` of the scan are never
+    stored, as they could change again within the mtime granularity.
+    The index is thrown away when the filter settings change.
+    """
+
+    def __init__(self, path, settings: Dict, scan_started_ns: int, settle_ns: int = 2_000_000_000):
+        self.path = Path(path)
+        self.settings = settings
+        self.settled_before_ns = scan_started_ns - settle_ns
+        self.entries = {}
+        self.visited = {}
+        self.listed = 0
+        self.reused = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get('version') == INDEX_VERSION and saved.get('settings') == settings:
+                self.entries = saved['directories']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def lookup(self, directory: str) -> Tuple[Optional[int], Optional[Tuple[List[str], List[str]]]]:
+        """A directory's mtime and, when it is unchanged, its (file names, subdirectory names)"""
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None, None
+        entry = self.entries.get(directory)
+        if entry is None or entry[0] != mtime_ns or mtime_ns >= self.settled_before_ns:
+            return mtime_ns, None
+        self.visited[directory] = entry
+        self.reused += 1
+        return mtime_ns, (entry[1], entry[2])
+
+    def record(self, directory: str, mtime_ns: Optional[int], files: List[str], dirs: List[str]):
+        """Remember a directory just listed; mtime_ns must predate the listing"""
+        self.listed += 1
+        if mtime_ns is not None and mtime_ns < self.settled_before_ns:
+            self.visited[directory] = [mtime_ns, files, dirs]
+
+    def save(self):
+        """Persist the directories seen by the last walk, dropping the rest"""
+        from source_store import atomic_write_json
+        if self.visited == self.entries:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(self.path, {'version': INDEX_VERSION, 'settings': self.settings,
+                                      'directories': self.visited})
+        self.entries = self.visited
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Content Extractors for Research Sources
+Hashing, extraction and archiving of single files, shared by the serial
+scanner and the parallel ingestion workers
+"""
+
+import json
+import yaml
+import hashlib
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from markdown_parser import iter_lines, parse_markdown
+from near_duplicates import minhash_signature, signature_text
+from source_reader import HASH_CHUNK_SIZE, binary_stream, hash_buffer, open_source, text_stream
+
+# Output version of each extractor. Bump one whenever its output changes;
+# `source_manager.py reprocess` re-extracts the records made by older
+# versions. Records from before versioning count as version 1.
+EXTRACTOR_VERSIONS = {
+    'markdown': 1,
+    'structured': 1,
+    'csv': 1,
+    'text': 1,
+    'pdf': 1,
+}
+
+
+def calculate_file_hash(file_path: Path) -> str:
+    """Calculate SHA-256 hash of file"""
+    hash_sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            hash_sha256.update(chunk)
+    return hash_sha256.hexdigest()
+
+
+def extract_markdown_content(file_path: Path, data=None) -> Dict:
+    """Extract content from markdown briefing files
+    
+    Sections are recorded as a heading tree with byte offsets into the file;
+    the text itself is kept once, as the document content. ``data`` is the
+    file's bytes when the caller has already read them.
+    """
+    if data is None:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    with binary_stream(data) as stream:
+        parsed = parse_markdown(iter_lines(stream))
+    front_matter = parsed['front_matter']
+    
+    return {
+        'title': front_matter.get('title', file_path.stem),
+        'author': front_matter.get('author', ''),
+        'date': front_matter.get('date', ''),
+        'tags': front_matter.get('tags', []),
+        'priority': front_matter.get('priority', 'medium'),
+        'sections': parsed['sections'],
+        'summary': parsed['summary'],
+        'content': str(data, 'utf-8', errors='replace')
+    }
+
+
+def extract_structured_data(file_path: Path, settings: Optional[Dict] = None, data=None) -> Dict:
+    """Extract content from structured data files
+    
+    Files of at least ``stream_threshold_bytes`` are never loaded: the
+    summary, schema sketch and record counts come from parse events, and
+    the record carries no ``data`` body. ``data`` is the file's bytes when
+    the caller has already read them.
+    """
+    from structured_data import (SAMPLE_ITEMS, iter_json_events, iter_value_events, iter_yaml_events,
+                                 sketch_events)
+    settings = settings or {}
+    threshold = settings.get('stream_threshold_bytes', 16 * 1024 * 1024)
+    size = len(data) if data is not None else file_path.stat().st_size
+    stream = text_stream(data) if data is not None else open(file_path, 'r', encoding='utf-8')
+    data = None
+    with stream as f:
+        if size >= threshold:
+            if file_path.suffix == '.json':
+                events = iter_json_events(f, settings.get('sample_items', SAMPLE_ITEMS))
+            else:
+                events = iter_yaml_events(f)
+            sketch = sketch_events(events, settings)
+        else:
+            data = json.load(f) if file_path.suffix == '.json' else yaml.safe_load(f)
+            sketch = sketch_events(iter_value_events(data), settings)
+    
+    structure = sketch.structure()
+    content = {
+        'title': sketch.top_level.get('title', file_path.stem),
+        'type': sketch.top_level.get('type', 'structured_data'),
+        'schema': sketch.top_keys if structure.get('type') == 'object' else 'array',
+        'structure': structure,
+        'summary': sketch.summary
+    }
+    if sketch.record_count is not None:
+        content['record_count'] = sketch.record_count
+    if sketch.record_counts:
+        content['record_counts'] = sketch.record_counts
+    if data is not None:
+        content['data'] = data
+    return content
+
+
+def extract_text_content(file_path: Path, data=None) -> Dict:
+    """Extract content from plain text files"""
+    if data is None:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    else:
+        # Same newline translation as reading the file in text mode
+        content = str(data, 'utf-8')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+    
+    # Basic text analysis
+    lines = content.split('\n')
+    words = content.split()
+    
+    return {
+        'title': file_path.stem,
+        'type': 'text_document',
+        'line_count': len(lines),
+        'word_count': len(words),
+        'summary': content[:500],
+        'content': content
+    }
+
+
+def extractor_name(file_path: Path, category: str) -> Optional[str]:
+    """Which extractor handles a file, or None when none does"""
+    if file_path.suffix.lower() == '.pdf':
+        return 'pdf'
+    elif category == 'briefings' and file_path.suffix == '.md':
+        return 'markdown'
+    elif category == 'data' and file_path.suffix in ['.json', '.yaml', '.yml']:
+        return 'structured'
+    elif category == 'data' and file_path.suffix.lower() == '.csv':
+        return 'csv'
+    elif category == 'papers' and file_path.suffix == '.txt':
+        return 'text'
+    return None
+
+
+def cached_extraction(cache_root: str, file_hash: str, extractor: str, file_name: str) -> Optional[Dict]:
+    """Output of the current version of an extractor stored for this content, if any
+
+    Extractors fall back to the file name for titles, so a stored output is
+    only reused for a file of the same name.
+    """
+    from blob_store import BlobStore, extraction_key
+    cached = BlobStore(cache_root, cache_size=0).get(
+        extraction_key(file_hash, extractor, EXTRACTOR_VERSIONS[extractor])
+    )
+    if not cached or cached.pop('source_name', None) != file_name:
+        return None
+    return cached
+
+
+def extract_source(file_path: Path, category: str, file_hash: str = '',
+                   options: Optional[Dict] = None, data=None) -> Dict:
+    """Extract content based on file type
+    
+    ``options`` carries extractor settings from the manager: ``pdf`` (the
+    PDF_PROCESSING block), ``pdf_cache_dir``, ``page_workers`` and ``csv``
+    (the CSV_PROCESSING block), ``data`` (the DATA_PROCESSING block) and
+    ``minhash`` (the NEAR_DUPLICATES block). ``data`` is a bytes-like view
+    of the file already read by the caller; without it the extractors read
+    the file themselves.
+    """
+    options = options or {}
+    extractor = extractor_name(file_path, category)
+    if extractor == 'pdf':
+        from pdf_extractor import extract_pdf_content
+        # Page text is cached per extractor version, so a new version re-reads pages
+        page_cache = Path(options.get('pdf_cache_dir', '.superlead/pdf_pages')) / f"v{EXTRACTOR_VERSIONS['pdf']}"
+        return extract_pdf_content(
+            file_path, file_hash, str(page_cache), options.get('pdf'), options.get('page_workers', 1), data
+        )
+    elif extractor == 'markdown':
+        return extract_markdown_content(file_path, data)
+    elif extractor == 'structured':
+        return extract_structured_data(file_path, options.get('data'), data)
+    elif extractor == 'csv':
+        from csv_profiler import profile_csv
+        return profile_csv(file_path, options.get('csv'), data)
+    elif extractor == 'text':
+        return extract_text_content(file_path, data)
+    return {}
+
+
+def process_source_file(file_path: str, category: str, known_hash: Optional[str] = None,
+                        options: Optional[Dict] = None) -> Dict:
+    """Hash, extract and archive one file, reading it only once
+    
+    Runs inside ingestion worker processes, so it only returns plain data:
+    the file hash, the extracted fields (None when the hash matches
+    ``known_hash``), a MinHash signature of the text when ``options``
+    enables ``minhash``, an error message if processing failed, the
+    extractor's ``version``, whether the fields came from the extraction
+    cache at ``options['cache']`` (``cached``), and ``size``,
+    ``extractor`` and per-step ``timings`` for run metrics.
+    
+    PDF text is never held whole: it is streamed from the page cache into
+    the body stored in ``options['cache']``, and ``body_stored`` is set
+    while the extracted fields carry no ``content``.
+    
+    The file is opened once according to ``options['read_mode']`` and the
+    same bytes are hashed, handed to the extractor and, when ``options``
+    carries an ``archive`` block, written to the content-addressed archive.
+    ``archived`` is then the storage method used, or None when the object
+    already existed or is left to the manager.
+    """
+    from archive_store import SourceArchive
+    options = options or {}
+    path = Path(file_path)
+    extractor = extractor_name(path, category)
+    timings = {}
+    result = {'hash': None, 'content': None, 'signature': None, 'error': None,
+              'size': 0, 'extractor': extractor, 'version': EXTRACTOR_VERSIONS.get(extractor),
+              'cached': False, 'archived': None, 'body_stored': False, 'timings': timings}
+    try:
+        with open_source(path, options.get('read_mode', 'mmap')) as data:
+            start = time.perf_counter()
+            result['size'] = len(data)
+            result['hash'] = hash_buffer(data)
+            timings['hash'] = time.perf_counter() - start
+            if result['hash'] == known_hash:
+                return result
+            
+            start = time.perf_counter()
+            content = None
+            # PDFs are cached page by page instead, as their stored body is not loaded whole
+            if options.get('cache') and extractor and extractor != 'pdf':
+                content = cached_extraction(options['cache'], result['hash'], extractor, path.name)
+                result['cached'] = content is not None
+            if content is None:
+                content = extract_source(path, category, result['hash'], options, data)
+            timings['extract'] = time.perf_counter() - start
+            minhash = options.get('minhash') or {}
+            if minhash.get('enabled', False):
+                start = time.perf_counter()
+                result['signature'] = minhash_signature(
+                    signature_text(content), minhash.get('num_perm', 128), minhash.get('shingle_size', 5)
+                )
+                timings['signature'] = time.perf_counter() - start
+            
+            text = content.get('content')
+            if text is not None and not isinstance(text, str):
+                content = {field: value for field, value in content.items() if field != 'content'}
+                if options.get('cache'):
+                    from blob_store import BlobStore, extraction_key
+                    BlobStore(options['cache'], cache_size=0).put_text(
+                        extraction_key(result['hash'], extractor, result['version']),
+                        dict(content, source_name=path.name), 'content', text
+                    )
+                    result['body_stored'] = True
+                else:
+                    content['content'] = str(text)
+            
+            archive = options.get('archive')
+            if archive:
+                start = time.perf_counter()
+                try:
+                    result['archived'] = SourceArchive(archive['root'], archive.get('method', 'auto')).store(
+                        path, result['hash'], data
+                    )
+                except OSError:
+                    pass  # the manager archives from the path and reports the failure
+                timings['archive'] = time.perf_counter() - start
+        result['content'] = content
+    except Exception as e:
+        result.update(hash=None, content=None, signature=None, archived=None, body_stored=False, error=str(e))
+    return result
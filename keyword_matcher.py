@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Multi-Pattern Keyword Matcher
+Finds every vocabulary term in a document with one compiled regular expression
+"""
+
+import re
+from typing import Dict, Iterable, List
+
+
+class KeywordMatcher:
+    """Counts whole-word occurrences of a vocabulary in a single pass
+
+    Terms are folded into a prefix trie and emitted as one regex, so shared
+    prefixes ("navigation", "navigator") are only tested once per position
+    and the scan cost stays close to linear in the text length even for
+    vocabularies of thousands of terms. Multi-word terms match across any
+    run of whitespace.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms = []
+        self._canonical = {}
+        for term in terms:
+            key = self._normalize(term)
+            if key and key not in self._canonical:
+                self._canonical[key] = term
+                self.terms.append(term)
+        self.pattern = self._compile(self._canonical)
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return ' '.join(text.lower().split())
+
+    @classmethod
+    def _compile(cls, terms: Iterable[str]):
+        trie = {}
+        for term in terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        if not trie:
+            return None
+        return re.compile(r'(?<!\w)(?:' + cls._trie_regex(trie) + r')(?!\w)', re.IGNORECASE)
+
+    @classmethod
+    def _trie_regex(cls, node: Dict) -> str:
+        """Render a trie node as a regex that needs no backtracking between siblings"""
+        optional = '' in node
+        branches = []
+        for char in sorted(c for c in node if c):
+            atom = r'\s+' if char == ' ' else re.escape(char)
+            branches.append(atom + cls._trie_regex(node[char]))
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if optional:
+            body = '(?:' + body + ')?'
+        return body
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Return term -> occurrence count for every term found in the text"""
+        counts = {}
+        if self.pattern is None or not text:
+            return counts
+        for match in self.pattern.finditer(text):
+            term = self._canonical.get(self._normalize(match.group(0)))
+            if term is not None:
+                counts[term] = counts.get(term, 0) + 1
+        return counts
+
+    def ordered(self, counts: Dict[str, int]) -> List[str]:
+        """Found terms in vocabulary order"""
+        return [term for term in self.terms if term in counts]
+
+    def __contains__(self, term: str) -> bool:
+        return self._normalize(term) in self._canonical
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Streaming Markdown Section Parser
+Builds a heading tree with byte offsets in one pass over a markdown file
+"""
+
+import re
+import yaml
+from typing import BinaryIO, Dict, Iterable
+
+HEADING_PATTERN = re.compile(rb'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?[ \t]*$')
+CLOSING_HASHES = re.compile(r'(?:^|[ \t]+)#+$')
+FENCE_PATTERN = re.compile(rb'^ {0,3}(`{3,}|~{3,})')
+
+# Lines are read in bounded pieces so a file without newlines cannot
+# force the whole document into memory
+MAX_LINE_BYTES = 64 * 1024
+MAX_FRONT_MATTER_BYTES = 64 * 1024
+SUMMARY_LENGTH = 500
+
+
+def slugify(title: str) -> str:
+    """GitHub-style heading anchor"""
+    slug = re.sub(r'[^\w\- ]', '', title.strip().lower())
+    return slug.replace(' ', '-')
+
+
+class MarkdownSectionParser:
+    """Line-oriented parser that records sections instead of copying them
+
+    Feed raw lines (bytes, including their line endings) and call close().
+    Each section records its heading level, anchor, parent index and byte
+    offsets: ``start`` (heading line), ``body_start`` (first line after the
+    heading) and ``end`` (next heading of the same or a higher level, so a
+    section spans its subsections). Headings inside fenced code blocks are
+    ignored. Only the summary text is retained, capped at SUMMARY_LENGTH.
+    """
+
+    def __init__(self):
+        self.offset = 0
+        self.front_matter = {}
+        self.sections = []
+        self.body_start = 0
+        self._open = []  # indices of sections whose end is not known yet
+        self._anchors = {}
+        self._fence = None
+        self._at_line_start = True
+        self._front_matter_state = 'maybe'
+        self._front_matter_lines = []
+        self._front_matter_bytes = 0
+        self._intro = []
+        self._intro_length = 0
+        self._key_findings = None
+        self._in_key_findings = False
+
+    def feed(self, line: bytes):
+        """Consume the next line (or piece of an over-long line)"""
+        start = self.offset
+        self.offset += len(line)
+        line_start = self._at_line_start
+        self._at_line_start = line.endswith(b'\n')
+
+        if self._front_matter_state != 'done':
+            if self._feed_front_matter(line, start, line_start):
+                return
+
+        self._feed_body(line, start, line_start)
+
+    def _feed_body(self, line: bytes, start: int, line_start: bool):
+        """Track code fences and headings for a line of document body"""
+        if line_start:
+            fence = FENCE_PATTERN.match(line)
+            if fence:
+                marker = fence.group(1)
+                if self._fence is None:
+                    self._fence = marker
+                elif marker[:1] == self._fence[:1] and len(marker) >= len(self._fence):
+                    self._fence = None
+            elif self._fence is None:
+                heading = HEADING_PATTERN.match(line.rstrip(b'\r\n'))
+                if heading:
+                    self._open_section(heading, start, start + len(line))
+                    self._collect_intro(line)
+                    return
+
+        self._collect_intro(line)
+        if self._in_key_findings and len(self._key_findings) < SUMMARY_LENGTH * 4:
+            self._key_findings.extend(line)
+
+    def _feed_front_matter(self, line: bytes, start: int, line_start: bool) -> bool:
+        """Handle YAML front matter; returns True when the line belonged to it"""
+        stripped = line.strip()
+        if self._front_matter_state == 'maybe':
+            if start == 0 and stripped == b'---':
+                self._front_matter_state = 'inside'
+                return True
+            self._front_matter_state = 'done'
+            return False
+
+        if stripped in (b'---', b'...'):
+            self._front_matter_state = 'done'
+            self.body_start = self.offset
+            try:
+                text = b''.join(line for line, _, _ in self._front_matter_lines)
+                loaded = yaml.safe_load(text.decode('utf-8', errors='replace'))
+                self.front_matter = loaded if isinstance(loaded, dict) else {}
+            except yaml.YAMLError:
+                self.front_matter = {}
+            self._front_matter_lines = []
+            return True
+
+        self._front_matter_bytes += len(line)
+        if self._front_matter_bytes > MAX_FRONT_MATTER_BYTES:
+            # Not front matter after all; treat what was buffered as content
+            self._replay_front_matter()
+            return False
+        self._front_matter_lines.append((line, start, line_start))
+        return True
+
+    def _replay_front_matter(self):
+        """Parse buffered lines of an unterminated front matter block as body"""
+        self._front_matter_state = 'done'
+        buffered, self._front_matter_lines = self._front_matter_lines, []
+        for line, start, line_start in buffered:
+            self._feed_body(line, start, line_start)
+
+    def _open_section(self, heading, start: int, body_start: int):
+        """Start a section, closing open sections at the same or deeper level"""
+        level = len(heading.group(1))
+        title = (heading.group(2) or b'').decode('utf-8', errors='replace')
+        title = CLOSING_HASHES.sub('', title).strip()
+
+        if self.sections:
+            self.sections[-1]['content_end'] = start
+        while self._open and self.sections[self._open[-1]]['level'] >= level:
+            self.sections[self._open.pop()]['end'] = start
+
+        anchor = slugify(title) or 'section'
+        count = self._anchors.get(anchor, 0)
+        self._anchors[anchor] = count + 1
+        if count:
+            anchor = f"{anchor}-{count}"
+
+        self.sections.append({
+            'title': title,
+            'anchor': anchor,
+            'level': level,
+            'parent': self._open[-1] if self._open else None,
+            'start': start,
+            'body_start': body_start,
+            'content_end': None,
+            'end': None
+        })
+        self._open.append(len(self.sections) - 1)
+
+        # The summary prefers the first "Key Findings" section
+        self._in_key_findings = self._key_findings is None and anchor == 'key-findings'
+        if self._in_key_findings:
+            self._key_findings = bytearray()
+
+    def _collect_intro(self, line: bytes):
+        """Keep just enough of the document start for the summary"""
+        if self._intro_length < SUMMARY_LENGTH * 4:
+            self._intro.append(line)
+            self._intro_length += len(line)
+
+    def close(self) -> Dict:
+        """Finish parsing and return front matter, sections and summary"""
+        if self._front_matter_state == 'inside':
+            # Unterminated front matter is ordinary content
+            self._replay_front_matter()
+        if self.sections:
+            self.sections[-1]['content_end'] = self.offset
+        for index in self._open:
+            self.sections[index]['end'] = self.offset
+        self._open = []
+
+        if self._key_findings is not None:
+            summary = bytes(self._key_findings)
+        else:
+            summary = b''.join(self._intro)
+        summary = summary.decode('utf-8', errors='ignore').strip()[:SUMMARY_LENGTH]
+
+        return {
+            'front_matter': self.front_matter,
+            'sections': self.sections,
+            'body_start': self.body_start,
+            'size': self.offset,
+            'summary': summary
+        }
+
+
+def iter_lines(stream: BinaryIO) -> Iterable[bytes]:
+    """Read lines in pieces of at most MAX_LINE_BYTES"""
+    return iter(lambda: stream.readline(MAX_LINE_BYTES), b'')
+
+
+def parse_markdown(lines: Iterable[bytes]) -> Dict:
+    """Parse an iterable of raw markdown lines"""
+    parser = MarkdownSectionParser()
+    for line in lines:
+        parser.feed(line)
+    return parser.close()
+
+
+def section_text(data: bytes, section: Dict, include_subsections: bool = False) -> str:
+    """Slice the text of a section out of the raw document bytes
+
+    By default only the section's own text is returned, up to its first
+    subsection.
+    """
+    end = section['end'] if include_subsections else section['content_end']
+    return data[section['body_start']:end].decode('utf-8', errors='replace').strip()
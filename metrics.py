@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Ingestion Run Metrics
+Stage timers, counters and slowest files, exported as JSON and Prometheus text
+"""
+
+import os
+import time
+import heapq
+import cProfile
+import contextlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from source_store import atomic_write_json
+
+PROMETHEUS_PREFIX = 'superlead'
+
+
+class RunMetrics:
+    """Measurements of one ingestion run
+
+    Stages are wall-clock timers entered with ``stage(name)``; the same
+    stage may be entered many times. Counters are plain integers.
+    Per-file timings reported by extraction workers feed the per-extractor
+    totals and the ``slowest`` heaviest files. With several workers the
+    hash and extract totals add up time spent in parallel, so they can
+    exceed the wall-clock ``extraction`` stage.
+    """
+
+    def __init__(self, slowest: int = 10):
+        self.slowest_limit = slowest
+        self.reset()
+
+    def reset(self):
+        """Forget everything measured so far and restart the run clock"""
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self.duration = None
+        self.stages = {}
+        self.counters = {}
+        self.extractors = {}
+        self._slowest = []
+        self.success = True
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block as (part of) a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float):
+        """Add an already measured duration to a stage"""
+        entry = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+        entry['seconds'] += seconds
+        entry['calls'] += 1
+
+    def count(self, name: str, amount: int = 1):
+        """Increase a counter"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_file(self, path: str, extractor: Optional[str], timings: Dict[str, float], size: int):
+        """Account for one hashed and possibly extracted file"""
+        for name, seconds in timings.items():
+            self.add_time(name, seconds)
+        if 'extract' in timings and extractor:
+            entry = self.extractors.setdefault(extractor, {'seconds': 0.0, 'files': 0, 'bytes': 0})
+            entry['seconds'] += timings['extract']
+            entry['files'] += 1
+            entry['bytes'] += size
+
+        total = sum(timings.values())
+        item = (total, path, extractor or '', size)
+        if len(self._slowest) < self.slowest_limit:
+            heapq.heappush(self._slowest, item)
+        elif self._slowest and total > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, item)
+
+    def finish(self, success: bool = True):
+        """Stop the run clock"""
+        self.duration = time.perf_counter() - self._started
+        self.success = success
+
+    def slowest(self) -> List[Dict]:
+        """Slowest files, slowest first"""
+        return [
+            {'file_path': path, 'extractor': extractor, 'seconds': round(seconds, 6), 'bytes': size}
+            for seconds, path, extractor, size in sorted(self._slowest, reverse=True)
+        ]
+
+    def snapshot(self) -> Dict:
+        """Everything measured, as JSON-compatible data"""
+        duration = self.duration if self.duration is not None else time.perf_counter() - self._started
+        return {
+            'started_at': self.started_at.isoformat(),
+            'duration_seconds': round(duration, 6),
+            'success': self.success,
+            'stages': {name: {'seconds': round(entry['seconds'], 6), 'calls': entry['calls']}
+                       for name, entry in sorted(self.stages.items())},
+            'counters': dict(sorted(self.counters.items())),
+            'extractors': {name: dict(entry, seconds=round(entry['seconds'], 6))
+                           for name, entry in sorted(self.extractors.items())},
+            'slowest_files': self.slowest()
+        }
+
+    def write_json(self, path):
+        """Write the snapshot atomically"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(path, self.snapshot(), indent=2)
+
+    def write_prometheus(self, path):
+        """Write the snapshot in the node exporter textfile format
+
+        The file is replaced atomically, as the textfile collector may read
+        it at any moment.
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples: List[tuple]):
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+                label_text = f"{{{label_text}}}" if label_text else ''
+                lines.append(f"{PROMETHEUS_PREFIX}_{name}{label_text} {value}")
+
+        metric('last_run_timestamp_seconds', 'gauge', "Start of the last ingestion run.",
+               [({}, f"{self.started_at.timestamp():.3f}")])
+        metric('last_run_duration_seconds', 'gauge', "Wall-clock duration of the last ingestion run.",
+               [({}, snapshot['duration_seconds'])])
+        metric('last_run_success', 'gauge', "1 if the last ingestion run completed.",
+               [({}, int(snapshot['success']))])
+        metric('stage_seconds', 'gauge', "Time spent per ingestion stage in the last run.",
+               [({'stage': name}, entry['seconds']) for name, entry in snapshot['stages'].items()])
+        metric('stage_calls', 'gauge', "Times each stage ran in the last run.",
+               [({'stage': name}, entry['calls']) for name, entry in snapshot['stages'].items()])
+        metric('run_count', 'gauge', "Files and bytes counted in the last run.",
+               [({'counter': name}, value) for name, value in snapshot['counters'].items()])
+        metric('extractor_seconds', 'gauge', "Extraction time per extractor in the last run.",
+               [({'extractor': name}, entry['seconds']) for name, entry in snapshot['extractors'].items()])
+        metric('extractor_files', 'gauge', "Files extracted per extractor in the last run.",
+               [({'extractor': name}, entry['files']) for name, entry in snapshot['extractors'].items()])
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, path)
+
+
+def _escape_label(value) -> str:
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RunProfiler:
+    """Opt-in cProfile of a whole run, saved as a pstats file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.profile = None
+
+    def start(self):
+        """Start collecting"""
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def stop(self) -> Optional[Path]:
+        """Stop collecting and save the profile; returns its path"""
+        if self.profile is None:
+            return None
+        self.profile.disable()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.profile.dump_stats(str(self.path))
+        self.profile = None
+        return self.path
+
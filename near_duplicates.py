@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detection
+MinHash signatures over word shingles with a banded LSH index in SQLite
+"""
+
+import re
+import sqlite3
+import hashlib
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _hash64(text: str) -> int:
+    """Stable 64-bit hash (Python's hash() is salted per process)"""
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def signature_text(fields: Dict) -> Union[str, Iterable[str]]:
+    """The text a source is fingerprinted on: its body, else its summary
+
+    A body streamed from disk (a PDF's PageText) is returned as is.
+    """
+    content = fields.get('content')
+    if isinstance(content, str):
+        if content:
+            return content
+    elif content is not None:
+        return content
+    return str(fields.get('summary', '') or '')
+
+
+def _shingles(chunks: Iterable[str], size: int):
+    """Word shingles of the joined chunks; a text shorter than ``size`` words is one shingle"""
+    window = deque(maxlen=size)
+    emitted = False
+    for chunk in chunks:
+        for token in TOKEN_PATTERN.findall(chunk.lower()):
+            window.append(token)
+            if len(window) == size:
+                yield ' '.join(window)
+                emitted = True
+    if window and not emitted:
+        yield ' '.join(window)
+
+
+def minhash_signature(text: Union[str, Iterable[str]], num_perm: int = 128,
+                      shingle_size: int = 5) -> Optional[bytes]:
+    """One-permutation MinHash over word shingles, packed as uint64s
+
+    Every shingle is hashed once; the hash picks one of ``num_perm`` bins
+    and the bin keeps its minimum. Empty bins borrow the next filled bin
+    (with an offset per step) so short texts still compare consistently.
+    ``text`` may also be chunks split between words, which are read one at
+    a time. Returns None for text without words.
+    """
+    empty = 1 << 64
+    bins = [empty] * num_perm
+    filled = False
+    for shingle in _shingles([text] if isinstance(text, str) else text, shingle_size):
+        h = _hash64(shingle)
+        slot, value = h % num_perm, h // num_perm
+        if value < bins[slot]:
+            bins[slot] = value
+        filled = True
+    if not filled:
+        return None
+
+    if empty in bins:
+        step = (1 << 64) // num_perm
+        original = list(bins)
+        for i in range(num_perm):
+            if original[i] == empty:
+                offset = 1
+                while original[(i + offset) % num_perm] == empty:
+                    offset += 1
+                bins[i] = original[(i + offset) % num_perm] + offset * step
+    return array('Q', bins).tobytes()
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    left = array('Q', a)
+    right = array('Q', b)
+    if len(left) != len(right) or not left:
+        return 0.0
+    return sum(1 for x, y in zip(left, right) if x == y) / len(left)
+
+
+class NearDuplicateIndex:
+    """Locality-sensitive hash index over MinHash signatures
+
+    Signatures are cut into ``bands`` bands; sources sharing any band
+    bucket become candidates, so a lookup touches only similar sources
+    instead of the whole corpus. Candidates are then ranked by their
+    estimated similarity.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS signatures (
+            source TEXT PRIMARY KEY,
+            signature BLOB NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS buckets (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            source TEXT NOT NULL,
+            PRIMARY KEY (band, bucket, source)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_buckets_source ON buckets(source);
+    """
+
+    def __init__(self, path: str, num_perm: int = 128, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.path = Path(path)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def _buckets(self, signature: bytes) -> List[Tuple[int, int]]:
+        """(band, bucket) keys of a signature"""
+        width = len(signature) // self.bands
+        return [
+            (band, int.from_bytes(hashlib.blake2b(signature[band * width:(band + 1) * width],
+                                                  digest_size=7).digest(), 'little'))
+            for band in range(self.bands)
+        ]
+
+    def remove_source(self, source: str):
+        """Forget a source's signature"""
+        self.conn.execute("DELETE FROM buckets WHERE source = ?", (source,))
+        self.conn.execute("DELETE FROM signatures WHERE source = ?", (source,))
+
+    def add(self, source: str, signature: bytes):
+        """Index or replace a source's signature"""
+        self.remove_source(source)
+        self.conn.execute("INSERT INTO signatures (source, signature) VALUES (?, ?)",
+                          (source, signature))
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO buckets (band, bucket, source) VALUES (?, ?, ?)",
+            [(band, bucket, source) for band, bucket in self._buckets(signature)]
+        )
+
+    def query(self, signature: bytes, threshold: float = 0.8, limit: int = 5,
+              exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Indexed sources at least ``threshold`` similar, most similar first"""
+        candidates = set()
+        for band, bucket in self._buckets(signature):
+            candidates.update(row[0] for row in self.conn.execute(
+                "SELECT source FROM buckets WHERE band = ? AND bucket = ?", (band, bucket)
+            ))
+        candidates.discard(exclude)
+
+        matches = []
+        for source in sorted(candidates):
+            row = self.conn.execute(
+                "SELECT signature FROM signatures WHERE source = ?", (source,)
+            ).fetchone()
+            score = similarity(signature, row[0]) if row else 0.0
+            if score >= threshold:
+                matches.append((source, score))
+        matches.sort(key=lambda match: -match[1])
+        return matches[:limit]
+
+    def clear(self):
+        """Drop every signature"""
+        self.conn.execute("DELETE FROM buckets")
+        self.conn.execute("DELETE FROM signatures")
+
+    def commit(self):
+        """Persist pending index updates"""
+        self.conn.commit()
+
+    def close(self):
+        """Close the index database"""
+        self.conn.close()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+PDF Text Extraction
+Streams PDF papers page by page into a per-page text cache keyed by file hash
+"""
+
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from source_reader import binary_stream
+
+# Documents with at least this many pages are split across processes
+PAGE_PARALLEL_THRESHOLD = 64
+
+
+def _open_reader(source):
+    """Open a PDF (a path or binary stream) lazily; pages are only parsed when accessed"""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise RuntimeError("PDF extraction requires the pypdf package (pip install pypdf)")
+    return PdfReader(source)
+
+
+def _page_path(page_dir: Path, page_number: int) -> Path:
+    """Cache file for one page's text"""
+    return page_dir / f"{page_number:05d}.txt"
+
+
+def _extract_page_range(file_path: str, start: int, stop: int, page_dir: str,
+                        count_images: bool, reader=None) -> Dict:
+    """Extract and cache pages [start, stop), holding one page at a time"""
+    if reader is None:
+        reader = _open_reader(file_path)
+    page_dir = Path(page_dir)
+    words = 0
+    images = 0
+    for page_number in range(start, stop):
+        cached = _page_path(page_dir, page_number)
+        page = None
+        if cached.exists():
+            with open(cached, 'r', encoding='utf-8') as f:
+                text = f.read()
+        else:
+            page = reader.pages[page_number]
+            text = page.extract_text() or ''
+            # Per process, as workers may extract the same document at once
+            tmp_path = cached.with_name(f".{cached.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, cached)
+        words += len(text.split())
+        if count_images:
+            page = page or reader.pages[page_number]
+            images += len(page.images)
+    return {'words': words, 'images': images}
+
+
+class PageText:
+    """Text of a document in the page cache, read back one page at a time
+
+    Iterating yields the pages with a blank line between them, which
+    joined are the document text, so it can be written out or
+    fingerprinted while only one page is in memory.
+    """
+
+    SEPARATOR = '\n\n'
+
+    def __init__(self, page_dir: Path, page_count: int):
+        self.page_dir = Path(page_dir)
+        self.page_count = page_count
+
+    def __iter__(self):
+        for page_number in range(self.page_count):
+            if page_number:
+                yield self.SEPARATOR
+            with open(_page_path(self.page_dir, page_number), 'r', encoding='utf-8') as f:
+                yield f.read()
+
+    def __str__(self) -> str:
+        return ''.join(self)
+
+    def summary(self, length: int = 500) -> str:
+        """The first ``length`` characters of the stripped text, reading only the pages needed"""
+        text = ''
+        for chunk in self:
+            text += chunk
+            if len(text.strip()) >= length:
+                break
+        return text.strip()[:length]
+
+
+def extract_pdf_content(file_path: Path, file_hash: str, cache_dir: str,
+                        settings: Optional[Dict] = None, page_workers: int = 1, data=None) -> Dict:
+    """Extract metadata and text from a PDF according to PDF_PROCESSING
+
+    Page text is cached under ``<cache_dir>/<file_hash>/`` so re-extracting
+    an unchanged document only reads the cache. ``content`` is a PageText
+    over that cache rather than a string, and ``summary`` comes from the
+    first pages, so memory does not grow with the document. Large
+    documents are split into page ranges handled by ``page_workers``
+    processes, which open the file themselves. Otherwise the document is
+    parsed from ``data``, the file's bytes, when the caller has already
+    read them.
+    """
+    if data is None:
+        return _extract_pdf(file_path, file_hash, cache_dir, settings, page_workers, str(file_path))
+    # The stream must be closed before the caller can release the bytes
+    with binary_stream(data) as stream:
+        return _extract_pdf(file_path, file_hash, cache_dir, settings, page_workers, stream)
+
+
+def _extract_pdf(file_path: Path, file_hash: str, cache_dir: str, settings: Optional[Dict],
+                 page_workers: int, source) -> Dict:
+    """Body of extract_pdf_content, reading the document from a path or stream"""
+    settings = settings or {}
+    reader = _open_reader(source)
+    page_count = len(reader.pages)
+
+    info = {
+        'title': file_path.stem,
+        'author': '',
+        'type': 'pdf_document',
+        'page_count': page_count
+    }
+    if settings.get('extract_metadata', True) and reader.metadata:
+        info['title'] = reader.metadata.title or file_path.stem
+        info['author'] = reader.metadata.author or ''
+
+    if not settings.get('extract_text', True):
+        info['summary'] = ''
+        return info
+
+    page_dir = Path(cache_dir) / file_hash
+    page_dir.mkdir(parents=True, exist_ok=True)
+    count_images = bool(settings.get('extract_images', False))
+
+    if page_workers > 1 and page_count >= PAGE_PARALLEL_THRESHOLD:
+        step = -(-page_count // page_workers)
+        ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [
+                pool.submit(_extract_page_range, str(file_path), start, stop, str(page_dir), count_images)
+                for start, stop in ranges
+            ]
+            results = [future.result() for future in futures]
+    else:
+        results = [_extract_page_range(str(file_path), 0, page_count, str(page_dir), count_images, reader)]
+
+    info['word_count'] = sum(result['words'] for result in results)
+    if count_images:
+        info['image_count'] = sum(result['images'] for result in results)
+    text = PageText(page_dir, page_count)
+    info['summary'] = text.summary()
+    info['content'] = text
+    return info
+
+
+def evict_pages(cache_dir: str, file_hashes: Iterable[str]) -> int:
+    """Delete the cached pages of these hashes under every extractor version; returns directories removed"""
+    removed = 0
+    root = Path(cache_dir)
+    if not root.is_dir():
+        return 0
+    for file_hash in file_hashes:
+        for page_dir in root.glob(f"v*/{file_hash}"):
+            shutil.rmtree(page_dir, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def purge_old_versions(cache_dir: str, version: int) -> int:
+    """Delete the page caches of extractor versions other than ``version``; returns directories removed"""
+    removed = 0
+    root = Path(cache_dir)
+    if not root.is_dir():
+        return 0
+    for version_dir in root.glob('v*'):
+        if version_dir.is_dir() and version_dir.name != f"v{version}":
+            shutil.rmtree(version_dir, ignore_errors=True)
+            removed += 1
+    return removed
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Incremental Integration Report
+Appends sections for records changed since the last report, rotating old reports
+"""
+
+import os
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator
+
+REPORT_HEADER = "# Source Integration Report\n"
+
+
+class IntegrationReport:
+    """Append-only integration report fed by a log of record changes
+
+    Every ingested record and status change is appended to a pending log
+    as a small summary. ``publish`` renders the pending entries (the
+    latest one per source) below a section heading at the end of the
+    report and empties the log, so each run writes only what changed.
+    Once the report has grown past ``max_bytes`` it is moved into
+    ``archive_dir`` and listed in ``archive_dir/index.md`` before a new
+    report is started.
+    """
+
+    def __init__(self, path: str = "integration_report.md",
+                 pending_path: str = ".superlead/report_pending.jsonl",
+                 max_bytes: int = 1024 * 1024, archive_dir: str = "reports"):
+        self.path = Path(path)
+        self.pending_path = Path(pending_path)
+        self.max_bytes = max_bytes
+        self.archive_dir = Path(archive_dir)
+        self._pending_file = None
+
+    def record(self, entry: Dict):
+        """Queue a changed record's summary for the next report"""
+        if self._pending_file is None:
+            self.pending_path.parent.mkdir(parents=True, exist_ok=True)
+            self._pending_file = open(self.pending_path, 'a', encoding='utf-8')
+        self._pending_file.write(json.dumps(entry, default=str) + "\n")
+
+    def flush(self):
+        """Make queued entries visible to other processes"""
+        if self._pending_file is not None:
+            self._pending_file.flush()
+
+    def close(self):
+        """Close the pending log"""
+        if self._pending_file is not None:
+            self._pending_file.close()
+            self._pending_file = None
+
+    def _read_pending(self) -> Iterator[Dict]:
+        """Every queued entry in order; a torn final line is ignored"""
+        if not self.pending_path.exists():
+            return
+        with open(self.pending_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    break
+
+    def pending(self) -> Iterator[Dict]:
+        """The latest queued entry per source, in the order sources last changed"""
+        self.flush()
+        latest = {}
+        for index, entry in enumerate(self._read_pending()):
+            latest[entry.get('file_path')] = index
+        wanted = set(latest.values())
+        for index, entry in enumerate(self._read_pending()):
+            if index in wanted:
+                yield entry
+
+    def has_pending(self) -> bool:
+        """Whether anything changed since the last report"""
+        self.flush()
+        return self.pending_path.exists() and self.pending_path.stat().st_size > 0
+
+    def publish(self, heading: str, render: Callable[[Dict], str], preamble: str = "") -> int:
+        """Append a section for the pending entries; returns how many were written"""
+        if not self.has_pending():
+            return 0
+        if self.path.exists() and self.path.stat().st_size >= self.max_bytes:
+            self.rotate()
+
+        count = 0
+        new_file = not self.path.exists()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            if new_file:
+                f.write(REPORT_HEADER)
+                if (self.archive_dir / 'index.md').exists():
+                    f.write(f"\nEarlier reports: {(self.archive_dir / 'index.md').as_posix()}\n")
+            f.write(f"\n---\n## {heading}\n\n{preamble}")
+            for entry in self.pending():
+                f.write(render(entry))
+                count += 1
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Entries are only dropped once the section is safely on disk
+        self.close()
+        self.pending_path.unlink()
+        return count
+
+    def rotate(self):
+        """Move the current report into the archive and list it in the index"""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        now = datetime.now()
+        stamp = f"{self.path.stem}-{now.strftime('%Y%m%d-%H%M%S')}"
+        target = self.archive_dir / f"{stamp}{self.path.suffix}"
+        attempt = 1
+        while target.exists():
+            # Rotated twice within a second
+            attempt += 1
+            target = self.archive_dir / f"{stamp}-{attempt}{self.path.suffix}"
+        size = self.path.stat().st_size
+        os.replace(self.path, target)
+
+        index_path = self.archive_dir / 'index.md'
+        with open(index_path, 'a', encoding='utf-8') as f:
+            if f.tell() == 0:
+                f.write("# Integration Report Archive\n\n")
+            f.write(f"- [{target.name}]({target.name}) — rotated {now.strftime('%Y-%m-%d %H:%M')}, "
+                    f"{size / 1024:.0f} KB\n")
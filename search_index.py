@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Persistent Inverted Index
+BM25 ranked search over ingested sources and their markdown sections
+"""
+
+import math
+import re
+import sqlite3
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, ignoring single characters"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) > 1]
+
+
+class SearchIndex:
+    """On-disk inverted index kept in SQLite
+
+    Every source is indexed as one document (anchor '') and, when it has
+    markdown sections, as one document per section. Updating a source only
+    replaces that source's postings; collection statistics are maintained
+    incrementally so queries never scan the whole corpus.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS docs (
+            doc_id INTEGER PRIMARY KEY,
+            source TEXT NOT NULL,
+            anchor TEXT NOT NULL,
+            title TEXT,
+            length INTEGER NOT NULL,
+            leaf INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS postings (
+            term TEXT NOT NULL,
+            doc_id INTEGER NOT NULL,
+            tf INTEGER NOT NULL,
+            PRIMARY KEY (term, doc_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS stats (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_docs_source ON docs(source);
+        CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings(doc_id);
+    """
+
+    # Scope name -> which documents it ranks
+    SCOPES = {
+        'sources': "anchor = ''",
+        'sections': "leaf = 1",
+    }
+
+    def __init__(self, path: str, k1: float = 1.2, b: float = 0.75):
+        self.path = Path(path)
+        self.k1 = k1
+        self.b = b
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def _bump(self, key: str, delta: int):
+        """Adjust a collection statistic"""
+        self.conn.execute(
+            """INSERT INTO stats (key, value) VALUES (?, ?)
+               ON CONFLICT(key) DO UPDATE SET value = value + excluded.value""",
+            (key, delta)
+        )
+
+    def _stat(self, key: str) -> int:
+        """Read a collection statistic"""
+        row = self.conn.execute("SELECT value FROM stats WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def remove_source(self, source: str):
+        """Drop every document of a source from the index"""
+        rows = self.conn.execute(
+            "SELECT doc_id, anchor, length, leaf FROM docs WHERE source = ?", (source,)
+        ).fetchall()
+        for doc_id, anchor, length, leaf in rows:
+            self.conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+            for scope in self._scopes_of(anchor, leaf):
+                self._bump(f"{scope}_docs", -1)
+                self._bump(f"{scope}_length", -length)
+        self.conn.execute("DELETE FROM docs WHERE source = ?", (source,))
+
+    @staticmethod
+    def _scopes_of(anchor: str, leaf: int) -> List[str]:
+        """Search scopes a document counts towards"""
+        scopes = []
+        if anchor == '':
+            scopes.append('sources')
+        if leaf:
+            scopes.append('sections')
+        return scopes
+
+    def index_source(self, source: str, title: str, text: str,
+                     sections: Iterable[Tuple[str, str, str]] = ()):
+        """Replace the postings of a source
+
+        ``sections`` holds (anchor, title, text) for each markdown section.
+        """
+        self.remove_source(source)
+        sections = list(sections)
+        units = [('', title, text, 0 if sections else 1)]
+        units += [(anchor, section_title, section_text, 1)
+                  for anchor, section_title, section_text in sections]
+
+        for anchor, unit_title, unit_text, leaf in units:
+            counts = Counter(tokenize(f"{unit_title}\n{unit_text}"))
+            length = sum(counts.values())
+            cursor = self.conn.execute(
+                "INSERT INTO docs (source, anchor, title, length, leaf) VALUES (?, ?, ?, ?, ?)",
+                (source, anchor, unit_title, length, leaf)
+            )
+            self.conn.executemany(
+                "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                [(term, cursor.lastrowid, tf) for term, tf in counts.items()]
+            )
+            for scope in self._scopes_of(anchor, leaf):
+                self._bump(f"{scope}_docs", 1)
+                self._bump(f"{scope}_length", length)
+
+    def commit(self):
+        """Persist pending index updates"""
+        self.conn.commit()
+
+    def search(self, query: str, limit: int = 10, scope: str = 'sections') -> List[Dict]:
+        """Rank documents for a query with Okapi BM25"""
+        terms = set(tokenize(query))
+        total_docs = self._stat(f"{scope}_docs")
+        if not terms or total_docs <= 0:
+            return []
+        avg_length = self._stat(f"{scope}_length") / total_docs or 1.0
+        where = self.SCOPES[scope]
+
+        scores = {}
+        for term in terms:
+            rows = self.conn.execute(
+                f"""SELECT p.doc_id, p.tf, d.length FROM postings p
+                    JOIN docs d ON d.doc_id = p.doc_id
+                    WHERE p.term = ? AND d.{where}""",
+                (term,)
+            ).fetchall()
+            if not rows:
+                continue
+            idf = math.log(1 + (total_docs - len(rows) + 0.5) / (len(rows) + 0.5))
+            for doc_id, tf, length in rows:
+                norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        hits = []
+        for doc_id, score in ranked:
+            source, anchor, title = self.conn.execute(
+                "SELECT source, anchor, title FROM docs WHERE doc_id = ?", (doc_id,)
+            ).fetchone()
+            hits.append({
+                'source': source,
+                'anchor': anchor,
+                'title': title,
+                'score': round(score, 4),
+                'target': f"{source}#{anchor}" if anchor else source
+            })
+        return hits
+
+    def close(self):
+        """Close the index database"""
+        self.conn.close()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Documentation Section Recommender
+TF-IDF model of every heading section in docs/, scoring sources against it in batches
+"""
+
+import io
+import json
+import math
+import hashlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from markdown_parser import iter_lines, parse_markdown, section_text
+from search_index import tokenize
+
+CACHE_VERSION = 1
+
+# Sources whose term-section pairs are expanded at once when scoring
+SCORE_CHUNK = 32
+
+
+def _numpy():
+    """NumPy, imported on first use"""
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("Section recommendations require the numpy package (pip install numpy)")
+    return numpy
+
+
+def term_counts(text: str) -> Counter:
+    """Token frequencies of a text, as used by the section model"""
+    return Counter(tokenize(text))
+
+
+class SectionModel:
+    """TF-IDF vectors of the heading sections of the markdown files in a docs directory
+
+    Each section is its heading plus its own text up to the first
+    subsection, addressed as ``<doc path>#<anchor>``; sections whose anchor
+    is in ``exclude_sections`` (summaries that echo the whole document)
+    are left out of the matrix. Term counts per
+    section are cached by document hash, so ``refresh`` only re-parses
+    documents that changed; the weighted matrix (sublinear tf, smoothed
+    idf, unit-length rows) is rebuilt from the cached counts, which is
+    cheap for hundreds of sections. The matrix is sparse, stored by term
+    as compressed columns, so it holds only the terms each section
+    contains rather than a row as long as the vocabulary.
+    """
+
+    def __init__(self, docs_dir: str, cache_path: str, exclude: Optional[List[str]] = None,
+                 top_k: int = 5, min_score: float = 0.05, exclude_sections: Optional[List[str]] = None):
+        self.docs_dir = Path(docs_dir)
+        self.cache_path = Path(cache_path)
+        self.exclude = set(exclude or [])
+        self.exclude_sections = set(exclude_sections or [])
+        self.top_k = top_k
+        self.min_score = min_score
+        self.docs = self._load_cache()
+        self.targets = []
+        self.titles = []
+        self.vocabulary = {}
+        self.idf = None
+        self.columns = None
+
+    def _load_cache(self) -> Dict:
+        """Cached section term counts per document"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return cache.get('docs', {}) if cache.get('version') == CACHE_VERSION else {}
+
+    def refresh(self) -> int:
+        """Re-read documents whose content changed and rebuild the matrix; returns how many changed"""
+        changed = 0
+        restamped = False
+        seen = set()
+        for doc_path in sorted(self.docs_dir.glob('*.md')):
+            if doc_path.name in self.exclude:
+                continue
+            key = doc_path.as_posix()
+            seen.add(key)
+            st = doc_path.stat()
+            stamp = [st.st_size, st.st_mtime_ns]
+            cached = self.docs.get(key)
+            if cached and cached['stat'] == stamp:
+                continue
+
+            with open(doc_path, 'rb') as f:
+                data = f.read()
+            doc_hash = hashlib.sha256(data).hexdigest()
+            if cached and cached['hash'] == doc_hash:
+                cached['stat'] = stamp
+                restamped = True
+                continue
+            self.docs[key] = {'stat': stamp, 'hash': doc_hash, 'sections': self._parse_sections(data)}
+            changed += 1
+
+        for key in set(self.docs) - seen:
+            del self.docs[key]
+            changed += 1
+        if changed or self.columns is None:
+            self._build()
+        if changed or restamped:
+            self._save_cache()
+        return changed
+
+    @staticmethod
+    def _parse_sections(data: bytes) -> List[list]:
+        """[anchor, title, term counts] of every section with any text"""
+        parsed = parse_markdown(iter_lines(io.BytesIO(data)))
+        sections = []
+        for section in parsed['sections']:
+            counts = term_counts(f"{section['title']}\n{section_text(data, section)}")
+            if counts:
+                sections.append([section['anchor'], section['title'], dict(counts)])
+        return sections
+
+    def _save_cache(self):
+        """Persist the section term counts"""
+        from source_store import atomic_write_json
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(self.cache_path, {'version': CACHE_VERSION, 'docs': self.docs})
+
+    def _build(self):
+        """Weight the cached counts into a sparse, row-normalized section-by-term matrix
+
+        ``columns`` holds it in compressed column form: the entries of term
+        column ``c`` are ``sections[offsets[c]:offsets[c + 1]]`` with their
+        ``weights``.
+        """
+        np = _numpy()
+        self.targets, self.titles, rows = [], [], []
+        document_frequency = Counter()
+        for key in sorted(self.docs):
+            for anchor, title, counts in self.docs[key]['sections']:
+                if anchor in self.exclude_sections:
+                    continue
+                self.targets.append(f"{key}#{anchor}")
+                self.titles.append(title)
+                rows.append(counts)
+                document_frequency.update(counts.keys())
+
+        self.vocabulary = {term: column for column, term in enumerate(sorted(document_frequency))}
+        sections = len(rows)
+        self.idf = np.ones(len(self.vocabulary), dtype=np.float32)
+        for term, column in self.vocabulary.items():
+            self.idf[column] = math.log((1 + sections) / (1 + document_frequency[term])) + 1
+        entry_rows, entry_columns, entry_weights = [], [], []
+        for row, counts in enumerate(rows):
+            columns = np.array([self.vocabulary[term] for term in counts], dtype=np.int32)
+            weights = (1 + np.log(np.array(list(counts.values()), dtype=np.float32))) * self.idf[columns]
+            entry_rows.append(np.full(len(columns), row, dtype=np.int32))
+            entry_columns.append(columns)
+            entry_weights.append(weights / np.linalg.norm(weights))
+        if not rows:
+            self.columns = (np.zeros(1, dtype=np.int32), np.zeros(0, dtype=np.int32),
+                            np.zeros(0, dtype=np.float32))
+            return
+        entry_rows, entry_columns = np.concatenate(entry_rows), np.concatenate(entry_columns)
+        entry_weights = np.concatenate(entry_weights)
+        order = np.argsort(entry_columns, kind='stable')
+        offsets = np.zeros(len(self.vocabulary) + 1, dtype=np.int32)
+        np.cumsum(np.bincount(entry_columns, minlength=len(self.vocabulary)), out=offsets[1:])
+        self.columns = (offsets, entry_rows[order], entry_weights[order])
+
+    def score(self, sources: List[Dict[str, int]]) -> List[List[Dict]]:
+        """Top sections for each source's term counts, with a sparse matrix product per batch
+
+        Returns, per source, up to ``top_k`` ``{'target', 'title', 'score'}``
+        entries with a cosine similarity of at least ``min_score``, best
+        first. Terms that never occur in the documentation still count
+        towards a source's vector length. Each source's terms are matched
+        against the matrix columns they select, so only the scores
+        themselves are dense.
+        """
+        if not sources:
+            return []
+        if self.columns is None or not self.targets:
+            return [[] for _ in sources]
+        np = _numpy()
+        unseen_idf = math.log(1 + len(self.targets)) + 1
+        vectors = []
+        for row, counts in enumerate(sources):
+            columns, weights, unseen = [], [], 0.0
+            for term, count in counts.items():
+                column = self.vocabulary.get(term)
+                if column is None:
+                    unseen += ((1 + math.log(count)) * unseen_idf) ** 2
+                else:
+                    columns.append(column)
+                    weights.append(1 + math.log(count))
+            if not columns:
+                continue
+            columns = np.array(columns, dtype=np.int32)
+            weights = np.array(weights, dtype=np.float32) * self.idf[columns]
+            vectors.append((row, columns, weights / math.sqrt(float(np.dot(weights, weights)) + unseen)))
+
+        targets = len(self.targets)
+        offsets, sections, section_weights = self.columns
+        scores = np.zeros((len(sources), targets), dtype=np.float32)
+        for first in range(0, len(vectors), SCORE_CHUNK):
+            # Every (source term, section) pair sharing the term, summed per (source, section)
+            chunk = vectors[first:first + SCORE_CHUNK]
+            columns = np.concatenate([terms for _, terms, _ in chunk])
+            weights = np.concatenate([term_weights for _, _, term_weights in chunk])
+            starts = offsets[columns]
+            lengths = offsets[columns + 1] - starts
+            entries = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+            rows = np.repeat(np.arange(len(chunk)), [len(terms) for _, terms, _ in chunk])
+            cells = np.repeat(rows * targets, lengths) + sections[entries]
+            products = np.repeat(weights, lengths) * section_weights[entries]
+            scores[[row for row, _, _ in chunk]] = np.bincount(
+                cells, weights=products, minlength=len(chunk) * targets).reshape(len(chunk), targets)
+        k = min(self.top_k, len(self.targets))
+        best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, columns in enumerate(best):
+            ranked = sorted(columns, key=lambda column: -scores[row, column])
+            results.append([
+                {'target': self.targets[column], 'title': self.titles[column],
+                 'score': round(float(scores[row, column]), 4)}
+                for column in ranked if scores[row, column] >= self.min_score
+            ])
+        return results
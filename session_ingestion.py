@@ -8,187 +8,181 @@ import os
 import sys
 import json
 import yaml
+import argparse
 from datetime import datetime
 from pathlib import Path
-from source_manager import SourceManager
+from source_manager import SourceManager, format_near_duplicates
+
+class SessionTally:
+    """Running totals of a session's ingested sources, in constant memory"""
+    
+    # Titles listed per recommended section (docs/<file>.md#<anchor>); the rest are only counted
+    MAX_TITLES = 5
+    
+    def __init__(self):
+        self.total = 0
+        self.categories = {}
+        self.relevance = {}
+        self.section_updates = {}
+    
+    def add(self, source):
+        """Count one ingested source summary"""
+        self.total += 1
+        self.categories[source['category']] = self.categories.get(source['category'], 0) + 1
+        relevance = source.get('relevance', {})
+        level = relevance.get('level', 'unknown')
+        self.relevance[level] = self.relevance.get(level, 0) + 1
+        for section in relevance.get('recommended_sections', []):
+            update = self.section_updates.setdefault(section, {'count': 0, 'titles': []})
+            update['count'] += 1
+            if len(update['titles']) < self.MAX_TITLES:
+                update['titles'].append(source.get('title', 'Unknown'))
+
+def render_session_entry(entry):
+    """Report bullet for one changed source"""
+    relevance = entry.get('relevance', {})
+    text = f"""
+- **{entry.get('title', 'Unknown')}**
+  - Status: {entry.get('status', 'new')}
+  - Category: {entry.get('category')}
+"""
+    if entry.get('status') == 'new':
+        text += f"""  - Relevance: {relevance.get('level', 'unknown')}
+  - Keywords: {', '.join(relevance.get('matches', []))}
+  - Archived: {entry.get('archived_path', 'Not archived')}
+"""
+    if entry.get('near_duplicates'):
+        text += f"  - Possible Duplicate Of: {format_near_duplicates(entry)}\n"
+    return text
 
 class SessionIngestion:
     """Automatic ingestion system for session startup"""
     
-    def __init__(self):
-        self.source_manager = SourceManager()
+    def __init__(self, verify: bool = False, workers=None, profile: bool = False):
+        self.source_manager = SourceManager(verify=verify, workers=workers, profile=profile)
         self.session_start = datetime.now()
         
     def run_session_ingestion(self):
         """Main ingestion process for session startup"""
+        self.source_manager.begin_run()
+        success = False
+        try:
+            self._run_steps()
+            success = True
+        finally:
+            self.source_manager.finish_run(success)
+    
+    def _run_steps(self):
+        """Scan, integrate and report, printing progress as it goes"""
+        metrics = self.source_manager.metrics
         print("=" * 60)
         print("AUTOMATIC SESSION INGESTION SYSTEM")
         print("=" * 60)
         print(f"Session started: {self.session_start.strftime('%Y-%m-%d %H:%M:%S')}")
         print()
         
-        # Step 1: Check for new sources
-        print("Step 1: Scanning for new research sources...")
-        new_sources = self.source_manager.scan_input_directory()
-        
-        if not new_sources:
-            print("No new sources found")
-            self.display_session_summary()
-            return
-        
-        print(f"Found {len(new_sources)} new source(s):")
-        for i, source in enumerate(new_sources, 1):
-            print(f"  {i}. {source.get('title', 'Unknown Title')}")
+        # Steps 1-2: Sources stream through extraction and integration one
+        # at a time; only counts and a few titles are kept for the summary
+        print("Step 1: Scanning for new research sources and integrating them...")
+        tally = SessionTally()
+        for source in self.source_manager.ingest():
+            tally.add(source)
+            relevance = source.get('relevance', {})
+            print(f"  {tally.total}. {source.get('title', 'Unknown Title')}")
             print(f"     Category: {source['category']}")
             print(f"     File: {source['file_path']}")
+            print(f"     Relevance: {relevance.get('level', 'unknown').upper()} "
+                  f"(score {relevance.get('score', 0)}/10)")
+            print(f"     Keywords: {', '.join(relevance.get('matches', []))}")
+            if source.get('near_duplicates'):
+                print(f"     Possible Duplicate Of: {format_near_duplicates(source)}")
             print()
         
-        # Step 2: Analyze and integrate sources
-        print("Step 2: Analyzing sources and integrating...")
-        self.source_manager.integrate_sources(new_sources)
-        
-        # Step 3: Display integration results
-        print("\nStep 3: Integration Results")
-        print("-" * 40)
-        
-        for source in new_sources:
-            relevance = source.get('relevance', {})
-            print(f"Source: {source.get('title', 'Unknown')}")
-            print(f"   Relevance: {relevance.get('level', 'unknown').upper()}")
-            print(f"   Score: {relevance.get('score', 0)}/10")
-            print(f"   Keywords: {', '.join(relevance.get('matches', []))}")
-            print(f"   Suggested Updates: {len(relevance.get('recommended_sections', []))} sections")
-            print()
+        if not tally.total:
+            print("No new sources found")
+            with metrics.stage('report'):
+                self.update_integration_report(tally)
+            self.display_session_summary()
+            return
+        print(f"Integrated {tally.total} new source(s)")
         
-        # Step 4: Update documentation recommendations
-        print("Step 4: Documentation Update Recommendations")
+        # Step 3: Update documentation recommendations
+        print("\nStep 3: Documentation Update Recommendations")
         print("-" * 50)
-        self.generate_documentation_recommendations(new_sources)
+        with metrics.stage('recommendations'):
+            self.generate_documentation_recommendations(tally.section_updates)
         
-        # Step 5: Update integration report
-        print("\nStep 5: Updating integration report...")
-        self.update_integration_report(new_sources)
+        # Step 4: Update integration report
+        print("\nStep 4: Updating integration report...")
+        with metrics.stage('report'):
+            self.update_integration_report(tally)
         
-        # Step 6: Display session summary
-        self.display_session_summary(new_sources)
+        # Step 5: Display session summary
+        self.display_session_summary(tally)
         
         print("\nIngestion complete! Ready for research session.")
         
-    def generate_documentation_recommendations(self, new_sources):
+    def generate_documentation_recommendations(self, section_updates):
         """Generate specific recommendations for documentation updates"""
-        
-        # Map sources to documentation sections
-        section_updates = {}
-        
-        for source in new_sources:
-            relevance = source.get('relevance', {})
-            sections = relevance.get('recommended_sections', [])
-            
-            for section in sections:
-                if section not in section_updates:
-                    section_updates[section] = []
-                section_updates[section].append(source)
-        
         if not section_updates:
             print("  No immediate documentation updates required")
             return
         
         print("  Recommended documentation updates:")
         
-        section_docs = {
-            'perception_layer': 'docs/system_architecture.md',
-            'mathematical_framework': 'docs/mathematical_framework.md',
-            'planning_layer': 'docs/system_architecture.md',
-            'actuation_layer': 'docs/system_architecture.md',
-            'communication_layer': 'docs/system_architecture.md',
-            'sensor_fusion': 'docs/technical_specifications.md',
-            'target_prediction': 'docs/mathematical_framework.md',
-            'commercial_options': 'docs/commercial_options.md',
-            'adversarial_threats': 'docs/adversarial_threats.md',
-            'safety_protocols': 'docs/safety_protocols.md'
-        }
-        
-        for section, sources in section_updates.items():
-            doc_file = section_docs.get(section, 'docs/documentation_index.md')
+        # Targets are docs/<file>.md#<anchor>; list them under their document
+        by_document = {}
+        for target, update in section_updates.items():
+            doc_file, _, anchor = target.partition('#')
+            by_document.setdefault(doc_file, []).append((anchor, update))
+        
+        for doc_file, sections in sorted(by_document.items()):
             print(f"    Document: {doc_file}")
-            print(f"       Add {len(sources)} source(s) to {section}")
-            
-            for source in sources:
-                print(f"       - {source.get('title', 'Unknown')}")
+            for anchor, update in sorted(sections, key=lambda item: -item[1]['count']):
+                print(f"       Add {update['count']} source(s) to #{anchor}")
+                
+                for title in update['titles']:
+                    print(f"       - {title}")
+                if update['count'] > len(update['titles']):
+                    print(f"       - ... and {update['count'] - len(update['titles'])} more")
         
         print("\n  Tip: Use 'python source_manager.py' to see detailed integration report")
     
-    def update_integration_report(self, new_sources):
-        """Update the integration report with session information"""
-        
-        # Read existing report
-        report_path = "integration_report.md"
-        if os.path.exists(report_path):
-            with open(report_path, 'r') as f:
-                report_content = f.read()
-        else:
-            report_content = "# Source Integration Report\n\n"
-        
-        # Add session information
-        session_section = f"""
----
-## Session Ingestion - {self.session_start.strftime('%Y-%m-%d %H:%M:%S')}
-
-**Sources Processed**: {len(new_sources)}
-**Session Type**: Automatic Session Startup
-**Integration Status**: Complete
-
-### Newly Integrated Sources
-"""
-        
-        for source in new_sources:
-            relevance = source.get('relevance', {})
-            session_section += f"""
-- **{source.get('title', 'Unknown')}**
-  - Category: {source['category']}
-  - Relevance: {relevance.get('level', 'unknown')}
-  - Keywords: {', '.join(relevance.get('matches', []))}
-  - Archived: {source.get('archived_path', 'Not archived')}
-"""
-        
-        # Update report
-        with open(report_path, 'w') as f:
-            f.write(report_content + session_section)
-        
-        print(f"  Updated: {report_path}")
+    def update_integration_report(self, tally):
+        """Append a session section for sources changed since the last report"""
+        report = self.source_manager.report
+        preamble = (f"**Sources Processed**: {tally.total}\n"
+                    f"**Session Type**: Automatic Session Startup\n"
+                    f"**Integration Status**: Complete\n\n"
+                    f"### Changed Sources\n")
+        written = report.publish(
+            f"Session Ingestion - {self.session_start.strftime('%Y-%m-%d %H:%M:%S')}",
+            render_session_entry, preamble
+        )
+        if written:
+            print(f"  Updated: {report.path} ({written} sources)")
     
-    def display_session_summary(self, new_sources=None):
+    def display_session_summary(self, tally=None):
         """Display session summary"""
         print("\n" + "=" * 60)
         print("SESSION SUMMARY")
         print("=" * 60)
         
-        if new_sources:
-            print(f"New Sources Ingested: {len(new_sources)}")
-            
-            # Count by category
-            categories = {}
-            for source in new_sources:
-                cat = source['category']
-                categories[cat] = categories.get(cat, 0) + 1
+        if tally and tally.total:
+            print(f"New Sources Ingested: {tally.total}")
             
             print("By Category:")
-            for cat, count in categories.items():
+            for cat, count in tally.categories.items():
                 print(f"   {cat}: {count}")
             
-            # Count by relevance
-            relevance_counts = {}
-            for source in new_sources:
-                relevance = source.get('relevance', {}).get('level', 'unknown')
-                relevance_counts[relevance] = relevance_counts.get(relevance, 0) + 1
-            
             print("By Relevance:")
-            for relevance, count in relevance_counts.items():
+            for relevance, count in tally.relevance.items():
                 print(f"   {relevance}: {count}")
         
         # System status
         print("\nSystem Status:")
-        print(f"   Source Database: {'Active' if os.path.exists('source_database.json') else 'Not Found'}")
+        db_path = self.source_manager.store.path
+        print(f"   Source Database: {'Active' if db_path.exists() else 'Not Found'} ({db_path})")
         print(f"   Config File: {'Active' if os.path.exists('config.yaml') else 'Not Found'}")
         print(f"   Documentation: {len([f for f in os.listdir('docs/') if f.endswith('.md')])} documents")
         
@@ -196,15 +190,24 @@ class SessionIngestion:
         print("\nQuick Access:")
         print("   View Documentation: ls docs/")
         print("   Integration Report: cat integration_report.md")
-        print("   Source Database: cat source_database.json")
+        print("   Source Database: python source_manager.py export-json && cat source_database.json")
         print("   Manual Integration: python source_manager.py")
         
         print("\n" + "=" * 60)
 
 def main():
     """Main ingestion function"""
+    parser = argparse.ArgumentParser(description="Ingest new research sources at session start")
+    parser.add_argument('--verify', action='store_true',
+                        help="rehash every file instead of trusting cached stat fingerprints")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for hashing and extraction (0 = one per CPU, default from config)")
+    parser.add_argument('--profile', action='store_true',
+                        help="profile the run with cProfile (saved under STATE_DIR/profile.pstats)")
+    args = parser.parse_args()
+    
     try:
-        ingestion = SessionIngestion()
+        ingestion = SessionIngestion(verify=args.verify, workers=args.workers, profile=args.profile)
         ingestion.run_session_ingestion()
     except Exception as e:
         print(f"Ingestion failed: {e}")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Session Startup Manifest
+Compact snapshot that lets a session start with no changes skip ingestion entirely
+"""
+
+import os
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from discovery import InputFilter, walk_files
+
+# Read before config.yaml is parsed, so it cannot follow a custom STATE_DIR;
+# with another STATE_DIR the manifest is simply never found
+MANIFEST_PATH = Path('.superlead') / 'session_manifest.json'
+VERSION = 2
+
+# Fields of a record the session suggestions need; bodies are never copied
+SUMMARY_FIELDS = ('file_path', 'title', 'category', 'near_duplicates')
+RELEVANCE_FIELDS = ('level', 'score', 'matches', 'recommended_sections', 'section_scores')
+
+
+def file_stamp(path) -> Optional[List[int]]:
+    """[size, mtime_ns] of a file, or None when it is missing or empty"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns] if st.st_size else None
+
+
+def scan_inputs(input_dir: str, settings: Dict) -> Dict[str, List[int]]:
+    """'category/relative/path' -> [size, mtime_ns, inode, device] of every source file
+    
+    ``settings`` are the discovery filter settings (formats, include and
+    exclude globs per category).
+    """
+    files = {}
+    for category, suffixes in settings['formats'].items():
+        input_filter = InputFilter(suffixes, settings['include'].get(category), settings['exclude'].get(category))
+        for relative, st in walk_files(os.path.join(input_dir, category), input_filter):
+            files[f"{category}/{relative.replace(os.sep, '/')}"] = [st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev]
+    return files
+
+
+def source_summary(source: Dict) -> Dict:
+    """The part of a record shown in session suggestions"""
+    summary = {field: source[field] for field in SUMMARY_FIELDS if field in source}
+    relevance = source.get('relevance') or {}
+    summary['relevance'] = {field: relevance[field] for field in RELEVANCE_FIELDS if field in relevance}
+    summary['summary'] = str(source.get('summary', '') or '')[:200]
+    return summary
+
+
+def format_near_duplicates(source_info: Dict) -> str:
+    """'path (93%), ...' for a source's suspected near-duplicates"""
+    return ', '.join(
+        f"{match['file_path']} ({match['similarity']:.0%})"
+        for match in source_info.get('near_duplicates', [])
+    )
+
+
+def write_manifest(path, config_file: str, input_dir: str, settings: Dict,
+                   files: Dict[str, List[int]], data_files: Iterable, new_sources: List[Dict]):
+    """Record the state a finished session start left behind"""
+    manifest = {
+        'version': VERSION,
+        'config': file_stamp(config_file),
+        'input_dir': input_dir,
+        'filters': settings,
+        'files': files,
+        'database': {str(p): file_stamp(p) for p in data_files},
+        'new_sources': [source_summary(source) for source in new_sources]
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'), default=str)
+    os.replace(tmp_path, path)
+
+
+def remove_manifest(path):
+    """Make the next session start take the full path"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def load_current_manifest(path=MANIFEST_PATH, config_file: str = "config.yaml") -> Optional[Dict]:
+    """The manifest if nothing it describes has changed since, else None
+
+    Changed means: config.yaml or a database file has a different size or
+    mtime, or an input file was added, removed or has a different stat.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != VERSION or manifest.get('config') != file_stamp(config_file):
+        return None
+    for data_file, stamp in manifest['database'].items():
+        if file_stamp(data_file) != stamp:
+            return None
+    if scan_inputs(manifest['input_dir'], manifest['filters']) != manifest['files']:
+        return None
+    return manifest
@@ -7,23 +7,130 @@ Manages incorporation of external research sources into documentation
 import os
 import json
 import yaml
-import hashlib
+import itertools
+from collections import deque
+from collections.abc import Mapping
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-import re
+from typing import Dict, Iterable, Iterator, List, Any, Optional
+import time
 import logging
+import argparse
+
+from source_store import SqliteSourceStore, atomic_write_json, open_source_store
+from source_record import SourceRecord
+from archive_store import SourceArchive
+from blob_store import BODY_FIELDS, BlobStore, extraction_key, split_body
+from keyword_matcher import KeywordMatcher
+from metrics import RunMetrics, RunProfiler
+from near_duplicates import NearDuplicateIndex, minhash_signature, signature_text
+from search_index import SearchIndex
+from report_log import IntegrationReport
+from discovery import DirectoryIndex, category_filters, filter_settings, walk_files
+from section_recommender import SectionModel, term_counts
+from citation_graph import CitationGraph
+from work_queue import WorkQueue, default_worker_id, pack_result
+from session_manifest import (format_near_duplicates, remove_manifest, scan_inputs, source_summary,
+                              write_manifest)
+from markdown_parser import section_text
+from pdf_extractor import evict_pages, purge_old_versions
+from extractors import EXTRACTOR_VERSIONS, extractor_name, process_source_file
+
+# Subdirectories of INPUT_DIR that hold sources, by category
+SOURCE_CATEGORIES = ['papers', 'briefings', 'data', 'references']
+
+# Record lifecycle, in order; a record only moves forward
+STATUSES = ['new', 'reviewed', 'integrated', 'archived']
+
+# Record fields that are not derived from the file content, kept when
+# `reprocess` replaces a record's extracted fields
+RECORD_FIELDS = ['file_path', 'category', 'hash', 'added_date', 'status', 'status_changed',
+                 'status_history', 'archived_path']
+
+# Version of analyze_relevance_batch's output; bump it when scoring changes
+# so that `reprocess` re-scores existing records
+RELEVANCE_VERSION = 1
+
+# Keywords that indicate relevance to our project, used when config.yaml
+# does not define RELEVANCE.keywords
+DEFAULT_RELEVANT_KEYWORDS = [
+    'autonomous', 'projectile', 'guidance', 'trajectory', 'ballistics',
+    'drone', 'multi-agent', 'sensor fusion', 'control theory',
+    'communication', 'telemetry', 'gps', 'navigation', 'optimization',
+    'kalman', 'filter', 'prediction', 'correction', 'aerodynamics'
+]
+
 
 class SourceManager:
     """Manages research sources and their integration into documentation"""
     
-    def __init__(self, config_file: str = "config.yaml"):
+    def __init__(self, config_file: str = "config.yaml", verify: bool = False,
+                 workers: Optional[int] = None, profile: bool = False):
+        self.config_file = config_file
         with open(config_file, 'r') as f:
             self.config = yaml.safe_load(f)
         
+        # When set, every file is rehashed regardless of its cached fingerprint
+        self.verify = verify
+        
+        # Database keys are paths relative to the directory the manager started in
+        self._cwd = Path.cwd().resolve()
+        
+        # Worker processes for hashing and extraction (0 = one per CPU)
+        if workers is None:
+            workers = self.config.get('WORKERS', 1)
+        self.workers = workers or os.cpu_count() or 1
+        
         self.setup_logging()
         self.setup_directories()
+        self.store = open_source_store(self.config, self.logger)
         self.source_db = self.load_source_database()
+        self._dirty_sources = set()
+        self._deleted_sources = set()
+        self._stale_page_hashes = set()
+        self._keyword_matcher = None
+        self.recommender_settings = self.config.get('RECOMMENDER') or {}
+        self._section_model = None
+        self._section_model_checked = False
+        state_dir = Path(self.config.get('STATE_DIR', '.superlead'))
+        self.blobs = BlobStore(state_dir / 'blobs')
+        self.search_index = SearchIndex(state_dir / 'search.sqlite3')
+        self.near_duplicate_settings = self.config.get('NEAR_DUPLICATES') or {'enabled': False}
+        self.near_duplicates = NearDuplicateIndex(
+            state_dir / 'near_duplicates.sqlite3',
+            self.near_duplicate_settings.get('num_perm', 128),
+            self.near_duplicate_settings.get('bands', 16)
+        )
+        citation_settings = self.config.get('CITATIONS') or {}
+        self.citations = CitationGraph(
+            state_dir / 'citations.sqlite3',
+            self.config['DOCS_DIR'],
+            exclude=citation_settings.get('exclude_docs', []),
+            min_title_length=citation_settings.get('min_title_length', 12)
+        )
+        archive_config = self.config.get('ARCHIVE') or {}
+        self.archive = SourceArchive(self.config['SOURCES_DIR'], archive_config.get('method', 'auto'))
+        self._archive_counted = dict(self.archive.stats)
+        self.pipeline_settings = self.config.get('PIPELINE') or {}
+        self.queue_settings = self.config.get('QUEUE') or {}
+        self.discovery_settings = self.config.get('DISCOVERY') or {}
+        self.input_filters = category_filters(self.config, SOURCE_CATEGORIES)
+        report_config = self.config.get('REPORT') or {}
+        self.report = IntegrationReport(
+            report_config.get('path', 'integration_report.md'),
+            state_dir / 'report_pending.jsonl',
+            max_bytes=report_config.get('max_bytes', 1024 * 1024),
+            archive_dir=report_config.get('archive_dir', 'reports')
+        )
+        self.fingerprints = self.load_fingerprint_cache()
+        self._fingerprints_dirty = False
+        self._scan_started_ns = time.time_ns()
+        
+        # Stage timers and counters, written out after every run
+        self.metrics_settings = self.config.get('METRICS') or {}
+        self.metrics = RunMetrics(self.metrics_settings.get('slowest_files', 10))
+        self.profile = profile or self.metrics_settings.get('profile', False)
+        self._profiler = None
         
     def setup_logging(self):
         """Configure logging system"""
@@ -44,6 +151,7 @@ class SourceManager:
             self.config['DOCS_DIR'],
             self.config['SOURCES_DIR'],
             self.config['ASSETS_DIR'],
+            self.config.get('STATE_DIR', '.superlead'),
             f"{self.config['INPUT_DIR']}/papers",
             f"{self.config['INPUT_DIR']}/briefings",
             f"{self.config['INPUT_DIR']}/data",
@@ -53,309 +161,1373 @@ class SourceManager:
     
     def load_source_database(self) -> Dict:
         """Load or create the source tracking database"""
-        db_path = "source_database.json"
-        if os.path.exists(db_path):
-            with open(db_path, 'r') as f:
-                return json.load(f)
-        return {"sources": {}, "last_update": None}
+        return self.store.load()
     
     def save_source_database(self):
         """Save the source tracking database"""
-        with open("source_database.json", 'w') as f:
-            json.dump(self.source_db, f, indent=2)
+        with self.metrics.stage('save'):
+            self.store.save(self.source_db, changed=sorted(self._dirty_sources),
+                            deleted=sorted(self._deleted_sources))
+        self._dirty_sources.clear()
+        self._deleted_sources.clear()
+    
+    def _mark_dirty(self, path: str, record: Dict):
+        """Queue a changed record for the next save, putting it back into the source map
+        
+        A commit releases the records the map has cached, so a record fetched
+        before one and changed after it is only saved if it is written back.
+        """
+        self.source_db['sources'][path] = record
+        self._dirty_sources.add(path)
     
-    def scan_input_directory(self) -> List[Dict]:
-        """Scan input directory for new or updated sources"""
-        new_sources = []
+    def _fingerprint_cache_path(self) -> Path:
+        """Location of the persisted stat fingerprint cache"""
+        return Path(self.config.get('STATE_DIR', '.superlead')) / 'fingerprints.json'
+    
+    def load_fingerprint_cache(self) -> Dict:
+        """Load the stat fingerprint cache used to skip unchanged files"""
+        cache_path = self._fingerprint_cache_path()
+        if cache_path.exists():
+            try:
+                with open(cache_path, 'r') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Ignoring unreadable fingerprint cache: {e}")
+        return {}
+    
+    def save_fingerprint_cache(self):
+        """Persist the stat fingerprint cache if it changed"""
+        if not self._fingerprints_dirty:
+            return
+        atomic_write_json(self._fingerprint_cache_path(), self.fingerprints)
+        self._fingerprints_dirty = False
+    
+    def ingest(self, paths=None) -> Iterator[Dict]:
+        """Stream sources through the ingestion pipeline
+        
+        Stages run as chained generators: discover, fingerprint (stat),
+        extract (hash and parse, in a process pool when configured),
+        analyze relevance, index and archive, then persist. Records are
+        committed every ``PIPELINE.batch_size`` sources and released, and
+        only a lightweight summary of each integrated source is yielded,
+        so memory stays flat however many files changed.
+        
+        ``paths`` restricts the run to those files (watch mode); deleted
+        ones are dropped from the database. Without it the whole input
+        directory is scanned and sources whose files disappeared are removed.
+        """
+        self._scan_started_ns = time.time_ns()
+        self.archive.reset_stats()
+        self._archive_counted = dict(self.archive.stats)
+        batch_size = max(int(self.pipeline_settings.get('batch_size', 200)), 1)
+        discovered = set() if paths is None else None
+        candidates = self._discover_files(discovered) if paths is None else self._resolve_paths(paths)
+        relevance_batch = max(int(self.recommender_settings.get('batch_size', 64)), 1)
+        self._section_model_checked = False
+        pending = 0
+        merged = []
+        
+        try:
+            for task, result in self._extract(self._fingerprint(candidates, discovered)):
+                with self.metrics.stage('merge'):
+                    source_info = self._merge_result(task, result)
+                if source_info is None:
+                    continue
+                merged.append((source_info, result.get('archived')))
+                if len(merged) < relevance_batch:
+                    continue
+                for summary in self._integrate_batch(merged):
+                    pending += 1
+                    if pending >= batch_size:
+                        self._commit_batch()
+                        pending = 0
+                    yield summary
+                merged = []
+            
+            for summary in self._integrate_batch(merged):
+                yield summary
+            
+            if discovered is not None:
+                self._remove_missing_sources(discovered)
+        finally:
+            self._commit_batch()
+            self.save_fingerprint_cache()
+        
+        with self.metrics.stage('citations'):
+            self.refresh_citations()
+        
+        stats = self.archive.stats
+        if stats['stored'] or stats['deduplicated']:
+            self.logger.info(
+                f"Archive: {stats['stored']} stored ({stats['bytes_stored']} bytes), "
+                f"{stats['deduplicated']} already archived"
+            )
+    
+    def _discover_files(self, discovered: set) -> Iterator[tuple]:
+        """(file_path, category, stat, relative_path) of every source file below each category directory
+        
+        Category trees are walked recursively in deterministic order.
+        Listings of directories whose mtime is unchanged are reused from
+        the directory index, with a stat of None. When
+        ``DISCOVERY.trust_directory_mtime`` is set, files in such
+        directories that already have a cached fingerprint are not stat'ed
+        at all; they are only added to ``discovered``.
+        """
         input_dir = Path(self.config['INPUT_DIR'])
+        index = DirectoryIndex(
+            Path(self.config.get('STATE_DIR', '.superlead')) / 'directories.json',
+            filter_settings(self.config, SOURCE_CATEGORIES), self._scan_started_ns
+        )
+        trust = self.discovery_settings.get('trust_directory_mtime', False) and not self.verify
+        
+        for category in sorted(SOURCE_CATEGORIES):
+            category_dir = input_dir / category
+            relative_root = self._relative_path(category_dir)
+            walker = walk_files(str(category_dir), self.input_filters[category], index)
+            while True:
+                with self.metrics.stage('discover'):
+                    found = next(walker, None)
+                if found is None:
+                    break
+                relative, st = found
+                key = os.path.join(relative_root, relative)
+                if st is None and trust and key in self.fingerprints:
+                    discovered.add(key)
+                    self.metrics.count('files_seen')
+                    self.metrics.count('files_skipped')
+                    continue
+                yield category_dir / relative, category, st, key
         
-        for category_dir in input_dir.iterdir():
-            if not category_dir.is_dir():
+        index.save()
+        self.metrics.count('dirs_listed', index.listed)
+        self.metrics.count('dirs_reused', index.reused)
+    
+    def _resolve_paths(self, paths) -> Iterator[tuple]:
+        """(file_path, category, None, None) for the given paths, removing deleted sources"""
+        for file_path in sorted(Path(p) for p in set(paths)):
+            category = self._category_of(file_path)
+            if category is None:
                 continue
-                
-            category = category_dir.name
-            if category not in ['papers', 'briefings', 'data', 'references']:
+            if file_path.is_file():
+                if self._is_supported_format(file_path, category):
+                    yield file_path, category, None, None
+            elif self._relative_path(file_path) in self.source_db['sources']:
+                self.remove_source(self._relative_path(file_path))
+                self.metrics.count('files_removed')
+                self.logger.info(f"Removed deleted source {file_path}")
+    
+    def _fingerprint(self, candidates: Iterable[tuple], discovered: Optional[set]) -> Iterator[Dict]:
+        """Extraction tasks for candidates whose stat fingerprint changed"""
+        for file_path, category, st, relative_path in candidates:
+            self.metrics.count('files_seen')
+            relative_path = relative_path or self._relative_path(file_path)
+            if discovered is not None:
+                discovered.add(relative_path)
+            with self.metrics.stage('stat'):
+                task = self._prepare_file(file_path, category, st, relative_path)
+            if task is None:
+                self.metrics.count('files_skipped')
                 continue
-            
-            for file_path in category_dir.glob('*'):
-                if file_path.is_file() and self._is_supported_format(file_path, category):
-                    source_info = self._process_file(file_path, category)
-                    if source_info:
-                        new_sources.append(source_info)
+            yield task
+    
+    def _extract(self, tasks: Iterable[Dict], archive: bool = True) -> Iterator[tuple]:
+        """(task, result) pairs in task order, hashed and extracted
+        
+        With several workers, at most ``PIPELINE.max_in_flight`` files are
+        queued in the process pool; discovery waits for the oldest result
+        before submitting more, which bounds memory held by finished but
+        not yet integrated extractions. Results come back in task order,
+        so the database matches a serial run. Without ``archive`` the
+        extraction step leaves archiving to the integration step.
+        """
+        tasks = iter(tasks)
+        first = next(tasks, None)
+        if first is None:
+            return
+        second = next(tasks, None)
+        if self.workers <= 1 or second is None:
+            # A lone large PDF can still use the spare cores page by page; with
+            # several files the pool below keeps every core busy, so pages are
+            # not split further there
+            options = self._extractor_options(page_workers=self.workers, archive=archive)
+            for task in itertools.chain([first], [second] if second else [], tasks):
+                with self.metrics.stage('extraction'):
+                    result = process_source_file(str(task['file_path']), task['category'],
+                                                 task['known_hash'], options)
+                yield task, result
+            return
+        from concurrent.futures import ProcessPoolExecutor
+        options = self._extractor_options(page_workers=1, archive=archive)
+        max_in_flight = self.pipeline_settings.get('max_in_flight') or self.workers * 4
+        in_flight = deque()
+        self.logger.info(f"Extracting with {self.workers} workers")
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for task in itertools.chain([first, second], tasks):
+                in_flight.append((task, pool.submit(
+                    process_source_file, str(task['file_path']), task['category'],
+                    task['known_hash'], options
+                )))
+                if len(in_flight) >= max_in_flight:
+                    done, future = in_flight.popleft()
+                    with self.metrics.stage('extraction'):
+                        result = future.result()
+                    yield done, result
+            while in_flight:
+                done, future = in_flight.popleft()
+                with self.metrics.stage('extraction'):
+                    result = future.result()
+                yield done, result
+    
+    def _integrate_batch(self, merged: List) -> Iterator[Dict]:
+        """Score (source_info, stored) pairs against the docs together, then integrate each"""
+        if not merged:
+            return
+        with self.metrics.stage('relevance'):
+            relevance = self.analyze_relevance_batch([source_info for source_info, _ in merged])
+        for (source_info, stored), source_relevance in zip(merged, relevance):
+            source_info['relevance'] = source_relevance
+            yield self._integrate_source(source_info, stored)
+    
+    def _integrate_source(self, source_info: Dict, stored: Optional[str] = None) -> Dict:
+        """Index and archive a merged source whose relevance is set; returns its summary
+        
+        ``stored`` is how the extraction step already wrote the archive
+        object, if it did.
+        """
+        self._mark_dirty(source_info['file_path'], source_info)
+        with self.metrics.stage('index'):
+            self.index_source(source_info)
         
-        return new_sources
+        # Archive the file content once, whatever its name
+        source_file = Path(source_info['file_path'])
+        if source_file.exists():
+            with self.metrics.stage('archive'):
+                source_info['archived_path'] = self.archive.archive(
+                    source_file, source_info['category'], source_info['hash'], stored,
+                    self._category_relative(source_file, source_info['category'])
+                )
+        
+        self.logger.info(f"Integrated source: {source_info['title']} "
+                         f"(Relevance: {source_info['relevance']['level']})")
+        summary = self._summarize(source_info)
+        self.report.record(summary)
+        return summary
+    
+    def _summarize(self, source_info: Dict) -> Dict:
+        """Lightweight view of a record for reports and session output"""
+        summary = source_summary(source_info)
+        summary['status'] = source_info.get('status', 'new')
+        summary['status_changed'] = source_info.get('status_changed', source_info.get('added_date'))
+        if source_info.get('archived_path'):
+            summary['archived_path'] = source_info['archived_path']
+        return summary
+    
+    def _commit_batch(self):
+        """Persist pending records in one transaction and release them from memory"""
+        if not (self._dirty_sources or self._deleted_sources):
+            return
+        with self.metrics.stage('archive'):
+            self.archive.save()
+        stats = self.archive.stats
+        self.metrics.count('bytes_copied', stats['bytes_stored'] - self._archive_counted['bytes_stored'])
+        self.metrics.count('files_archived', stats['stored'] - self._archive_counted['stored'])
+        self.metrics.count('files_deduplicated', stats['deduplicated'] - self._archive_counted['deduplicated'])
+        self._archive_counted = dict(stats)
+        with self.metrics.stage('index'):
+            self.search_index.commit()
+            self.near_duplicates.commit()
+            sources = self.source_db['sources']
+            self.citations.update_sources(sources[path] for path in self._dirty_sources if path in sources)
+            self.citations.remove_sources(self._deleted_sources)
+            self.citations.commit()
+        self.source_db['last_update'] = datetime.now().isoformat()
+        self.save_source_database()
+        self.report.flush()
+    
+    def _extractor_options(self, page_workers: int = 1, archive: bool = True) -> Dict:
+        """Settings passed to extractors running in this or a worker process"""
+        return {
+            'pdf': self.config.get('PDF_PROCESSING') or {},
+            'pdf_cache_dir': str(self.pdf_cache_dir),
+            'page_workers': page_workers,
+            'csv': self.config.get('CSV_PROCESSING') or {},
+            'data': self.config.get('DATA_PROCESSING') or {},
+            'minhash': self.near_duplicate_settings,
+            'read_mode': self.pipeline_settings.get('read_mode', 'mmap'),
+            'cache': self.blobs.root.as_posix(),
+            'archive': {'root': self.archive.root.as_posix(), 'method': self.archive.method} if archive else None
+        }
+    
+    def _category_relative(self, file_path: Path, category: str) -> Optional[str]:
+        """Path of a file below its category directory, or None if it is outside it"""
+        try:
+            return file_path.relative_to(Path(self.config['INPUT_DIR']) / category).as_posix()
+        except ValueError:
+            return None
     
     def _is_supported_format(self, file_path: Path, category: str) -> bool:
-        """Check if file format is supported for the category"""
-        supported = self.config['SUPPORTED_FORMATS'].get(category, [])
-        return file_path.suffix.lower() in supported
+        """Check if a file inside the category directory is a source (format and DISCOVERY globs)"""
+        relative = self._category_relative(file_path, category)
+        if relative is None:
+            return False
+        return self.input_filters[category].accepts_path(relative)
     
-    def _process_file(self, file_path: Path, category: str) -> Optional[Dict]:
-        """Process a single source file and extract metadata"""
+    def _category_of(self, file_path: Path) -> Optional[str]:
+        """Category of a file inside INPUT_DIR, or None if it is not a source location"""
         try:
-            file_hash = self._calculate_file_hash(file_path)
-            cwd = Path.cwd().resolve()
-            try:
-                relative_path = str(file_path.relative_to(cwd))
-            except ValueError:
-                # If file is not under cwd, use absolute path
-                relative_path = str(file_path)
+            parts = file_path.relative_to(Path(self.config['INPUT_DIR'])).parts
+        except ValueError:
+            return None
+        if len(parts) >= 2 and parts[0] in SOURCE_CATEGORIES:
+            return parts[0]
+        return None
+    
+    def ingest_paths(self, paths) -> List[Dict]:
+        """Process and integrate only the given paths (used by watch mode)
+        
+        Changes are queued for the next integration report rather than
+        reported on every batch of events.
+        """
+        self.begin_run()
+        success = False
+        try:
+            summaries = list(self.ingest(paths))
+            success = True
+        finally:
+            self.finish_run(success)
+        return summaries
+    
+    def _relative_path(self, file_path: Path) -> str:
+        """Database key for a source file"""
+        try:
+            return str(file_path.relative_to(self._cwd))
+        except ValueError:
+            # If file is not under cwd, use absolute path
+            return str(file_path)
+    
+    def source_paths_under(self, directory: Path) -> List[Path]:
+        """Recorded sources below a directory, such as one deleted or moved out of INPUT_DIR"""
+        prefix = self._relative_path(Path(directory)).rstrip(os.sep) + os.sep
+        return [Path(path) for path in self.source_db['sources'] if path.startswith(prefix)]
+    
+    def _remove_missing_sources(self, discovered: set):
+        """Forget sources whose input file no longer exists"""
+        removed = [
+            path for path in list(self.source_db['sources'])
+            if path not in discovered and not os.path.exists(path)
+        ]
+        for path in removed:
+            self.remove_source(path)
+        if removed:
+            self.metrics.count('files_removed', len(removed))
+            self.logger.info(f"Removed {len(removed)} sources no longer in {self.config['INPUT_DIR']}")
+    
+    def remove_source(self, path: str):
+        """Drop a source from the database, the search index and the fingerprint cache"""
+        record = self.source_db['sources'].get(path)
+        if record is not None:
+            del self.source_db['sources'][path]
+            self._forget_pdf_pages(record)
+            self.report.record({'file_path': path, 'title': record.get('title', path),
+                                'category': record.get('category'), 'status': 'removed',
+                                'status_changed': datetime.now().isoformat()})
+        self._dirty_sources.discard(path)
+        self._deleted_sources.add(path)
+        self.search_index.remove_source(path)
+        self.near_duplicates.remove_source(path)
+        if self.fingerprints.pop(path, None) is not None:
+            self._fingerprints_dirty = True
+    
+    def _prepare_file(self, file_path: Path, category: str, st: Optional[os.stat_result] = None,
+                      relative_path: Optional[str] = None) -> Optional[Dict]:
+        """Decide from stat() alone whether a file needs hashing
+        
+        Returns an extraction task, or None when the cached fingerprint shows
+        the file is unchanged. ``st`` and ``relative_path`` are passed when
+        discovery already has them.
+        """
+        try:
+            relative_path = relative_path or self._relative_path(file_path)
             
-            # Check if file already exists
-            if relative_path in self.source_db['sources']:
-                existing_hash = self.source_db['sources'][relative_path].get('hash')
-                if existing_hash == file_hash:
-                    return None  # File unchanged
+            # Fast path: an unchanged stat fingerprint means an unchanged file
+            existing = self.source_db['sources'].get(relative_path)
+            fingerprint = self._stat_fingerprint(file_path, st)
+            cached = self.fingerprints.get(relative_path)
+            if (not self.verify and existing and cached
+                    and cached[:4] == fingerprint
+                    and cached[4] == existing.get('hash')):
+                return None
             
-            source_info = {
-                'file_path': relative_path,
+            # A record made by an older extractor version is re-extracted
+            # even when the content turns out unchanged
+            current = existing and not self.stale_steps(existing).get('extract')
+            return {
+                'file_path': file_path,
                 'category': category,
-                'hash': file_hash,
-                'added_date': datetime.now().isoformat(),
-                'status': 'new'
+                'relative_path': relative_path,
+                'fingerprint': fingerprint,
+                'known_hash': existing.get('hash') if current else None
             }
             
-            # Extract content based on file type
-            if category == 'briefings' and file_path.suffix == '.md':
-                content = self._extract_markdown_content(file_path)
-                source_info.update(content)
-            elif category == 'data' and file_path.suffix in ['.json', '.yaml', '.yml']:
-                content = self._extract_structured_data(file_path)
-                source_info.update(content)
-            elif category == 'papers' and file_path.suffix == '.txt':
-                content = self._extract_text_content(file_path)
-                source_info.update(content)
-            
-            # Update database
-            self.source_db['sources'][relative_path] = source_info
-            
-            return source_info
-            
         except Exception as e:
             self.logger.error(f"Error processing {file_path}: {e}")
             return None
     
-    def _calculate_file_hash(self, file_path: Path) -> str:
-        """Calculate SHA-256 hash of file"""
-        hash_sha256 = hashlib.sha256()
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-        return hash_sha256.hexdigest()
-    
-    def _extract_markdown_content(self, file_path: Path) -> Dict:
-        """Extract content from markdown briefing files"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Extract front matter
-        front_matter = {}
-        if content.startswith('---'):
-            try:
-                end_index = content.find('---', 3)
-                if end_index != -1:
-                    yaml_content = content[3:end_index].strip()
-                    front_matter = yaml.safe_load(yaml_content)
-                    content = content[end_index + 3:].strip()
-            except:
-                pass
+    def _merge_result(self, task: Dict, result: Dict) -> Optional[Dict]:
+        """Write one extraction result into the source database"""
+        relative_path = task['relative_path']
+        self.metrics.record_file(relative_path, result.get('extractor'),
+                                 result.get('timings', {}), result.get('size', 0))
+        if result['error']:
+            self.metrics.count('files_failed')
+            self.logger.error(f"Error processing {task['file_path']}: {result['error']}")
+            return None
         
-        # Extract sections
-        sections = {}
-        for match in re.finditer(r'^#+ (.+)$\n(.*?)(?=\n# |$)', content, re.MULTILINE | re.DOTALL):
-            section_title = match.group(1).strip()
-            section_content = match.group(2).strip()
-            sections[section_title.lower().replace(' ', '_')] = section_content
+        file_hash = result['hash']
+        self.metrics.count('bytes_hashed', result.get('size', 0))
+        self._remember_fingerprint(relative_path, task['fingerprint'], file_hash)
         
-        return {
-            'title': front_matter.get('title', file_path.stem),
-            'author': front_matter.get('author', ''),
-            'date': front_matter.get('date', ''),
-            'tags': front_matter.get('tags', []),
-            'priority': front_matter.get('priority', 'medium'),
-            'sections': sections,
-            'summary': sections.get('key_findings', '')[:500] if 'key_findings' in sections else content[:500]
-        }
-    
-    def _extract_structured_data(self, file_path: Path) -> Dict:
-        """Extract content from structured data files"""
-        if file_path.suffix == '.json':
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        else:  # YAML
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+        # Check if file already exists
+        if result['content'] is None:
+            self.metrics.count('files_unchanged')
+            return None  # File unchanged
+        self.metrics.count('files_processed')
+        if result.get('cached'):
+            self.metrics.count('files_cached')
         
-        return {
-            'title': data.get('title', file_path.stem),
-            'type': data.get('type', 'structured_data'),
-            'schema': list(data.keys()) if isinstance(data, dict) else 'array',
-            'summary': str(data)[:500] if isinstance(data, (str, int, float)) else json.dumps(data, indent=2)[:500],
-            'data': data
-        }
+        existing = self.source_db['sources'].get(relative_path)
+        if existing and existing.get('hash') == file_hash:
+            # Same content re-extracted by a newer extractor version
+            source_info = SourceRecord({field: existing[field] for field in RECORD_FIELDS if field in existing})
+        else:
+            if existing:
+                self._forget_pdf_pages(existing)
+            added_date = datetime.now().isoformat()
+            source_info = SourceRecord({
+                'file_path': relative_path,
+                'category': task['category'],
+                'hash': file_hash,
+                'added_date': added_date,
+                'status': 'new',
+                'status_changed': added_date
+            })
+        self._apply_extraction(source_info, result)
+        
+        # Update database
+        self._mark_dirty(relative_path, source_info)
+        
+        return source_info
     
-    def _extract_text_content(self, file_path: Path) -> Dict:
-        """Extract content from plain text files"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    def _apply_extraction(self, source_info: Dict, result: Dict):
+        """Add extracted fields and near-duplicates to a record and store its body"""
+        source_info.update(result['content'])
+        source_info['extractor'] = result.get('extractor')
+        source_info['extractor_version'] = result.get('version')
+        if result.get('signature'):
+            duplicates = self._record_signature(source_info['file_path'], result['signature'])
+            if duplicates:
+                source_info['near_duplicates'] = duplicates
         
-        # Basic text analysis
-        lines = content.split('\n')
-        words = content.split()
+        # Bodies live in the blob store under (hash, extractor, version), with
+        # the metadata so the entry can stand in for the extraction; the
+        # record keeps metadata and summary
+        self.blobs.put(self._body_key(source_info),
+                       dict(result['content'], source_name=Path(source_info['file_path']).name))
+        split_body(source_info)
+    
+    @staticmethod
+    def _body_key(source_info: Dict) -> str:
+        """Blob name of a record's body"""
+        if 'extractor_version' not in source_info:
+            return source_info.get('hash', '')
+        return extraction_key(source_info.get('hash', ''), source_info.get('extractor'),
+                              source_info['extractor_version'])
+    
+    def _record_signature(self, relative_path: str, signature: bytes) -> List[Dict]:
+        """Index a source's MinHash signature and return its near-duplicates"""
+        matches = self.near_duplicates.query(
+            signature,
+            threshold=self.near_duplicate_settings.get('threshold', 0.8),
+            limit=self.near_duplicate_settings.get('max_matches', 5),
+            exclude=relative_path
+        )
+        self.near_duplicates.add(relative_path, signature)
+        for path, score in matches:
+            self.logger.info(f"{relative_path} looks like a near-duplicate of {path} ({score:.0%})")
+        return [{'file_path': path, 'similarity': round(score, 3)} for path, score in matches]
+    
+    def get_source_body(self, source_info: Dict) -> Dict:
+        """Load the extracted body (content, data or sections) of a record"""
+        inline = {field: source_info[field] for field in BODY_FIELDS
+                  if field in source_info and not (field == 'sections' and isinstance(source_info[field], (list, tuple)))}
+        if inline:
+            return inline  # record written before bodies moved to the blob store
+        stored = self.blobs.get(self._body_key(source_info)) or {}
+        return {field: stored[field] for field in BODY_FIELDS if field in stored}
+    
+    def externalize_bodies(self) -> int:
+        """Move inline bodies of existing records into the blob store"""
+        moved = 0
+        for path in list(self.source_db['sources']):
+            record = self.source_db['sources'][path]
+            body = split_body(record)
+            if body:
+                self.blobs.put(self._body_key(record), body)
+                self._mark_dirty(path, record)
+                moved += 1
+        if moved:
+            self.save_source_database()
+        return moved
+    
+    @property
+    def pdf_cache_dir(self) -> Path:
+        """Root of the PDF page cache, with one directory per extractor version"""
+        return Path(self.config.get('STATE_DIR', '.superlead')) / 'pdf_pages'
+    
+    def _forget_pdf_pages(self, record: Dict):
+        """Mark the cached pages of a removed or changed PDF source for eviction"""
+        if Path(record.get('file_path', '')).suffix.lower() == '.pdf' and record.get('hash'):
+            self._stale_page_hashes.add(record['hash'])
+    
+    def evict_pdf_pages(self) -> int:
+        """Delete cached pages of PDFs removed or changed in this run unless a source still has that content"""
+        if not self._stale_page_hashes:
+            return 0
+        stale = self._stale_page_hashes
+        self._stale_page_hashes = set()
+        stale -= {record.get('hash') for record in self.source_db['sources'].values()}
+        removed = evict_pages(self.pdf_cache_dir, stale)
+        if removed:
+            self.logger.info(f"Evicted cached pages of {removed} PDF version(s) no longer ingested")
+        return removed
+    
+    def _stat_fingerprint(self, file_path: Path, st: Optional[os.stat_result] = None) -> List[int]:
+        """Return the (size, mtime_ns, inode, device) tuple for a file"""
+        st = st or file_path.stat()
+        return [st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev]
+    
+    def _remember_fingerprint(self, relative_path: str, fingerprint: List[int], file_hash: str):
+        """Cache the fingerprint of a freshly hashed file"""
+        # A file modified within the mtime granularity of this scan could change
+        # again without its fingerprint changing, so leave it to be rehashed
+        if fingerprint[1] >= self._scan_started_ns - 2_000_000_000:
+            if self.fingerprints.pop(relative_path, None) is not None:
+                self._fingerprints_dirty = True
+            return
+        entry = fingerprint + [file_hash]
+        if self.fingerprints.get(relative_path) != entry:
+            self.fingerprints[relative_path] = entry
+            self._fingerprints_dirty = True
+    
+    @property
+    def keyword_matcher(self) -> KeywordMatcher:
+        """Compiled matcher for the relevance vocabulary in config.yaml"""
+        if self._keyword_matcher is None:
+            settings = self.config.get('RELEVANCE', {}) or {}
+            terms = list(settings.get('keywords') or DEFAULT_RELEVANT_KEYWORDS)
+            vocabulary_file = settings.get('vocabulary_file')
+            if vocabulary_file and os.path.exists(vocabulary_file):
+                with open(vocabulary_file, 'r', encoding='utf-8') as f:
+                    terms.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+            self._keyword_matcher = KeywordMatcher(terms)
+        return self._keyword_matcher
+    
+    def _source_text(self, source_info: Dict) -> str:
+        """Full searchable text of a source: title plus body (or summary)"""
+        parts = []
+        body = self.get_source_body(source_info)
+        if isinstance(body.get('content'), str):
+            parts.append(body['content'])
+        if isinstance(body.get('sections'), dict):
+            for anchor, text in body['sections'].items():
+                parts.append(anchor.replace('_', ' '))
+                parts.append(str(text))
+        # The summary is an excerpt of the body, so it only stands in for it
+        if not parts:
+            parts.append(str(source_info.get('summary', '')))
+        return '\n'.join([str(source_info.get('title', ''))] + parts)
+    
+    @property
+    def section_model(self) -> Optional[SectionModel]:
+        """TF-IDF model of the documentation sections, refreshed once per ingestion run
         
-        return {
-            'title': file_path.stem,
-            'type': 'text_document',
-            'line_count': len(lines),
-            'word_count': len(words),
-            'summary': content[:500],
-            'content': content
-        }
+        None when recommendations are disabled or NumPy is missing.
+        """
+        if self._section_model is None:
+            settings = self.recommender_settings
+            if not settings.get('enabled', True):
+                return None
+            self._section_model = SectionModel(
+                self.config['DOCS_DIR'],
+                Path(self.config.get('STATE_DIR', '.superlead')) / 'doc_sections.json',
+                exclude=settings.get('exclude_docs', []),
+                top_k=settings.get('top_k', 5),
+                min_score=settings.get('min_score', 0.05),
+                exclude_sections=settings.get('exclude_sections', [])
+            )
+            self._section_model_checked = False
+        if self._section_model and not self._section_model_checked:
+            self._section_model_checked = True
+            try:
+                changed = self._section_model.refresh()
+            except RuntimeError as e:
+                self.logger.warning(f"Section recommendations disabled: {e}")
+                self._section_model = False
+                return None
+            if changed:
+                self.logger.info(f"Section model rebuilt: {changed} changed document(s), "
+                                 f"{len(self._section_model.targets)} sections")
+        return self._section_model or None
     
     def analyze_relevance(self, source_info: Dict) -> Dict:
         """Analyze how relevant a source is to existing documentation"""
-        relevance_score = 0
-        matches = []
-        
-        # Keywords that indicate relevance to our project
-        relevant_keywords = [
-            'autonomous', 'projectile', 'guidance', 'trajectory', 'ballistics',
-            'drone', 'multi-agent', 'sensor fusion', 'control theory',
-            'communication', 'telemetry', 'gps', 'navigation', 'optimization',
-            'kalman', 'filter', 'prediction', 'correction', 'aerodynamics'
-        ]
+        return self.analyze_relevance_batch([source_info])[0]
+    
+    def analyze_relevance_batch(self, sources: List[Dict]) -> List[Dict]:
+        """Relevance of several sources, scoring them against the docs in one batch
         
-        # Check title and summary for keywords
-        text_to_check = f"{source_info.get('title', '')} {source_info.get('summary', '')}".lower()
-        for keyword in relevant_keywords:
-            if keyword in text_to_check:
-                relevance_score += 1
-                matches.append(keyword)
-        
-        # Boost score based on tags
-        tags = source_info.get('tags', [])
-        for tag in tags:
-            if tag.lower() in relevant_keywords:
-                relevance_score += 2
-                matches.append(tag)
-        
-        # Determine relevance level
-        if relevance_score >= 4:
-            level = 'high'
-        elif relevance_score >= 2:
-            level = 'medium'
-        else:
-            level = 'low'
+        Keyword matches decide the score and level; ``recommended_sections``
+        are the best matching ``docs/<file>.md#<anchor>`` sections by TF-IDF
+        similarity, with their similarities in ``section_scores``.
+        """
+        matcher = self.keyword_matcher
+        model = self.section_model
+        results = []
+        counts = []
+        for source_info in sources:
+            text = self._source_text(source_info)
+            
+            # One pass over the full document text for every vocabulary term
+            frequencies = matcher.count(text)
+            matches = matcher.ordered(frequencies)
+            relevance_score = len(matches)
+            
+            # Boost score based on tags
+            tags = source_info.get('tags', [])
+            for tag in tags:
+                if str(tag) in matcher:
+                    relevance_score += 2
+                    matches.append(tag)
+            
+            # Determine relevance level
+            if relevance_score >= 4:
+                level = 'high'
+            elif relevance_score >= 2:
+                level = 'medium'
+            else:
+                level = 'low'
+            
+            results.append({
+                'score': relevance_score,
+                'level': level,
+                'matches': matches,
+                'term_frequencies': frequencies,
+                'recommended_sections': [],
+                'section_scores': [],
+                'version': RELEVANCE_VERSION
+            })
+            if model is not None:
+                counts.append(term_counts(text))
         
+        if model is not None:
+            for relevance, sections in zip(results, model.score(counts)):
+                relevance['recommended_sections'] = [section['target'] for section in sections]
+                relevance['section_scores'] = [section['score'] for section in sections]
+        return results
+    
+    def index_source(self, source_info: Dict):
+        """Add or replace a source and its sections in the search index"""
+        self.search_index.index_source(
+            source_info['file_path'],
+            str(source_info.get('title', '')),
+            self._source_text(source_info),
+            self.get_section_texts(source_info)
+        )
+    
+    def get_section_texts(self, source_info: Dict) -> List[tuple]:
+        """(anchor, title, text) for each markdown section of a source"""
+        body = self.get_source_body(source_info)
+        if isinstance(body.get('sections'), dict):
+            # Records written before sections were stored as offsets
+            return [
+                (anchor, anchor.replace('_', ' '), str(text))
+                for anchor, text in body['sections'].items()
+            ]
+        sections = source_info.get('sections')
+        if not sections or not isinstance(sections[0], Mapping) or not isinstance(body.get('content'), str):
+            return []
+        data = body['content'].encode('utf-8')
+        return [(section['anchor'], section['title'], section_text(data, section)) for section in sections]
+    
+    def rebuild_search_index(self) -> int:
+        """Index every source in the database from scratch
+        
+        Also recomputes MinHash signatures from stored bodies, which
+        backfills the near-duplicate index for sources ingested before it
+        existed.
+        """
+        settings = self.near_duplicate_settings
+        if settings.get('enabled', False):
+            self.near_duplicates.clear()
+        count = 0
+        for path in list(self.source_db['sources']):
+            source_info = self.source_db['sources'][path]
+            self.index_source(source_info)
+            if settings.get('enabled', False):
+                text = signature_text({**source_info, **self.get_source_body(source_info)})
+                signature = minhash_signature(text, settings.get('num_perm', 128),
+                                              settings.get('shingle_size', 5))
+                if signature:
+                    self.near_duplicates.add(path, signature)
+            count += 1
+        self.search_index.commit()
+        self.near_duplicates.commit()
+        return count
+    
+    def stale_steps(self, source_info: Dict) -> Dict[str, bool]:
+        """Whether a record's extracted fields and relevance come from older versions
+        
+        Records from before versioning count as version 1 of both.
+        """
+        extractor = source_info.get('extractor') or extractor_name(
+            Path(source_info['file_path']), source_info.get('category', ''))
+        relevance = source_info.get('relevance') or {}
         return {
-            'score': relevance_score,
-            'level': level,
-            'matches': matches,
-            'recommended_sections': self._suggest_sections(matches)
+            'extract': (extractor in EXTRACTOR_VERSIONS
+                        and source_info.get('extractor_version', 1) != EXTRACTOR_VERSIONS[extractor]),
+            'relevance': relevance.get('version', 1) != RELEVANCE_VERSION
         }
     
-    def _suggest_sections(self, matches: List[str]) -> List[str]:
-        """Suggest which documentation sections this source should update"""
-        section_map = {
-            'autonomous': ['system_architecture', 'planning_layer'],
-            'projectile': ['actuation_layer', 'mathematical_framework'],
-            'guidance': ['planning_layer', 'communication_layer'],
-            'trajectory': ['mathematical_framework', 'planning_layer'],
-            'ballistics': ['mathematical_framework'],
-            'drone': ['perception_layer', 'commercial_options'],
-            'multi-agent': ['communication_layer', 'system_architecture'],
-            'sensor': ['perception_layer', 'sensor_fusion'],
-            'control': ['actuation_layer', 'planning_layer'],
-            'communication': ['communication_layer'],
-            'telemetry': ['communication_layer'],
-            'gps': ['perception_layer', 'adversarial_threats'],
-            'navigation': ['perception_layer', 'planning_layer'],
-            'optimization': ['mathematical_framework', 'planning_layer'],
-            'kalman': ['sensor_fusion', 'target_prediction'],
-            'filter': ['sensor_fusion'],
-            'prediction': ['target_prediction'],
-            'correction': ['actuation_layer'],
-            'aerodynamics': ['mathematical_framework']
-        }
+    def reprocess(self, paths: Optional[Iterable[str]] = None, force: bool = False,
+                  dry_run: bool = False) -> Dict:
+        """Redo the extraction and scoring that older versions produced; returns counts
         
-        suggested_sections = set()
-        for match in matches:
-            if match in section_map:
-                suggested_sections.update(section_map[match])
+        Only stale (record, step) pairs are redone, or every record with
+        ``force``. Re-extracted records are also re-scored; records whose
+        relevance alone is stale are re-scored from their stored bodies.
+        Files are re-read from INPUT_DIR by the WORKERS process pool, and
+        outputs of the current versions are taken from the extraction
+        cache. Status, history and archive path are kept, while a file
+        whose content changed since it was ingested is integrated as
+        ``ingest`` would. Records whose file is gone are left for the next
+        ingestion to remove.
+        """
+        sources = self.source_db['sources']
+        counts = {'extracted': 0, 'rescored': 0, 'changed': 0, 'missing': 0, 'failed': 0, 'extractors': {}}
+        extract, rescore = [], []
+        for path in sorted(paths if paths is not None else sources):
+            record = sources.get(path)
+            if record is None:
+                self.logger.warning(f"No source recorded for {path}")
+                continue
+            stale = self.stale_steps(record)
+            if force or stale['extract']:
+                if not os.path.isfile(path):
+                    counts['missing'] += 1
+                    continue
+                extract.append(path)
+                name = extractor_name(Path(path), record.get('category', ''))
+                counts['extractors'][name] = counts['extractors'].get(name, 0) + 1
+            elif stale['relevance']:
+                rescore.append(path)
+        if dry_run:
+            counts.update(extracted=len(extract), rescored=len(rescore))
+            return counts
+        
+        self.begin_run()
+        success = False
+        batch_size = max(int(self.recommender_settings.get('batch_size', 64)), 1)
+        commit_size = max(int(self.pipeline_settings.get('batch_size', 200)), 1)
+        self._section_model_checked = False
+        try:
+            batch, changed = [], []
+            for task, result in self._extract(self._reprocess_tasks(extract), archive=False):
+                previous_hash = sources[task['relative_path']].get('hash')
+                with self.metrics.stage('merge'):
+                    source_info = self._merge_result(task, result)
+                if source_info is None:
+                    counts['failed'] += 1
+                    continue
+                if source_info['hash'] != previous_hash:
+                    counts['changed'] += 1
+                    changed.append((source_info, None))
+                else:
+                    counts['extracted'] += 1
+                    batch.append((source_info, True))
+                if len(changed) >= batch_size:
+                    for _ in self._integrate_batch(changed):
+                        pass
+                    changed = []
+                if len(batch) >= batch_size:
+                    self._rescore_batch(batch)
+                    batch = []
+                if len(self._dirty_sources) >= commit_size:
+                    self._commit_batch()
+            
+            for path in rescore:
+                batch.append((sources[path], False))
+                counts['rescored'] += 1
+                if len(batch) >= batch_size:
+                    self._rescore_batch(batch)
+                    batch = []
+                    if len(self._dirty_sources) >= commit_size:
+                        self._commit_batch()
+            for _ in self._integrate_batch(changed):
+                pass
+            if batch:
+                self._rescore_batch(batch)
+            self._commit_batch()
+            self.save_fingerprint_cache()
+            
+            with self.metrics.stage('citations'):
+                self.refresh_citations()
+            if counts['changed']:
+                with self.metrics.stage('report'):
+                    self.generate_integration_report()
+            # Pages extracted by older PDF extractor versions are never read again
+            purge_old_versions(self.pdf_cache_dir, EXTRACTOR_VERSIONS['pdf'])
+            success = True
+        finally:
+            self.finish_run(success)
+        return counts
+    
+    def _reprocess_tasks(self, paths: List[str]) -> Iterator[Dict]:
+        """Extraction tasks that re-read the given sources whatever their hash"""
+        for path in paths:
+            file_path = Path(path)
+            try:
+                fingerprint = self._stat_fingerprint(file_path)
+            except OSError as e:
+                self.logger.error(f"Error processing {file_path}: {e}")
+                continue
+            self.metrics.count('files_seen')
+            yield {'file_path': file_path, 'category': self.source_db['sources'][path]['category'],
+                   'relative_path': path, 'fingerprint': fingerprint, 'known_hash': None}
+    
+    def _rescore_batch(self, batch: List[tuple]):
+        """Score (source_info, reindex) pairs together, reindexing the re-extracted ones"""
+        with self.metrics.stage('relevance'):
+            relevance = self.analyze_relevance_batch([source_info for source_info, _ in batch])
+        for (source_info, reindex), source_relevance in zip(batch, relevance):
+            source_info['relevance'] = source_relevance
+            if reindex:
+                with self.metrics.stage('index'):
+                    self.index_source(source_info)
+            self._mark_dirty(source_info['file_path'], source_info)
+    
+    def open_work_queue(self, path: Optional[str] = None) -> WorkQueue:
+        """The work queue shared by the coordinator and its workers"""
+        default = Path(self.config.get('STATE_DIR', '.superlead')) / 'work_queue.sqlite3'
+        return WorkQueue(path or self.queue_settings.get('path') or default,
+                         journal_mode=self.queue_settings.get('journal_mode', 'wal'))
+    
+    def enqueue_work(self, queue: WorkQueue) -> int:
+        """Queue every new or changed input file for workers; returns how many were queued
         
-        return list(suggested_sections)
+        Discovery and stat fingerprints work as in ``ingest``, and sources
+        whose files disappeared are removed. Paths are relative to the
+        directory the manager runs in, so workers must run from a checkout
+        where ``INPUT_DIR`` is the same shared tree.
+        """
+        self._scan_started_ns = time.time_ns()
+        discovered = set()
+        queued = queue.enqueue(
+            {'path': task['relative_path'], 'category': task['category'],
+             'fingerprint': task['fingerprint'], 'known_hash': task['known_hash']}
+            for task in self._fingerprint(self._discover_files(discovered), discovered)
+        )
+        self._remove_missing_sources(discovered)
+        self._commit_batch()
+        self.save_fingerprint_cache()
+        return queued
     
-    def integrate_sources(self, new_sources: List[Dict]):
-        """Integrate new sources into the documentation system"""
-        for source in new_sources:
-            relevance = self.analyze_relevance(source)
-            source['relevance'] = relevance
+    def work(self, queue: WorkQueue, worker_id: Optional[str] = None, wait: bool = False) -> int:
+        """Lease, extract and score queued files until none are left; returns how many this worker completed
+        
+        Each leased batch is hashed and extracted (in the process pool with
+        several WORKERS) and scored for relevance in one batch, and every
+        result is committed to the queue under its hash and path. Leases are
+        renewed while a batch is still being processed. With ``wait``, the
+        worker stays while any task is pending or leased and until a
+        coordinator that ran since the worker started has stopped, so it
+        can be started before the coordinator and picks up the files of a
+        crashed worker once their leases expire. Workers never write the
+        source database; the coordinator merges.
+        """
+        worker_id = worker_id or default_worker_id()
+        settings = self.queue_settings
+        batch_size = max(int(settings.get('batch_size', 20)), 1)
+        lease_seconds = float(settings.get('lease_seconds', 300))
+        max_attempts = int(settings.get('max_attempts', 3))
+        self._section_model_checked = False
+        started = time.time()
+        completed = 0
+        
+        while True:
+            leased = queue.lease(worker_id, batch_size, lease_seconds, max_attempts)
+            if not leased:
+                if wait and (queue.outstanding() or not queue.coordinator_done(started, lease_seconds)):
+                    time.sleep(float(settings.get('poll_interval', 2.0)))
+                    continue
+                break
+            tasks = [{'file_path': Path(item['path']), 'category': item['category'],
+                      'relative_path': item['path'], 'fingerprint': item['fingerprint'],
+                      'known_hash': item['known_hash']} for item in leased]
             
-            # Copy file to sources directory
-            source_file = Path(source['file_path'])
-            if source_file.exists():
-                dest_path = Path(self.config['SOURCES_DIR']) / source_file.name
-                import shutil
-                shutil.copy2(source_file, dest_path)
-                source['archived_path'] = str(dest_path)
+            renewed = time.monotonic()
+            extracted = []
+            for task, result in self._extract(tasks, archive=False):
+                if time.monotonic() - renewed > lease_seconds / 2:
+                    queue.renew(worker_id, [item['path'] for item in leased], lease_seconds)
+                    renewed = time.monotonic()
+                if result['error']:
+                    self.logger.error(f"Error processing {task['file_path']}: {result['error']}")
+                    queue.fail(worker_id, task['relative_path'], result['error'], max_attempts)
+                else:
+                    extracted.append((task, result))
             
-            self.logger.info(f"Integrated source: {source['title']} (Relevance: {relevance['level']})")
+            changed = [(task, result) for task, result in extracted if result['content'] is not None]
+            for task, result in changed:
+                if result.get('body_stored'):
+                    # The coordinator's blob store may be on another machine, so the body travels in the queue
+                    result['content'].update(self.get_source_body({
+                        'hash': result['hash'], 'extractor': result['extractor'],
+                        'extractor_version': result['version']
+                    }))
+            sources = [dict({'file_path': task['relative_path'], 'category': task['category'],
+                             'hash': result['hash']}, **result['content']) for task, result in changed]
+            relevance = dict(zip((task['relative_path'] for task, _ in changed),
+                                 self.analyze_relevance_batch(sources)))
+            for task, result in extracted:
+                path = task['relative_path']
+                packed = pack_result(result, relevance[path]) if path in relevance else None
+                if queue.complete(worker_id, path, result['hash'], packed):
+                    completed += 1
+                else:
+                    self.logger.warning(f"Lease on {path} expired before it was completed")
+            self.logger.info(f"Worker {worker_id}: completed {completed} files")
+        return completed
+    
+    def collect_results(self, queue: WorkQueue) -> int:
+        """Merge finished queue tasks into the database; returns how many sources were integrated
         
-        # Save updated database
-        self.source_db['last_update'] = datetime.now().isoformat()
-        self.save_source_database()
+        Records are committed per batch before their tasks are marked
+        merged, so a coordinator that stops in between merges the same
+        results again, with the same outcome.
+        """
+        batch_size = max(int(self.pipeline_settings.get('batch_size', 200)), 1)
+        integrated = 0
+        while True:
+            finished = queue.finished(batch_size)
+            if not finished:
+                break
+            for item in finished:
+                task = {'file_path': Path(item['path']), 'category': item['category'],
+                        'relative_path': item['path'], 'fingerprint': item['fingerprint'],
+                        'known_hash': item['known_hash']}
+                result = item['result']
+                with self.metrics.stage('merge'):
+                    source_info = self._merge_result(task, result)
+                if source_info is None:
+                    continue
+                source_info['relevance'] = result['relevance'] or self.analyze_relevance(source_info)
+                self._integrate_source(source_info)
+                integrated += 1
+            self._commit_batch()
+            self.save_fingerprint_cache()
+            queue.mark_merged(item['path'] for item in finished)
+        return integrated
     
-    def generate_integration_report(self) -> str:
-        """Generate a report of recently integrated sources"""
-        report = ["# Source Integration Report\n"]
-        report.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    def coordinate(self, queue: WorkQueue, wait: bool = True) -> int:
+        """Queue changed files, then merge worker results until the queue drains; returns sources integrated
         
-        recent_sources = [
-            src for src in self.source_db['sources'].values()
-            if src.get('status') == 'new'
-        ]
+        Without ``wait``, only the results finished so far are merged.
+        Files that failed ``QUEUE.max_attempts`` times stay in the queue
+        (see ``queue-status``) and are queued again by the next run.
+        """
+        self.logger.info("Starting coordinated integration...")
+        self.begin_run()
+        coordinator = default_worker_id()
+        success = False
+        integrated = 0
+        try:
+            if wait:
+                queue.heartbeat(coordinator)
+            queued = self.enqueue_work(queue)
+            self.logger.info(f"Queued {queued} files in {queue.path}")
+            while True:
+                if wait:
+                    queue.heartbeat(coordinator)
+                merged = self.collect_results(queue)
+                integrated += merged
+                if not wait or not (queue.outstanding() or queue.counts()['unmerged']):
+                    break
+                if not merged:
+                    time.sleep(float(self.queue_settings.get('poll_interval', 2.0)))
+            
+            if wait:
+                queue.purge_merged()
+            with self.metrics.stage('citations'):
+                self.refresh_citations()
+            with self.metrics.stage('report'):
+                written = self.generate_integration_report()
+            if written:
+                self.logger.info(f"Reported {written} changed sources in {self.report.path}")
+            failures = queue.failures()
+            if failures:
+                self.logger.warning(f"{len(failures)} files failed in every attempt (python source_manager.py queue-status)")
+            success = True
+        finally:
+            queue.release(coordinator)
+            self.finish_run(success)
+        return integrated
+    
+    def refresh_citations(self) -> int:
+        """Bring the citation graph up to date with docs/; returns documents rescanned
+        
+        The first time, every record is mirrored into the graph; after that
+        records are mirrored as they are committed.
+        """
+        if not self.citations.synced:
+            self.citations.update_sources(self.source_db['sources'].values())
+            self.citations.mark_synced()
+            self.citations.commit()
+        rescanned = self.citations.refresh()
+        if rescanned:
+            self.logger.info(f"Citation graph: rescanned {rescanned} document(s)")
+        return rescanned
+    
+    def search(self, query: str, limit: int = 10, scope: str = 'sections') -> List[Dict]:
+        """Ranked BM25 hits for a query; scope is 'sections' or 'sources'"""
+        return self.search_index.search(query, limit=limit, scope=scope)
+    
+    def transition(self, path: str, status: str, note: str = '') -> Dict:
+        """Move a source forward in its status lifecycle
+        
+        Statuses only advance (``new`` -> ``reviewed`` -> ``integrated`` ->
+        ``archived``, skipping steps is allowed); a source whose file
+        changes is re-ingested as ``new``. The change is recorded in the
+        record's ``status_history`` and queued for the next report. The
+        caller commits, as ``transition_sources`` does.
+        """
+        if status not in STATUSES:
+            raise ValueError(f"Unknown status '{status}' (expected one of {', '.join(STATUSES)})")
+        record = self.source_db['sources'].get(path)
+        if record is None:
+            raise KeyError(f"No source recorded for {path}")
+        current = record.get('status', 'new')
+        if current in STATUSES and STATUSES.index(status) <= STATUSES.index(current):
+            raise ValueError(f"{path} is '{current}' and cannot move back to '{status}'")
+        
+        now = datetime.now().isoformat()
+        record['status'] = status
+        record['status_changed'] = now
+        change = {'status': status, 'date': now}
+        if note:
+            change['note'] = note
+        record.setdefault('status_history', []).append(change)
+        self._mark_dirty(path, record)
+        self.report.record(self._summarize(record))
+        return record
+    
+    def transition_sources(self, paths: Iterable[str], status: str, note: str = '') -> int:
+        """Move several sources to a status and commit; returns how many moved"""
+        moved = 0
+        for path in paths:
+            try:
+                self.transition(path, status, note)
+                moved += 1
+            except (KeyError, ValueError) as e:
+                self.logger.warning(e.args[0] if e.args else str(e))
+        self._commit_batch()
+        return moved
+    
+    def iter_sources_by_status(self, status: str) -> Iterator[Dict]:
+        """Records with a status, one at a time (indexed in SQLite)"""
+        if isinstance(self.store, SqliteSourceStore):
+            for _, record in self.store.iter_records("WHERE status = ?", (status,)):
+                yield record
+        else:
+            for record in self.source_db['sources'].values():
+                if record.get('status', 'new') == status:
+                    yield record
+    
+    def status_counts(self) -> Dict[str, int]:
+        """Number of sources per status"""
+        if isinstance(self.store, SqliteSourceStore):
+            return self.store.status_counts()
+        counts = {}
+        for record in self.source_db['sources'].values():
+            status = record.get('status', 'new')
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+    
+    def new_source_summaries(self) -> List[Dict]:
+        """Summaries of the sources still marked 'new'"""
+        return [self._summarize(record) for record in self.iter_sources_by_status('new')]
+    
+    def generate_integration_report(self) -> int:
+        """Append a report section for sources changed since the last report
         
-        if not recent_sources:
-            report.append("No new sources to integrate.\n")
-            return "\n".join(report)
+        Returns the number of sources listed; nothing is written when no
+        source was ingested, removed or moved to another status.
+        """
+        return self.report.publish(
+            f"Integration Run - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            render_report_entry
+        )
+    
+    def write_session_manifest(self, new_sources: List[Dict]) -> bool:
+        """Snapshot inputs and database so an unchanged next session start is instant
         
-        report.append("## Recently Integrated Sources\n")
+        Skipped (and any old manifest removed) unless every input file has a
+        settled fingerprint, since a file modified during this run could
+        change again without its stat changing.
+        """
+        manifest_path = Path(self.config.get('STATE_DIR', '.superlead')) / 'session_manifest.json'
+        input_dir = self.config['INPUT_DIR']
+        settings = filter_settings(self.config, SOURCE_CATEGORIES)
+        files = scan_inputs(input_dir, settings)
+        for key, fingerprint in files.items():
+            cached = self.fingerprints.get(self._relative_path(Path(input_dir) / key))
+            if not cached or cached[:4] != fingerprint:
+                remove_manifest(manifest_path)
+                return False
         
-        for source in recent_sources:
-            report.append(f"### {source['title']}")
-            report.append(f"- **Category:** {source['category']}")
-            report.append(f"- **Relevance:** {source.get('relevance', {}).get('level', 'unknown')}")
-            report.append(f"- **Keywords:** {', '.join(source.get('relevance', {}).get('matches', []))}")
-            report.append(f"- **Suggested Sections:** {', '.join(source.get('relevance', {}).get('recommended_sections', []))}")
-            report.append(f"- **Summary:** {source.get('summary', '')[:200]}...")
-            report.append("")
+        self.store.checkpoint()
+        write_manifest(manifest_path, self.config_file, input_dir, settings, files,
+                       self.store.data_files(), new_sources)
+        return True
+    
+    def begin_run(self):
+        """Start measuring an ingestion run (and profiling it when enabled)"""
+        self.metrics.reset()
+        if self.profile:
+            state_dir = Path(self.config.get('STATE_DIR', '.superlead'))
+            self._profiler = RunProfiler(self.metrics_settings.get('profile_path') or state_dir / 'profile.pstats')
+            self._profiler.start()
+    
+    def finish_run(self, success: bool = True):
+        """Stop measuring a run, evict page caches it made obsolete and write its metrics files"""
+        if success:
+            self.evict_pdf_pages()
+        self.metrics.finish(success)
+        if self._profiler:
+            path = self._profiler.stop()
+            self._profiler = None
+            self.logger.info(f"Profile saved to {path} (python -m pstats {path})")
         
-        return "\n".join(report)
+        state_dir = Path(self.config.get('STATE_DIR', '.superlead'))
+        try:
+            self.metrics.write_json(self.metrics_settings.get('path') or state_dir / 'metrics.json')
+            textfile = self.metrics_settings.get('prometheus_textfile')
+            if textfile:
+                self.metrics.write_prometheus(textfile)
+        except OSError as e:
+            self.logger.warning(f"Could not write run metrics: {e}")
+        
+        counters = self.metrics.counters
+        self.logger.info(
+            f"Run took {self.metrics.duration:.2f}s: {counters.get('files_seen', 0)} seen, "
+            f"{counters.get('files_skipped', 0)} skipped, {counters.get('files_processed', 0)} processed, "
+            f"{counters.get('bytes_hashed', 0)} bytes hashed"
+        )
     
-    def run_integration_cycle(self):
-        """Run a complete integration cycle"""
+    def run_integration_cycle(self) -> List[Dict]:
+        """Run a complete integration cycle; returns summaries of the ingested sources"""
         self.logger.info("Starting source integration cycle...")
+        self.begin_run()
+        success = False
         
-        # Scan for new sources
-        new_sources = self.scan_input_directory()
-        
-        if new_sources:
-            self.logger.info(f"Found {len(new_sources)} new sources")
-            self.integrate_sources(new_sources)
-            
-            # Generate integration report
-            report = self.generate_integration_report()
+        try:
+            # Stream new and changed sources through the pipeline
+            summaries = list(self.ingest())
             
-            # Save report
-            with open("integration_report.md", 'w') as f:
-                f.write(report)
+            if summaries:
+                self.logger.info(f"Integrated {len(summaries)} new sources")
+            else:
+                self.logger.info("No new sources found")
             
-            self.logger.info("Integration cycle completed successfully")
+            # Report whatever changed since the last report
+            with self.metrics.stage('report'):
+                written = self.generate_integration_report()
+            if written:
+                self.logger.info(f"Reported {written} changed sources in {self.report.path}")
+            success = True
+        finally:
+            self.finish_run(success)
+        return summaries
+
+
+def render_report_entry(entry: Dict) -> str:
+    """Markdown for one changed source in the integration report"""
+    lines = [f"### {entry.get('title', entry.get('file_path'))}",
+             f"- **Status:** {entry.get('status', 'new')} ({entry.get('status_changed', '')})",
+             f"- **File:** {entry.get('file_path')}"]
+    if entry.get('status') == 'new':
+        relevance = entry.get('relevance', {})
+        lines.append(f"- **Category:** {entry.get('category')}")
+        lines.append(f"- **Relevance:** {relevance.get('level', 'unknown')}")
+        lines.append(f"- **Keywords:** {', '.join(relevance.get('matches', []))}")
+        lines.append(f"- **Suggested Sections:** {', '.join(relevance.get('recommended_sections', []))}")
+        if entry.get('near_duplicates'):
+            lines.append(f"- **Possible Duplicate Of:** {format_near_duplicates(entry)}")
+        lines.append(f"- **Summary:** {entry.get('summary', '')}...")
+    return "\n".join(lines) + "\n\n"
+
+
+def parse_args(argv=None):
+    """Parse command line options for the integration system"""
+    parser = argparse.ArgumentParser(description="Integrate research sources into documentation")
+    parser.add_argument('--verify', action='store_true',
+                        help="rehash every file instead of trusting cached stat fingerprints")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for hashing and extraction (0 = one per CPU, default from config)")
+    parser.add_argument('--profile', action='store_true',
+                        help="profile the run with cProfile (saved under STATE_DIR/profile.pstats)")
+    
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('run', help="run an integration cycle (default)")
+    import_cmd = commands.add_parser('import-json', help="load a source_database.json file into SQLite")
+    import_cmd.add_argument('path', nargs='?', default='source_database.json')
+    export_cmd = commands.add_parser('export-json', help="write the SQLite database as source_database.json")
+    export_cmd.add_argument('path', nargs='?', default='source_database.json')
+    commands.add_parser('externalize-bodies', help="move inline record bodies into the blob store")
+    search_cmd = commands.add_parser('search', help="rank ingested sources and sections for a query")
+    search_cmd.add_argument('query')
+    search_cmd.add_argument('--limit', type=int, default=10)
+    search_cmd.add_argument('--scope', choices=['sections', 'sources'], default='sections')
+    commands.add_parser('reindex', help="rebuild the search index from the database")
+    reprocess_cmd = commands.add_parser('reprocess', help="redo extraction and scoring made by older versions")
+    reprocess_cmd.add_argument('paths', nargs='*', help="only these sources (default: all)")
+    reprocess_cmd.add_argument('--all', action='store_true', help="re-extract every selected source, stale or not")
+    reprocess_cmd.add_argument('--dry-run', action='store_true', help="count the stale sources and exit")
+    watch_cmd = commands.add_parser('watch', help="keep ingesting files as they land in the input directory")
+    watch_cmd.add_argument('--poll', action='store_true', help="poll instead of using inotify")
+    mark_cmd = commands.add_parser('mark', help="move sources to a later status")
+    mark_cmd.add_argument('status', choices=STATUSES[1:])
+    mark_cmd.add_argument('paths', nargs='*', help="source paths as recorded (input/papers/...)")
+    mark_cmd.add_argument('--all-new', action='store_true', help="every source still marked new")
+    mark_cmd.add_argument('--note', default='', help="reason recorded in the status history")
+    status_cmd = commands.add_parser('status', help="count sources per status, or list one status")
+    status_cmd.add_argument('status', nargs='?', choices=STATUSES)
+    coordinate_cmd = commands.add_parser('coordinate', help="queue changed files for workers and merge their results")
+    coordinate_cmd.add_argument('--queue', default=None, help="work queue file (default QUEUE.path)")
+    coordinate_cmd.add_argument('--no-wait', action='store_true', help="merge the results finished so far and exit")
+    work_cmd = commands.add_parser('work', help="extract queued files until the queue is empty")
+    work_cmd.add_argument('--queue', default=None, help="work queue file (default QUEUE.path)")
+    work_cmd.add_argument('--worker-id', default=None, help="name in the queue (default host:pid)")
+    work_cmd.add_argument('--wait', action='store_true',
+                          help="stay until the coordinator finishes, taking over expired leases")
+    queue_cmd = commands.add_parser('queue-status', help="count work queue tasks per state and list failures")
+    queue_cmd.add_argument('--queue', default=None, help="work queue file (default QUEUE.path)")
+    citations_cmd = commands.add_parser('citations', help="show which sources the documentation cites")
+    citations_cmd.add_argument('paths', nargs='*', help="list the sections citing these sources")
+    citations_cmd.add_argument('--uncited', nargs='*', metavar='LEVEL', default=None,
+                               help="sources of these relevance levels no section cites (default: high)")
+    citations_cmd.add_argument('--orphans', action='store_true',
+                               help="citations of removed sources or of paths never ingested")
+    return parser.parse_args(argv)
+
+
+def run_database_command(args, config_file: str = "config.yaml"):
+    """Migrate between source_database.json and the SQLite backend"""
+    with open(config_file, 'r') as f:
+        config = yaml.safe_load(f)
+    sqlite_path = (config.get('DATABASE') or {}).get('sqlite_path', 'source_database.sqlite3')
+    store = SqliteSourceStore(sqlite_path)
+    try:
+        if args.command == 'import-json':
+            count = store.import_json(args.path)
+            print(f"Imported {count} sources from {args.path} into {sqlite_path}")
         else:
-            self.logger.info("No new sources found")
+            count = store.export_json(args.path)
+            print(f"Exported {count} sources from {sqlite_path} to {args.path}")
+    finally:
+        store.close()
 
 
 if __name__ == "__main__":
-    # Run integration system
-    manager = SourceManager()
-    manager.run_integration_cycle()
\ No newline at end of file
+    args = parse_args()
+    if args.command in ('import-json', 'export-json'):
+        run_database_command(args)
+    elif args.command == 'externalize-bodies':
+        manager = SourceManager()
+        print(f"Moved {manager.externalize_bodies()} record bodies into the blob store")
+    elif args.command == 'search':
+        manager = SourceManager()
+        for hit in manager.search(args.query, limit=args.limit, scope=args.scope):
+            print(f"{hit['score']:8.3f}  {hit['target']}")
+    elif args.command == 'reindex':
+        manager = SourceManager()
+        print(f"Indexed {manager.rebuild_search_index()} sources")
+    elif args.command == 'reprocess':
+        manager = SourceManager(workers=args.workers, profile=args.profile)
+        counts = manager.reprocess(args.paths or None, force=args.all, dry_run=args.dry_run)
+        by_extractor = ', '.join(f"{name}: {count}" for name, count in sorted(counts['extractors'].items()))
+        if args.dry_run:
+            print(f"{counts['extracted']} sources to re-extract ({by_extractor or 'none'}), "
+                  f"{counts['rescored']} to re-score, {counts['missing']} missing")
+        else:
+            print(f"Re-extracted {counts['extracted']} sources ({by_extractor or 'none'}), "
+                  f"re-scored {counts['rescored']}, {counts['changed']} changed on disk, "
+                  f"{counts['missing']} missing, {counts['failed']} failed")
+    elif args.command == 'mark':
+        manager = SourceManager()
+        paths = list(args.paths)
+        if args.all_new:
+            paths += [record['file_path'] for record in manager.iter_sources_by_status('new')]
+        moved = manager.transition_sources(paths, args.status, args.note)
+        print(f"Marked {moved} of {len(paths)} sources as {args.status}")
+    elif args.command == 'status':
+        manager = SourceManager()
+        if args.status:
+            for record in manager.iter_sources_by_status(args.status):
+                print(f"{record.get('status_changed', '')[:19]}  {record['file_path']}")
+        else:
+            counts = manager.status_counts()
+            for status in STATUSES + sorted(set(counts) - set(STATUSES)):
+                print(f"{status:<12}{counts.get(status, 0):>8}")
+    elif args.command == 'coordinate':
+        manager = SourceManager(verify=args.verify, workers=args.workers, profile=args.profile)
+        print(f"Integrated {manager.coordinate(manager.open_work_queue(args.queue), wait=not args.no_wait)} sources")
+    elif args.command == 'work':
+        manager = SourceManager(workers=args.workers)
+        completed = manager.work(manager.open_work_queue(args.queue), args.worker_id, wait=args.wait)
+        print(f"Completed {completed} files")
+    elif args.command == 'queue-status':
+        manager = SourceManager()
+        queue = manager.open_work_queue(args.queue)
+        for state, count in queue.counts().items():
+            print(f"{state:<12}{count:>8}")
+        for failure in queue.failures():
+            print(f"failed after {failure['attempts']}: {failure['path']}: {failure['error']}")
+    elif args.command == 'citations':
+        manager = SourceManager()
+        manager.refresh_citations()
+        for path, targets in manager.citations.citations_of(args.paths).items():
+            print(path)
+            for target in targets:
+                print(f"  {target}")
+        if args.uncited is not None:
+            for source in manager.citations.uncited(args.uncited or ['high']):
+                print(f"{source['level']:<8}{source['status']:<12}{source['file_path']}")
+        if args.orphans:
+            for citation in manager.citations.orphaned():
+                print(f"{citation['target']}  {citation['key']}")
+    elif args.command == 'watch':
+        from watcher import SourceWatcher
+        manager = SourceManager(verify=args.verify, workers=args.workers, profile=args.profile)
+        manager.run_integration_cycle()
+        settings = manager.config.get('WATCH', {}) or {}
+        SourceWatcher(
+            manager,
+            debounce_seconds=settings.get('debounce_seconds', 0.25),
+            stable_seconds=settings.get('stable_seconds', 0.5),
+            poll_interval=settings.get('poll_interval', 1.0),
+            force_polling=args.poll
+        ).run()
+    else:
+        # Run integration system
+        manager = SourceManager(verify=args.verify, workers=args.workers, profile=args.profile)
+        manager.run_integration_cycle()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Read-Once Source Buffers
+Maps an input file once so hashing, extraction and archiving share the same bytes
+"""
+
+import io
+import mmap
+import hashlib
+import contextlib
+from typing import Iterator
+
+# Hashing by path reads in pieces this large; 4 KiB reads mean thousands of
+# round trips per file on a network mount
+HASH_CHUNK_SIZE = 1024 * 1024
+READ_MODES = ('mmap', 'buffer')
+
+
+@contextlib.contextmanager
+def open_source(file_path, mode: str = 'mmap') -> Iterator[memoryview]:
+    """A read-only view of a whole file, valid inside the block
+
+    ``mmap`` maps the file, so every consumer reads the same page-cache
+    pages without copying them; ``buffer`` reads the file with one read()
+    instead, for filesystems that cannot be mapped or where a file being
+    truncated while mapped (SIGBUS) is a concern. Empty files cannot be
+    mapped and always use a buffer. Consumers must not keep the view, or
+    slices of it, past the block.
+    """
+    with open(file_path, 'rb') as f:
+        mapped = None
+        if mode == 'mmap':
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                mapped = None
+        if mapped is not None and hasattr(mapped, 'madvise'):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        view = memoryview(mapped if mapped is not None else f.read())
+        try:
+            yield view
+        finally:
+            view.release()
+            if mapped is not None:
+                mapped.close()
+
+
+def hash_buffer(data) -> str:
+    """SHA-256 of a bytes-like object"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class BufferStream(io.RawIOBase):
+    """Seekable binary stream over a bytes-like object, without copying it"""
+
+    def __init__(self, data):
+        self._view = memoryview(data)
+        self._position = 0
+
+    def readable(self) -> bool:
+        """Always readable"""
+        return True
+
+    def seekable(self) -> bool:
+        """Always seekable"""
+        return True
+
+    def readinto(self, buffer) -> int:
+        """Copy the next bytes into a caller's buffer"""
+        chunk = self._view[self._position:self._position + len(buffer)]
+        size = len(chunk)
+        memoryview(buffer).cast('B')[:size] = chunk
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move the read position"""
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(offset, 0)
+        return self._position
+
+    def tell(self) -> int:
+        """Current read position"""
+        return self._position
+
+    def close(self):
+        """Release the view so the underlying mapping can be closed"""
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def binary_stream(data) -> io.BufferedReader:
+    """Buffered binary file object reading a bytes-like object"""
+    return io.BufferedReader(BufferStream(data))
+
+
+def text_stream(data, errors: str = 'strict', newline=None) -> io.TextIOWrapper:
+    """UTF-8 text file object reading a bytes-like object, like open(path, 'r')"""
+    return io.TextIOWrapper(binary_stream(data), encoding='utf-8', errors=errors, newline=newline)
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Compact Source Records
+Slotted in-memory source records with interned values and a positional encoding
+"""
+
+import sys
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Optional
+
+
+def _interned(value):
+    """The shared copy of a string; other values unchanged"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _interned_tuple(values):
+    """A list of strings as a tuple of shared copies; other values unchanged"""
+    if isinstance(values, (list, tuple)):
+        return tuple(_interned(value) for value in values)
+    return values
+
+
+def _float_tuple(values):
+    """A list as a tuple; other values unchanged"""
+    return tuple(values) if isinstance(values, list) else values
+
+
+def _interned_keys(values):
+    """A dict with shared copies of its string keys; other values unchanged"""
+    if isinstance(values, dict):
+        return {_interned(key): value for key, value in values.items()}
+    return values
+
+
+class CompactMapping(MutableMapping):
+    """Dict-style access to a slotted object
+
+    Keys in ``FIELDS`` are slots; any other key is kept in the ``extra``
+    dict, so records with fields this class does not know about round-trip
+    unchanged. Assigned values go through ``NORMALIZE`` (interning, tuples,
+    nested compact mappings). ``encode`` writes the positional form used by
+    the source stores: a bitmask of the fields present, their values in
+    ``FIELDS`` order with ``CODES`` values as their index, then the extra
+    fields if any.
+    """
+
+    __slots__ = ('extra',)
+    FIELDS = ()
+    CODES = {}
+    NORMALIZE = {}
+    _field_set = frozenset()
+    _code_index = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.FIELDS)
+        cls._code_index = {field: {value: code for code, value in enumerate(values)}
+                           for field, values in cls.CODES.items()}
+
+    def __init__(self, fields=None):
+        self.extra = None
+        if fields:
+            self.update(fields)
+
+    @classmethod
+    def coerce(cls, value):
+        """An instance from a mapping or an encoded list; anything else unchanged"""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, Mapping):
+            return cls(value)
+        if isinstance(value, list):
+            return cls.decode(value)
+        return value
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def __setitem__(self, key, value):
+        if key in self._field_set:
+            normalize = self.NORMALIZE.get(key)
+            setattr(self, key, normalize(value) if normalize else value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[_interned(key)] = value
+
+    def __delitem__(self, key):
+        if key in self._field_set:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self.extra is not None and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        if key in self._field_set:
+            return hasattr(self, key)
+        return self.extra is not None and key in self.extra
+
+    def __iter__(self):
+        for name in self.FIELDS:
+            if hasattr(self, name):
+                yield name
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for name in self.FIELDS if hasattr(self, name)) + len(self.extra or ())
+
+    def get(self, key, default=None):
+        if key in self._field_set:
+            return getattr(self, key, default)
+        if self.extra is None:
+            return default
+        return self.extra.get(key, default)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict:
+        """Plain dict with lists, as records were stored before this model"""
+        return {key: plain_value(value) for key, value in self.items()}
+
+    def encode(self, replace: Optional[Dict] = None) -> list:
+        """Positional form of the record; ``replace`` substitutes values for some fields"""
+        encoded = [0]
+        mask = 0
+        for bit, name in enumerate(self.FIELDS):
+            if replace and name in replace:
+                value = replace[name]
+            else:
+                try:
+                    value = getattr(self, name)
+                except AttributeError:
+                    continue
+            mask |= 1 << bit
+            codes = self._code_index.get(name)
+            if codes and type(value) is str and value in codes:
+                encoded.append(codes[value])
+            else:
+                encoded.append(encode_value(value))
+        encoded[0] = mask
+        if self.extra:
+            encoded.append(self.extra)
+        return encoded
+
+    @classmethod
+    def decode(cls, encoded):
+        """Rebuild an instance from ``encode`` output, or from a plain dict of an older version"""
+        if isinstance(encoded, Mapping):
+            return cls(encoded)
+        instance = cls()
+        mask = encoded[0]
+        position = 1
+        for bit, name in enumerate(cls.FIELDS):
+            if not mask >> bit & 1:
+                continue
+            value = encoded[position]
+            position += 1
+            if type(value) is int and name in cls.CODES:
+                value = cls.CODES[name][value]
+            instance[name] = value
+        if position < len(encoded):
+            instance.extra = _interned_keys(encoded[position])
+        return instance
+
+
+def plain_value(value):
+    """JSON-ready form of a record value: compact mappings as dicts, tuples as lists"""
+    if isinstance(value, CompactMapping):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [plain_value(item) for item in value]
+    return value
+
+
+def encode_value(value):
+    """Encoded form of a value nested in a compact mapping"""
+    if isinstance(value, CompactMapping):
+        return value.encode()
+    if isinstance(value, tuple):
+        return [encode_value(item) for item in value]
+    return value
+
+
+def json_default(value):
+    """``default`` hook for json.dump: compact mappings as dicts, anything else as a string"""
+    if isinstance(value, CompactMapping):
+        return value.to_dict()
+    return str(value)
+
+
+class Section(CompactMapping):
+    """One markdown heading section: title, anchor, nesting and byte offsets"""
+
+    FIELDS = ('title', 'anchor', 'level', 'parent', 'start', 'body_start', 'content_end', 'end')
+    __slots__ = FIELDS
+    NORMALIZE = {'anchor': _interned}
+
+
+def _sections(value):
+    """Sections as a tuple of Section (or of names); the legacy anchor -> text dict is kept"""
+    if isinstance(value, dict) or not isinstance(value, (list, tuple)):
+        return value
+    return tuple(Section.coerce(item) if isinstance(item, (Mapping, list)) else _interned(item)
+                 for item in value)
+
+
+class Relevance(CompactMapping):
+    """Relevance of a source: keyword score and level, matches and recommended sections"""
+
+    FIELDS = ('score', 'level', 'matches', 'term_frequencies', 'recommended_sections',
+              'section_scores', 'version')
+    __slots__ = FIELDS
+    CODES = {'level': ('low', 'medium', 'high')}
+    NORMALIZE = {
+        'level': _interned,
+        'matches': _interned_tuple,
+        'term_frequencies': _interned_keys,
+        'recommended_sections': _interned_tuple,
+        'section_scores': _float_tuple,
+    }
+
+
+class SourceRecord(CompactMapping):
+    """One source in the database
+
+    Category, status, extractor and the other small vocabularies are
+    interned and stored as codes; tags, sections and relevance lists are
+    tuples. Codes are positions in ``CODES``, so new values are only ever
+    appended; a value not listed is stored as a string.
+    """
+
+    FIELDS = ('file_path', 'category', 'hash', 'added_date', 'status', 'status_changed', 'title',
+              'author', 'date', 'tags', 'priority', 'type', 'summary', 'line_count', 'word_count',
+              'record_count', 'sections', 'extractor', 'extractor_version', 'near_duplicates',
+              'relevance', 'archived_path', 'status_history')
+    __slots__ = FIELDS
+    CODES = {
+        'category': ('papers', 'briefings', 'data', 'references'),
+        'status': ('new', 'reviewed', 'integrated', 'archived'),
+        'priority': ('low', 'medium', 'high'),
+        'extractor': ('markdown', 'structured', 'csv', 'text', 'pdf'),
+    }
+    NORMALIZE = {
+        'category': _interned,
+        'status': _interned,
+        'priority': _interned,
+        'type': _interned,
+        'extractor': _interned,
+        'tags': _interned_tuple,
+        'sections': _sections,
+        'relevance': Relevance.coerce,
+    }
+
+
+def encode_record(record: Mapping, replace: Optional[Dict] = None) -> list:
+    """Compact encoding of a record, whether a SourceRecord or a plain dict"""
+    if not isinstance(record, SourceRecord):
+        record = SourceRecord(record)
+    return record.encode(replace)
+
+
+def decode_record(encoded) -> SourceRecord:
+    """SourceRecord from its compact encoding or a plain dict"""
+    return SourceRecord.decode(encoded)
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Source Database Storage Backends
+Persists the source tracking database as a JSON document or in SQLite
+"""
+
+import os
+import json
+import sqlite3
+from collections.abc import Mapping, MutableMapping
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from source_record import decode_record, encode_record, encode_value, json_default
+
+
+def _encode(value) -> str:
+    """Serialize a record value; front matter may contain dates"""
+    return json.dumps(value, default=json_default)
+
+
+def atomic_write_json(path, data, **dump_kwargs):
+    """Write JSON through a temp file, fsync and rename
+
+    A crash at any point leaves either the old file or the new one, never a
+    truncated mix of both. The temp file is per process, so processes
+    sharing a state directory (queue workers) cannot rename each other's.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, default=json_default, **dump_kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(path.parent)
+
+
+def atomic_write_text(path, chunks: Iterable[str]):
+    """Write text chunks through a temp file, fsync and rename, as atomic_write_json does"""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        for chunk in chunks:
+            f.write(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(path.parent)
+
+
+def _fsync_directory(directory: Path):
+    """Persist a rename; not supported on Windows, where it is skipped"""
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class JsonSourceStore:
+    """Keeps the database as a JSON snapshot plus an append-only journal
+
+    Each save appends record-level upserts and deletes to the journal, so
+    its cost follows the size of the change. Once the journal grows past
+    ``journal_max_bytes`` or ``journal_max_ratio`` times the snapshot size,
+    it is compacted into a fresh snapshot. Records are written in the
+    compact SourceRecord encoding; plain records from older versions are
+    read as well.
+    """
+
+    def __init__(self, path: str = "source_database.json",
+                 journal_max_bytes: int = 4 * 1024 * 1024, journal_max_ratio: float = 0.5):
+        self.path = Path(path)
+        self.journal_path = Path(f"{path}.journal")
+        self.journal_max_bytes = journal_max_bytes
+        self.journal_max_ratio = journal_max_ratio
+
+    def load(self) -> Dict:
+        """Load the snapshot and replay the journal on top of it"""
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                source_db = json.load(f)
+            source_db['sources'] = {path: decode_record(record)
+                                    for path, record in source_db.get('sources', {}).items()}
+        else:
+            source_db = {"sources": {}, "last_update": None}
+
+        if self.journal_path.exists():
+            with open(self.journal_path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn final line from a crash mid-append
+                        break
+                    self._apply(source_db, entry)
+        return source_db
+
+    @staticmethod
+    def _apply(source_db: Dict, entry: Dict):
+        """Replay one journal entry"""
+        if entry['op'] == 'upsert':
+            source_db['sources'][entry['path']] = decode_record(entry['record'])
+        elif entry['op'] == 'delete':
+            source_db['sources'].pop(entry['path'], None)
+        elif entry['op'] == 'meta':
+            source_db['last_update'] = entry['last_update']
+
+    def save(self, source_db: Dict, changed: Iterable[str] = (), deleted: Iterable[str] = ()):
+        """Append the changed records to the journal, compacting when it is large"""
+        sources = source_db['sources']
+        lines = [_encode({'op': 'delete', 'path': path}) for path in deleted]
+        lines += [
+            _encode({'op': 'upsert', 'path': path, 'record': encode_record(sources[path])})
+            for path in changed if path in sources
+        ]
+        lines.append(_encode({'op': 'meta', 'last_update': source_db.get('last_update')}))
+
+        self._repair_journal()
+        with open(self.journal_path, 'a') as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        if self._needs_compaction():
+            self.compact(source_db)
+
+    def _repair_journal(self):
+        """Cut off a torn final line so new entries start on a clean line"""
+        if not self.journal_path.exists():
+            return
+        with open(self.journal_path, 'rb+') as f:
+            end = f.seek(0, os.SEEK_END)
+            pos = end
+            while pos > 0:
+                step = min(65536, pos)
+                f.seek(pos - step)
+                chunk = f.read(step)
+                newline = chunk.rfind(b"\n")
+                if newline != -1:
+                    pos = pos - step + newline + 1
+                    break
+                pos -= step
+            if pos != end:
+                f.truncate(pos)
+
+    def _needs_compaction(self) -> bool:
+        """Check the journal against the size and ratio thresholds"""
+        journal_size = self.journal_path.stat().st_size
+        snapshot_size = self.path.stat().st_size if self.path.exists() else 0
+        return (journal_size > self.journal_max_bytes
+                or journal_size > snapshot_size * self.journal_max_ratio)
+
+    def compact(self, source_db: Dict, plain: bool = False):
+        """Write a full snapshot atomically and start a new journal
+
+        ``plain`` writes records as ordinary JSON objects, for export.
+        """
+        snapshot = dict(source_db, sources={
+            path: record if plain else encode_record(record) for path, record in source_db['sources'].items()
+        })
+        atomic_write_json(self.path, snapshot, indent=2 if plain else None)
+        # Replaying the old journal over the new snapshot is harmless, so a
+        # crash before this point loses nothing
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+
+    def data_files(self) -> List[Path]:
+        """Files whose size and mtime change whenever the database does"""
+        return [self.path, self.journal_path]
+
+    def checkpoint(self):
+        """Nothing to fold in: every save is already in the snapshot or journal"""
+
+    def close(self):
+        """Release resources held by the store"""
+
+
+def _section_anchor(item) -> str:
+    """Anchor of a section entry stored as a name or a metadata dict"""
+    return item.get('anchor', '') if isinstance(item, Mapping) else str(item)
+
+
+class SqliteSourceMap(MutableMapping):
+    """Read-through view of the sources table
+
+    Records are fetched one at a time as they are accessed, so looking up a
+    handful of paths does not load the whole corpus. Assignments and
+    deletions are kept in memory until the store saves them.
+    """
+
+    def __init__(self, store: 'SqliteSourceStore'):
+        self._store = store
+        self._cache = {}
+        self._deleted = set()
+
+    def __getitem__(self, path: str) -> Dict:
+        if path in self._deleted:
+            raise KeyError(path)
+        if path not in self._cache:
+            record = self._store.get(path)
+            if record is None:
+                raise KeyError(path)
+            self._cache[path] = record
+        return self._cache[path]
+
+    def __setitem__(self, path: str, record: Dict):
+        self._deleted.discard(path)
+        self._cache[path] = record
+
+    def __delitem__(self, path: str):
+        if path not in self:
+            raise KeyError(path)
+        self._cache.pop(path, None)
+        self._deleted.add(path)
+
+    def __contains__(self, path) -> bool:
+        if path in self._deleted:
+            return False
+        return path in self._cache or self._store.has(path)
+
+    def __iter__(self):
+        seen = set()
+        for path in self._store.paths():
+            if path not in self._deleted:
+                seen.add(path)
+                yield path
+        for path in list(self._cache):
+            if path not in seen:
+                yield path
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def values(self):
+        # Stream unseen records straight from the table instead of one query per key
+        for path, record in self._store.iter_records():
+            if path in self._deleted:
+                continue
+            yield self._cache.get(path, record)
+        for path in list(self._cache):
+            if not self._store.has(path):
+                yield self._cache[path]
+
+    def committed(self):
+        """Forget pending deletions and release cached records once they are persisted
+
+        Dropping the cache is what keeps a long ingestion at flat memory:
+        committed records are read back from the table on their next access.
+        A record held across a commit is detached from the map and has to be
+        assigned again for later changes to be saved.
+        """
+        self._deleted.clear()
+        self._cache.clear()
+
+
+class SqliteSourceStore:
+    """Keeps sources, relevance and sections in an SQLite database (WAL mode)
+
+    Records, relevance and sections are stored in the compact SourceRecord
+    encoding; rows written as plain JSON objects by older versions are
+    read as well.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS sources (
+            path TEXT PRIMARY KEY,
+            category TEXT,
+            status TEXT,
+            hash TEXT,
+            title TEXT,
+            added_date TEXT,
+            record TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS relevance (
+            path TEXT PRIMARY KEY REFERENCES sources(path) ON DELETE CASCADE,
+            score INTEGER,
+            level TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS sections (
+            path TEXT NOT NULL REFERENCES sources(path) ON DELETE CASCADE,
+            ordinal INTEGER NOT NULL,
+            anchor TEXT NOT NULL,
+            body TEXT,
+            PRIMARY KEY (path, ordinal)
+        );
+        CREATE INDEX IF NOT EXISTS idx_sources_category ON sources(category);
+        CREATE INDEX IF NOT EXISTS idx_sources_status ON sources(status);
+        CREATE INDEX IF NOT EXISTS idx_sources_hash ON sources(hash);
+        CREATE INDEX IF NOT EXISTS idx_relevance_level ON relevance(level);
+    """
+
+    def __init__(self, path: str = "source_database.sqlite3"):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(self.SCHEMA)
+
+    def load(self) -> Dict:
+        """Open the database without reading any records up front"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'last_update'").fetchone()
+        return {
+            "sources": SqliteSourceMap(self),
+            "last_update": json.loads(row[0]) if row else None
+        }
+
+    def is_empty(self) -> bool:
+        """True when no records or metadata have been stored yet"""
+        return (self.conn.execute("SELECT 1 FROM sources LIMIT 1").fetchone() is None
+                and self.conn.execute("SELECT 1 FROM meta LIMIT 1").fetchone() is None)
+
+    def has(self, path: str) -> bool:
+        """Check whether a record exists"""
+        return self.conn.execute("SELECT 1 FROM sources WHERE path = ?", (path,)).fetchone() is not None
+
+    def paths(self) -> List[str]:
+        """All record keys in insertion order"""
+        return [row[0] for row in self.conn.execute("SELECT path FROM sources ORDER BY rowid")]
+
+    def get(self, path: str) -> Optional[Dict]:
+        """Fetch and reassemble a single record"""
+        row = self.conn.execute("SELECT path, record FROM sources WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return None
+        return self._assemble(*row)
+
+    def iter_records(self, where: str = "", params: tuple = ()):
+        """Yield (path, record) pairs in insertion order"""
+        rows = self.conn.execute(
+            f"SELECT path, record FROM sources {where} ORDER BY rowid", params
+        ).fetchall()
+        for path, record in rows:
+            yield path, self._assemble(path, record)
+
+    def status_counts(self) -> Dict[str, int]:
+        """Number of records per status, from the status index"""
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM sources GROUP BY status"))
+
+    def data_files(self) -> List[Path]:
+        """Files whose size and mtime change whenever the database does"""
+        return [self.path, Path(f"{self.path}-wal")]
+
+    def checkpoint(self):
+        """Fold the write-ahead log into the database file and empty it"""
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _assemble(self, path: str, record_json: str) -> Dict:
+        """Rebuild a record from its row plus relevance and section rows"""
+        record = decode_record(json.loads(record_json))
+        # Placeholders mark the fields kept in the relevance and sections tables
+        if 'relevance' in record:
+            row = self.conn.execute("SELECT data FROM relevance WHERE path = ?", (path,)).fetchone()
+            record['relevance'] = json.loads(row[0]) if row else {}
+        if 'sections' in record:
+            rows = self.conn.execute(
+                "SELECT anchor, body FROM sections WHERE path = ? ORDER BY ordinal", (path,)
+            ).fetchall()
+            # A None placeholder marks a section -> content dict, [] a list
+            if record['sections'] is None:
+                record['sections'] = {anchor: json.loads(body) for anchor, body in rows}
+            else:
+                record['sections'] = [json.loads(body) for _, body in rows]
+        return record
+
+    def upsert(self, path: str, record: Dict):
+        """Insert or update one record with its relevance and sections"""
+        relevance = record.get('relevance')
+        sections = record.get('sections')
+        placeholders = {}
+        if 'relevance' in record:
+            placeholders['relevance'] = None
+        if 'sections' in record:
+            placeholders['sections'] = None if isinstance(sections, dict) else []
+
+        self.conn.execute(
+            """INSERT INTO sources (path, category, status, hash, title, added_date, record)
+               VALUES (?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(path) DO UPDATE SET
+                   category = excluded.category, status = excluded.status,
+                   hash = excluded.hash, title = excluded.title,
+                   added_date = excluded.added_date, record = excluded.record""",
+            (path, record.get('category'), record.get('status'), record.get('hash'),
+             record.get('title'), record.get('added_date'), _encode(encode_record(record, placeholders)))
+        )
+
+        self.conn.execute("DELETE FROM relevance WHERE path = ?", (path,))
+        if relevance is not None:
+            self.conn.execute(
+                "INSERT INTO relevance (path, score, level, data) VALUES (?, ?, ?, ?)",
+                (path, relevance.get('score'), relevance.get('level'), _encode(encode_value(relevance)))
+            )
+
+        self.conn.execute("DELETE FROM sections WHERE path = ?", (path,))
+        if sections:
+            if isinstance(sections, dict):
+                rows = [(path, i, anchor, _encode(body)) for i, (anchor, body) in enumerate(sections.items())]
+            else:
+                rows = [(path, i, _section_anchor(item), _encode(encode_value(item)))
+                        for i, item in enumerate(sections)]
+            self.conn.executemany(
+                "INSERT INTO sections (path, ordinal, anchor, body) VALUES (?, ?, ?, ?)", rows
+            )
+
+    def delete(self, path: str):
+        """Remove a record and its dependent rows"""
+        self.conn.execute("DELETE FROM sources WHERE path = ?", (path,))
+
+    def save(self, source_db: Dict, changed: Iterable[str] = (), deleted: Iterable[str] = ()):
+        """Write only the changed and deleted records in one transaction"""
+        sources = source_db['sources']
+        with self.conn:
+            for path in deleted:
+                self.delete(path)
+            for path in changed:
+                if path in sources:
+                    self.upsert(path, sources[path])
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_update', ?)",
+                (_encode(source_db.get('last_update')),)
+            )
+        if isinstance(sources, SqliteSourceMap):
+            sources.committed()
+
+    def import_json(self, json_path: str) -> int:
+        """Replace the database contents with a source_database.json document"""
+        source_db = JsonSourceStore(json_path).load()
+        with self.conn:
+            self.conn.execute("DELETE FROM sources")
+            self.conn.execute("DELETE FROM meta")
+        self.save(source_db, changed=list(source_db.get('sources', {})))
+        return len(source_db.get('sources', {}))
+
+    def export_json(self, json_path: str) -> int:
+        """Write the database in the source_database.json layout"""
+        source_db = self.load()
+        source_db['sources'] = {path: record.to_dict() for path, record in self.iter_records()}
+        JsonSourceStore(json_path).compact(source_db, plain=True)
+        return len(source_db['sources'])
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+
+def open_source_store(config: Dict, logger=None):
+    """Open the storage backend selected by the DATABASE config block"""
+    settings = config.get('DATABASE', {}) or {}
+    json_path = settings.get('json_path', 'source_database.json')
+    if settings.get('backend', 'json') != 'sqlite':
+        return JsonSourceStore(
+            json_path,
+            journal_max_bytes=settings.get('journal_max_bytes', 4 * 1024 * 1024),
+            journal_max_ratio=settings.get('journal_max_ratio', 0.5)
+        )
+
+    store = SqliteSourceStore(settings.get('sqlite_path', 'source_database.sqlite3'))
+
+    # First run after switching backends: migrate the legacy JSON database
+    if store.is_empty() and os.path.exists(json_path):
+        try:
+            count = store.import_json(json_path)
+            if logger:
+                logger.info(f"Imported {count} sources from {json_path}")
+        except ValueError as e:
+            if logger:
+                logger.warning(f"Could not import {json_path}: {e}")
+    return store
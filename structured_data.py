@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Streaming Structured Data Sketches
+Summarizes JSON and YAML documents from parse events in bounded memory
+"""
+
+import json
+import re
+import yaml
+from json.decoder import scanstring
+from typing import Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+CHUNK_SIZE = 64 * 1024
+SUMMARY_LENGTH = 500
+SAMPLE_ITEMS = 1000
+
+TOKEN = re.compile(r'''[ \t\n\r]*(?:
+      ([{}\[\]:,])                                   # punctuation
+    | "([^"\\\x00-\x1f]*)"                           # string without escapes
+    | (")                                             # string needing the decoder
+    | (-?(?:0|[1-9]\d*)(\.\d+)?([eE][-+]?\d+)?)        # number
+    | (true|false|null)
+)''', re.VERBOSE)
+LITERALS = {'true': True, 'false': False, 'null': None}
+NUMBER_END = ' \t\n\r,]}'
+
+# Parse events are (kind, value) pairs:
+#   ('start_map', None) ('key', name) ('end_map', None)
+#   ('start_array', None) ('end_array', None) ('scalar', value)
+#   ('value', decoded) -- a whole array element, decoded in one step
+Event = Tuple[str, object]
+
+
+def iter_json_events(stream: TextIO, sample_items: Optional[int] = None) -> Iterator[Event]:
+    """Parse events for the first JSON value in a text stream
+
+    The stream is read in CHUNK_SIZE pieces. Array elements past the first
+    ``sample_items`` are decoded whole by the C decoder and reported as one
+    ``value`` event, which is much faster than tokenizing them.
+    """
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    eof = False
+    stack = []  # per container: [kind, elements seen]
+    expect_key = False
+
+    def refill():
+        # Grow the read size with the buffer so long tokens stay linear
+        nonlocal buf, pos, eof
+        more = stream.read(max(CHUNK_SIZE, len(buf) - pos))
+        eof = not more
+        buf = buf[pos:] + more
+        pos = 0
+
+    while True:
+        token = TOKEN.match(buf, pos)
+        if (token is None or token.end() == len(buf)) and not eof:
+            # The token may be cut off at the end of the buffer
+            refill()
+            continue
+        if token is None:
+            if buf[pos:].strip():
+                raise ValueError(f"Invalid JSON near {buf[pos:pos + 20]!r}")
+            return
+
+        punct, plain, quote, number, fraction, exponent, literal = token.groups()
+        if number and not eof and len(buf) - token.end() < 32 and buf[token.end()] not in NUMBER_END:
+            # "2." or "1e" at the end of the buffer: the rest is still unread
+            refill()
+            continue
+        in_array = bool(stack) and stack[-1][0] == 'array'
+        if (in_array and sample_items is not None and stack[-1][1] >= sample_items
+                and punct not in (']', ',')):
+            try:
+                start = token.end() - len(token.group(0).lstrip())
+                value, end = decoder.raw_decode(buf, start)
+            except ValueError:
+                if eof:
+                    raise
+                end = len(buf)
+            if end == len(buf) and not eof:
+                refill()
+                continue
+            stack[-1][1] += 1
+            pos = end
+            yield 'value', value
+            continue
+
+        if quote:
+            try:
+                value, end = scanstring(buf, token.end())
+            except ValueError:
+                if eof:
+                    raise
+                refill()
+                continue
+        else:
+            end = token.end()
+        pos = end
+
+        if punct:
+            if punct == ',':
+                expect_key = stack[-1][0] == 'map'
+            elif punct == ':':
+                expect_key = False
+            elif punct in '{[':
+                if in_array:
+                    stack[-1][1] += 1
+                stack.append(['map' if punct == '{' else 'array', 0])
+                expect_key = punct == '{'
+                yield ('start_map' if punct == '{' else 'start_array'), None
+            else:
+                stack.pop()
+                yield ('end_map' if punct == '}' else 'end_array'), None
+                if not stack:
+                    return
+            continue
+
+        if quote or plain is not None:
+            value = value if quote else plain
+            if expect_key:
+                expect_key = False
+                yield 'key', value
+                continue
+        elif number:
+            value = float(number) if fraction or exponent else int(number)
+        else:
+            value = LITERALS[literal]
+        if in_array:
+            stack[-1][1] += 1
+        yield 'scalar', value
+        if not stack:
+            return
+
+
+YAML_TYPES = {
+    'tag:yaml.org,2002:int': int,
+    'tag:yaml.org,2002:float': float,
+    'tag:yaml.org,2002:bool': lambda text: text.lower() in ('true', 'yes', 'on'),
+    'tag:yaml.org,2002:null': lambda text: None,
+}
+
+
+def _yaml_scalar(resolver, event) -> object:
+    """Plain Python value of a scalar event, resolved like safe_load would"""
+    tag = event.tag
+    if tag is None or tag == '!':
+        tag = resolver.resolve(yaml.ScalarNode, event.value, event.implicit)
+    convert = YAML_TYPES.get(tag)
+    if convert is None:
+        return event.value
+    try:
+        return convert(event.value.replace('_', '') if convert in (int, float) else event.value)
+    except ValueError:
+        return event.value
+
+
+def iter_yaml_events(stream: TextIO) -> Iterator[Event]:
+    """Parse events for the first document of a YAML text stream"""
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    resolver = yaml.resolver.Resolver()
+    stack = []  # per container: [kind, expecting a key]
+    for event in yaml.parse(stream, Loader=loader):
+        if isinstance(event, yaml.DocumentEndEvent):
+            return
+        if isinstance(event, (yaml.StreamStartEvent, yaml.StreamEndEvent, yaml.DocumentStartEvent)):
+            continue
+
+        is_key = bool(stack) and stack[-1][0] == 'map' and stack[-1][1]
+        if stack and stack[-1][0] == 'map' and not isinstance(event, yaml.MappingEndEvent):
+            stack[-1][1] = not stack[-1][1]
+
+        if isinstance(event, yaml.MappingStartEvent):
+            stack.append(['map', True])
+            yield 'start_map', None
+        elif isinstance(event, yaml.SequenceStartEvent):
+            stack.append(['array', False])
+            yield 'start_array', None
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            stack.pop()
+            yield ('end_map' if isinstance(event, yaml.MappingEndEvent) else 'end_array'), None
+        elif isinstance(event, yaml.ScalarEvent):
+            value = _yaml_scalar(resolver, event)
+            yield ('key', str(value)) if is_key else ('scalar', value)
+        elif isinstance(event, yaml.AliasEvent):
+            # Anchored content is summarized where it was defined
+            yield ('key', f"*{event.anchor}") if is_key else ('scalar', f"*{event.anchor}")
+
+
+_NO_KEY = object()
+
+
+def iter_value_events(data) -> Iterator[Event]:
+    """Parse events for an already loaded Python value"""
+    stack = [iter([(_NO_KEY, data)])]
+    ends = []
+    while stack:
+        try:
+            key, value = next(stack[-1])
+        except StopIteration:
+            stack.pop()
+            if ends:
+                yield ends.pop(), None
+            continue
+        if key is not _NO_KEY:
+            yield 'key', str(key)
+        if isinstance(value, dict):
+            yield 'start_map', None
+            stack.append(iter(value.items()))
+            ends.append('end_map')
+        elif isinstance(value, (list, tuple)):
+            yield 'start_array', None
+            stack.append((_NO_KEY, item) for item in value)
+            ends.append('end_array')
+        else:
+            yield 'scalar', value
+
+
+def _type_name(value) -> str:
+    """JSON type name of a scalar"""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, int):
+        return 'integer'
+    if isinstance(value, float):
+        return 'number'
+    return 'string'
+
+
+class StructureSketch:
+    """Builds a summary, schema sketch and record counts from parse events
+
+    The schema merges the first ``sample_items`` elements of each array into
+    one item sketch and stops descending below ``max_depth``; objects keep
+    at most ``max_keys`` keys. Later elements are only counted. Memory
+    therefore depends on the shape of the document, not on its size.
+    """
+
+    def __init__(self, max_depth: int = 4, max_keys: int = 50,
+                 sample_items: int = SAMPLE_ITEMS, summary_length: int = SUMMARY_LENGTH):
+        self.max_depth = max_depth
+        self.max_keys = max_keys
+        self.sample_items = sample_items
+        self.summary_length = summary_length
+        self.root = {}
+        self.top_level = {}  # scalar 'title' and 'type' of a top-level object
+        self.record_count = None
+        self.record_counts = {}
+        self._frames = []  # [kind, sketch node or None, length, current key]
+        self._summary = []
+        self._summary_size = 0
+        self._summary_counts = []
+        self._after_key = False
+
+    def _write(self, text: str):
+        """Append to the summary until it is long enough"""
+        if self._summary_size < self.summary_length:
+            self._summary.append(text)
+            self._summary_size += len(text)
+
+    def _summary_item(self):
+        """Separator and indentation before the next item, as json.dumps(indent=2)"""
+        if self._after_key:
+            self._after_key = False
+            return
+        if self._summary_counts:
+            if self._summary_counts[-1]:
+                self._write(',')
+            self._write('\n' + '  ' * len(self._summary_counts))
+            self._summary_counts[-1] += 1
+
+    def _child(self) -> Optional[Dict]:
+        """Sketch node for the value about to start, counting it in its parent"""
+        if not self._frames:
+            return self.root
+        frame = self._frames[-1]
+        parent = frame[1]
+        if frame[0] == 'array':
+            frame[2] += 1
+            if frame[2] > self.sample_items:
+                return None
+        if parent is None or len(self._frames) >= self.max_depth:
+            return None
+        if frame[0] == 'array':
+            return parent.setdefault('items', {})
+        keys = parent.setdefault('keys', {})
+        if frame[3] not in keys:
+            if len(keys) >= self.max_keys:
+                parent['more_keys'] = True
+                return None
+            keys[frame[3]] = {}
+        return keys[frame[3]]
+
+    @staticmethod
+    def _add_type(node: Optional[Dict], type_name: str):
+        if node is not None:
+            types = node.setdefault('types', [])
+            if type_name not in types:
+                types.append(type_name)
+
+    def feed(self, kind: str, value=None):
+        """Consume one parse event"""
+        if kind == 'key':
+            self._summary_item()
+            self._write(json.dumps(value) + ': ')
+            self._after_key = True
+            frame = self._frames[-1]
+            frame[2] += 1
+            frame[3] = value
+        elif kind in ('start_map', 'start_array'):
+            self._summary_item()
+            self._write('{' if kind == 'start_map' else '[')
+            self._summary_counts.append(0)
+            node = self._child()
+            self._add_type(node, 'object' if kind == 'start_map' else 'array')
+            key = self._frames[-1][3] if self._frames else None
+            self._frames.append(['map' if kind == 'start_map' else 'array', node, 0, key])
+        elif kind in ('end_map', 'end_array'):
+            if self._summary_counts.pop():
+                self._write('\n' + '  ' * len(self._summary_counts))
+            self._write('}' if kind == 'end_map' else ']')
+            container, node, length, key = self._frames.pop()
+            if container == 'array':
+                if node is not None:
+                    node['min_length'] = min(node.get('min_length', length), length)
+                    node['max_length'] = max(node.get('max_length', length), length)
+                if not self._frames:
+                    self.record_count = length
+                elif (len(self._frames) == 1 and self._frames[0][0] == 'map'
+                        and len(self.record_counts) < self.max_keys):
+                    self.record_counts[key] = length
+        elif kind == 'value':
+            frame = self._frames[-1]
+            if frame[1] is not None and frame[2] < self.sample_items:
+                self.feed_all(iter_value_events(value))
+                return
+            frame[2] += 1
+            self._summary_item()
+            if self._summary_size < self.summary_length:
+                text = json.dumps(value, indent=2, default=str)
+                self._write(text.replace('\n', '\n' + '  ' * len(self._summary_counts)))
+        else:
+            self._summary_item()
+            if self._summary_size < self.summary_length:
+                if isinstance(value, str):
+                    value = value[:self.summary_length]
+                self._write(json.dumps(value, default=str))
+            self._add_type(self._child(), _type_name(value))
+            if (len(self._frames) == 1 and self._frames[0][0] == 'map'
+                    and self._frames[0][3] in ('title', 'type')):
+                self.top_level.setdefault(self._frames[0][3], value)
+
+    def feed_all(self, events: Iterable[Event]) -> 'StructureSketch':
+        """Consume an event stream"""
+        for kind, value in events:
+            self.feed(kind, value)
+        return self
+
+    @property
+    def summary(self) -> str:
+        return ''.join(self._summary)[:self.summary_length]
+
+    @classmethod
+    def _render(cls, node: Dict) -> Dict:
+        """Compact JSON-ready form of a sketch node"""
+        types = node.get('types', [])
+        rendered = {'type': types[0] if len(types) == 1 else types}
+        if 'keys' in node:
+            rendered['keys'] = {key: cls._render(child) for key, child in node['keys'].items()}
+        if node.get('more_keys'):
+            rendered['more_keys'] = True
+        if 'min_length' in node:
+            rendered['length'] = [node['min_length'], node['max_length']]
+        if 'items' in node:
+            rendered['items'] = cls._render(node['items'])
+        return rendered
+
+    def structure(self) -> Dict:
+        """Depth-limited schema sketch of the document"""
+        return self._render(self.root) if self.root else {}
+
+    @property
+    def top_keys(self):
+        """Keys of a top-level object, up to max_keys"""
+        return list(self.root.get('keys', {}))
+
+
+def sketch_events(events: Iterable[Event], settings: Optional[Dict] = None) -> StructureSketch:
+    """Run an event stream through a StructureSketch configured from DATA_PROCESSING"""
+    settings = settings or {}
+    sketch = StructureSketch(settings.get('schema_depth', 4), settings.get('max_keys', 50),
+                             settings.get('sample_items', SAMPLE_ITEMS))
+    return sketch.feed_all(events)
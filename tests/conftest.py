@@ -0,0 +1,45 @@
+"""
+Shared fixtures: a throwaway workspace with the repository's config.yaml
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Empty working directory with config.yaml, a docs page and the input categories"""
+    with open(REPO_ROOT / 'config.yaml', 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    config['WORKERS'] = 1
+    with open(tmp_path / 'config.yaml', 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+    (tmp_path / 'docs').mkdir()
+    (tmp_path / 'docs' / 'guidance.md').write_text("# Guidance\n\n## Navigation\n\nKalman filters.\n")
+    (tmp_path / 'tasks').mkdir()
+    for category in ('papers', 'briefings', 'data', 'references'):
+        (tmp_path / 'input' / category).mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def configure(workspace):
+    """Override config.yaml settings in the workspace, one block at a time"""
+    def update(**blocks):
+        with open(workspace / 'config.yaml', 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f)
+        for name, settings in blocks.items():
+            if isinstance(settings, dict):
+                config[name] = dict(config.get(name) or {}, **settings)
+            else:
+                config[name] = settings
+        with open(workspace / 'config.yaml', 'w', encoding='utf-8') as f:
+            yaml.safe_dump(config, f, sort_keys=False)
+    return update
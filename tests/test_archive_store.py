@@ -0,0 +1,73 @@
+"""
+Tests for the content-addressed source archive
+"""
+
+import os
+
+from archive_store import SourceArchive
+from extractors import calculate_file_hash
+from source_manager import SourceManager
+
+
+def test_same_name_in_subdirectories_keeps_apart_names(workspace):
+    papers = workspace / 'input' / 'papers'
+    for directory, text in (('a', "Guidance paper A\n"), ('b', "Trajectory paper B\n")):
+        (papers / directory).mkdir()
+        (papers / directory / 'x.txt').write_text(text)
+
+    manager = SourceManager()
+    manager.run_integration_cycle()
+    try:
+        for directory, text in (('a', "Guidance paper A\n"), ('b', "Trajectory paper B\n")):
+            record = manager.source_db['sources'][f"input/papers/{directory}/x.txt"]
+            assert record['archived_path'] == f"sources/papers/{directory}/x.txt"
+            with open(record['archived_path'], 'r') as f:
+                assert f.read() == text
+            assert SourceArchive('sources').index[f"papers/{directory}/x.txt"]['hash'] == record['hash']
+    finally:
+        manager.store.close()
+
+
+def test_identical_content_is_stored_once_under_every_name(tmp_path):
+    inputs = tmp_path / 'input'
+    inputs.mkdir()
+    first, second = inputs / 'notes.md', inputs / 'copy.md'
+    first.write_text("# Same\n")
+    second.write_text("# Same\n")
+    file_hash = calculate_file_hash(first)
+
+    archive = SourceArchive(str(tmp_path / 'sources'))
+    archived = [archive.archive(first, 'briefings', file_hash),
+                archive.archive(second, 'references', file_hash)]
+    archive.save()
+
+    assert archive.stats['stored'] == 1 and archive.stats['deduplicated'] == 1
+    assert list((tmp_path / 'sources' / 'objects').rglob('*.md')) == [archive.object_path(file_hash, '.md')]
+    index = SourceArchive(str(tmp_path / 'sources')).index
+    assert set(index) == {'briefings/notes.md', 'references/copy.md'}
+    assert {entry['hash'] for entry in index.values()} == {file_hash}
+    for path in archived:
+        assert os.path.samefile(path, archive.object_path(file_hash, '.md'))
+
+
+def test_same_name_in_two_categories_keeps_both_contents(tmp_path):
+    archive = SourceArchive(str(tmp_path / 'sources'), method='copy')
+    for category, text in (('papers', "paper\n"), ('references', "reference\n")):
+        source = tmp_path / category / 'x.md'
+        source.parent.mkdir()
+        source.write_text(text)
+        archive.archive(source, category, calculate_file_hash(source))
+
+    assert archive.lookup('papers/x.md').read_text() == "paper\n"
+    assert archive.lookup('references/x.md').read_text() == "reference\n"
+
+
+def test_store_writes_the_bytes_the_caller_already_read(tmp_path):
+    source = tmp_path / 'data.csv'
+    source.write_bytes(b"a,b\n1,2\n")
+    file_hash = calculate_file_hash(source)
+    archive = SourceArchive(str(tmp_path / 'sources'))
+
+    assert archive.store(source, file_hash, b"a,b\n1,2\n") in ('reflink', 'buffer')
+    assert archive.store(source, file_hash, b"a,b\n1,2\n") is None
+    assert archive.object_path(file_hash, '.csv').read_bytes() == b"a,b\n1,2\n"
@@ -0,0 +1,54 @@
+"""
+Tests for the incremental, rotating integration report
+"""
+
+import re
+
+from report_log import REPORT_HEADER, IntegrationReport
+
+
+def render(entry):
+    return f"- {entry['file_path']}: {entry['status']}\n"
+
+
+def make_report(tmp_path, max_bytes=1024 * 1024):
+    return IntegrationReport(tmp_path / 'integration_report.md', tmp_path / 'state' / 'pending.jsonl',
+                             max_bytes=max_bytes, archive_dir=tmp_path / 'reports')
+
+
+def test_publish_lists_latest_change_per_source_once(tmp_path):
+    report = make_report(tmp_path)
+    report.record({'file_path': 'a.md', 'status': 'new'})
+    report.record({'file_path': 'b.md', 'status': 'new'})
+    report.record({'file_path': 'a.md', 'status': 'reviewed'})
+
+    assert report.publish("Run 1", render) == 2
+    text = report.path.read_text(encoding='utf-8')
+    assert text.startswith(REPORT_HEADER)
+    assert "## Run 1" in text
+    assert "- a.md: reviewed\n" in text and "- a.md: new\n" not in text
+    assert not report.has_pending()
+    assert report.publish("Run 2", render) == 0
+    assert "## Run 2" not in report.path.read_text(encoding='utf-8')
+
+
+def test_report_past_max_bytes_is_rotated_and_indexed(tmp_path):
+    report = make_report(tmp_path, max_bytes=1)
+    for run in range(1, 4):
+        report.record({'file_path': f"source_{run}.md", 'status': 'new'})
+        report.publish(f"Run {run}", render)
+
+    # Each publish after the first found a full report and rotated it first,
+    # twice within the same second here
+    index = (tmp_path / 'reports' / 'index.md').read_text(encoding='utf-8')
+    assert index.startswith("# Integration Report Archive")
+    names = re.findall(r"^- \[([^\]]+)\]", index, re.MULTILINE)
+    assert len(names) == 2 and len(set(names)) == 2
+    assert sorted(names) == sorted(path.name for path in (tmp_path / 'reports').glob('integration_report-*.md'))
+    first, second = [(tmp_path / 'reports' / name).read_text(encoding='utf-8') for name in names]
+    assert "## Run 1" in first and "## Run 2" not in first
+    assert "## Run 2" in second and "## Run 1" not in second
+
+    current = report.path.read_text(encoding='utf-8')
+    assert current.startswith(REPORT_HEADER)
+    assert "Earlier reports:" in current and "## Run 3" in current and "## Run 2" not in current
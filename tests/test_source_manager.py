@@ -0,0 +1,165 @@
+"""
+Tests for the SourceManager ingestion pipeline and status lifecycle
+"""
+
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from source_manager import SourceManager
+
+
+@pytest.fixture
+def ingested(workspace):
+    """A manager that has ingested two briefings"""
+    briefings = workspace / 'input' / 'briefings'
+    (briefings / 'alpha.md').write_text("# Alpha\n\nGuidance and kalman filter notes.\n")
+    (briefings / 'beta.md').write_text("# Beta\n\nTrajectory prediction notes.\n")
+    manager = SourceManager()
+    manager.run_integration_cycle()
+    yield manager
+    manager.store.close()
+
+
+def test_transition_advances_and_records_history(ingested):
+    path = 'input/briefings/alpha.md'
+    assert ingested.source_db['sources'][path]['status'] == 'new'
+
+    ingested.transition(path, 'reviewed', note='read it')
+    record = ingested.transition(path, 'integrated')
+
+    assert record['status'] == 'integrated'
+    assert [change['status'] for change in record['status_history']] == ['reviewed', 'integrated']
+    assert record['status_history'][0]['note'] == 'read it'
+    assert record['status_changed'] == record['status_history'][-1]['date']
+    pending = {entry['file_path']: entry['status'] for entry in ingested.report.pending()}
+    assert pending[path] == 'integrated'
+
+
+def test_transition_may_skip_steps(ingested):
+    record = ingested.transition('input/briefings/beta.md', 'archived')
+    assert record['status'] == 'archived'
+
+
+@pytest.mark.parametrize('start, target', [
+    ('integrated', 'reviewed'),
+    ('integrated', 'new'),
+    ('reviewed', 'reviewed'),
+])
+def test_transition_rejects_backward_moves(ingested, start, target):
+    path = 'input/briefings/alpha.md'
+    ingested.transition(path, start)
+    with pytest.raises(ValueError, match="cannot move back"):
+        ingested.transition(path, target)
+    record = ingested.source_db['sources'][path]
+    assert record['status'] == start
+    assert len(record['status_history']) == 1
+
+
+def test_transition_rejects_unknown_status_and_source(ingested):
+    with pytest.raises(ValueError, match="Unknown status"):
+        ingested.transition('input/briefings/alpha.md', 'published')
+    with pytest.raises(KeyError):
+        ingested.transition('input/briefings/missing.md', 'reviewed')
+
+
+def test_transition_sources_commits_valid_moves(ingested):
+    ingested.transition('input/briefings/beta.md', 'integrated')
+    moved = ingested.transition_sources(
+        ['input/briefings/alpha.md', 'input/briefings/beta.md', 'input/briefings/missing.md'], 'reviewed'
+    )
+    assert moved == 1
+
+    reopened = SourceManager()
+    try:
+        sources = reopened.source_db['sources']
+        assert sources['input/briefings/alpha.md']['status'] == 'reviewed'
+        assert sources['input/briefings/beta.md']['status'] == 'integrated'
+    finally:
+        reopened.store.close()
+
+
+def test_ingest_commits_every_batch_size_sources(workspace, configure):
+    configure(PIPELINE={'batch_size': 2}, RECOMMENDER={'batch_size': 1})
+    for number in range(5):
+        (workspace / 'input' / 'papers' / f"paper_{number}.txt").write_text(f"Guidance paper {number}\n")
+
+    def committed():
+        with closing(sqlite3.connect('source_database.sqlite3')) as conn:
+            return conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]
+
+    manager = SourceManager()
+    try:
+        run = manager.ingest()
+        next(run)
+        assert committed() == 0
+        next(run)
+        assert committed() == 2
+        next(run)
+        next(run)
+        assert committed() == 4
+        assert len(list(run)) == 1
+        assert committed() == 5
+    finally:
+        manager.store.close()
+
+
+def test_ingest_saves_sources_scored_across_a_commit(workspace, configure):
+    configure(PIPELINE={'batch_size': 2}, RECOMMENDER={'batch_size': 3})
+    for number in range(6):
+        (workspace / 'input' / 'papers' / f"paper_{number}.txt").write_text(f"Guidance paper {number}\n")
+    manager = SourceManager()
+    try:
+        manager.run_integration_cycle()
+    finally:
+        manager.store.close()
+
+    reloaded = SourceManager()
+    try:
+        sources = list(reloaded.source_db['sources'].values())
+        assert len(sources) == 6
+        assert all(source.get('relevance') for source in sources)
+        assert all(source.get('archived_path') for source in sources)
+    finally:
+        reloaded.store.close()
+
+
+def test_reprocess_saves_sources_rescored_across_a_commit(workspace, configure):
+    configure(PIPELINE={'batch_size': 2}, RECOMMENDER={'batch_size': 3})
+    for number in range(7):
+        (workspace / 'input' / 'papers' / f"paper_{number}.txt").write_text(f"Guidance paper {number}\n")
+    manager = SourceManager()
+    try:
+        manager.run_integration_cycle()
+        counts = manager.reprocess(force=True)
+    finally:
+        manager.store.close()
+    assert counts['extracted'] == 7
+
+    reloaded = SourceManager()
+    try:
+        sources = list(reloaded.source_db['sources'].values())
+        assert len(sources) == 7
+        assert all(source.get('relevance') for source in sources)
+        assert all(source.get('archived_path') for source in sources)
+    finally:
+        reloaded.store.close()
+
+
+def test_queued_files_with_the_same_content_keep_their_own_titles(workspace):
+    papers = workspace / 'input' / 'papers'
+    for name in ('first_copy.txt', 'second_copy.txt'):
+        (papers / name).write_text("Guidance paper without a heading\n")
+    manager = SourceManager()
+    queue = manager.open_work_queue()
+    try:
+        manager.enqueue_work(queue)
+        assert manager.work(queue, worker_id='w1') == 2
+        assert manager.coordinate(queue, wait=False) == 2
+        titles = {path: source['title'] for path, source in manager.source_db['sources'].items()}
+    finally:
+        queue.close()
+        manager.store.close()
+    assert titles == {'input/papers/first_copy.txt': 'first_copy',
+                      'input/papers/second_copy.txt': 'second_copy'}
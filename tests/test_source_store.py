@@ -0,0 +1,79 @@
+"""
+Tests for the journaled JSON source store
+"""
+
+import shutil
+
+from source_store import JsonSourceStore
+
+
+def record(path, status='new', title=None):
+    return {'file_path': path, 'category': 'papers', 'hash': f"hash-{path}", 'status': status,
+            'title': title or path, 'tags': ['guidance']}
+
+
+def plain(source_db):
+    return {path: value.to_dict() for path, value in source_db['sources'].items()}
+
+
+def journaled_store(tmp_path):
+    """A store that never compacts on its own"""
+    return JsonSourceStore(str(tmp_path / 'db.json'), journal_max_bytes=1 << 30, journal_max_ratio=1e9)
+
+
+def test_journal_replays_upserts_and_deletes_over_the_snapshot(tmp_path):
+    store = journaled_store(tmp_path)
+    source_db = {'sources': {'a': record('a'), 'b': record('b')}, 'last_update': 'one'}
+    store.compact(source_db)
+
+    source_db['sources']['a'] = record('a', status='reviewed')
+    source_db['sources']['c'] = record('c')
+    del source_db['sources']['b']
+    source_db['last_update'] = 'two'
+    store.save(source_db, changed=['a', 'c'], deleted=['b'])
+
+    loaded = journaled_store(tmp_path).load()
+    assert plain(loaded) == {'a': record('a', status='reviewed'), 'c': record('c')}
+    assert loaded['last_update'] == 'two'
+
+
+def test_torn_journal_line_from_a_crash_is_ignored_and_repaired(tmp_path):
+    store = journaled_store(tmp_path)
+    source_db = {'sources': {'a': record('a')}, 'last_update': None}
+    store.save(source_db, changed=['a'])
+    with open(store.journal_path, 'a') as f:
+        f.write('{"op": "upsert", "path": "b", "rec')  # crash mid-append
+
+    source_db = journaled_store(tmp_path).load()
+    assert plain(source_db) == {'a': record('a')}
+
+    source_db['sources']['c'] = record('c')
+    store.save(source_db, changed=['c'])
+    assert plain(journaled_store(tmp_path).load()) == {'a': record('a'), 'c': record('c')}
+
+
+def test_crash_between_snapshot_and_journal_removal_loses_nothing(tmp_path):
+    store = journaled_store(tmp_path)
+    source_db = {'sources': {'a': record('a'), 'b': record('b')}, 'last_update': None}
+    store.save(source_db, changed=['a', 'b'])
+    source_db['sources']['a'] = record('a', title='Renamed')
+    del source_db['sources']['b']
+    store.save(source_db, changed=['a'], deleted=['b'])
+
+    # Compaction replaced the snapshot, then the process died before unlinking the journal
+    journal = store.journal_path.read_bytes()
+    store.compact(source_db)
+    assert not store.journal_path.exists()
+    store.journal_path.write_bytes(journal)
+
+    assert plain(journaled_store(tmp_path).load()) == {'a': record('a', title='Renamed')}
+
+
+def test_large_journal_is_compacted_into_the_snapshot(tmp_path):
+    store = JsonSourceStore(str(tmp_path / 'db.json'), journal_max_bytes=1, journal_max_ratio=0.5)
+    source_db = {'sources': {'a': record('a')}, 'last_update': None}
+    store.save(source_db, changed=['a'])
+    assert store.path.exists() and not store.journal_path.exists()
+
+    shutil.copy(store.path, tmp_path / 'snapshot_only.json')
+    assert plain(JsonSourceStore(str(tmp_path / 'snapshot_only.json')).load()) == {'a': record('a')}
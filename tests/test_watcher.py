@@ -0,0 +1,49 @@
+"""
+Tests for watch mode
+"""
+
+import shutil
+import time
+
+import pytest
+
+from source_manager import SourceManager
+from watcher import InotifyBackend, SourceWatcher
+
+
+def run_until(watcher, condition, timeout=5.0):
+    """Feed events to the watcher until the condition holds"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        watcher.run_once(timeout=0.05)
+        if condition():
+            return True
+    return False
+
+
+@pytest.mark.parametrize('operation', ['delete', 'move_out'])
+def test_directory_leaving_input_removes_its_sources(workspace, operation):
+    nested = workspace / 'input' / 'papers' / 'batch' / 'deep'
+    nested.mkdir(parents=True)
+    (nested / 'one.txt').write_text("Guidance one\n")
+    (nested.parent / 'two.txt').write_text("Trajectory two\n")
+    (workspace / 'input' / 'papers' / 'kept.txt').write_text("Kalman kept\n")
+
+    manager = SourceManager()
+    manager.run_integration_cycle()
+    try:
+        watcher = SourceWatcher(manager, debounce_seconds=0.05, stable_seconds=0.05)
+        if not isinstance(watcher.backend, InotifyBackend):
+            pytest.skip("inotify unavailable")
+        if operation == 'delete':
+            shutil.rmtree(nested.parent)
+        else:
+            shutil.move(str(nested.parent), str(workspace / 'moved'))
+
+        sources = manager.source_db['sources']
+        assert run_until(watcher, lambda: 'input/papers/batch/two.txt' not in sources)
+        assert 'input/papers/batch/deep/one.txt' not in sources
+        assert 'input/papers/kept.txt' in sources
+    finally:
+        watcher.backend.close()
+        manager.store.close()
@@ -0,0 +1,129 @@
+"""
+Tests for the lease-based work queue
+"""
+
+import pytest
+
+import work_queue
+from work_queue import WorkQueue
+
+
+class Clock:
+    """Stands in for time.time inside work_queue"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(work_queue.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = WorkQueue(str(tmp_path / 'queue.sqlite3'))
+    queue.enqueue([{'path': f"input/papers/{name}.txt", 'category': 'papers', 'fingerprint': [1, 2, 3, 4]}
+                   for name in ('a', 'b', 'c')])
+    yield queue
+    queue.close()
+
+
+def leased_paths(items):
+    return [item['path'] for item in items]
+
+
+def test_workers_never_lease_the_same_file(queue, clock):
+    first = queue.lease('w1', 2, lease_seconds=60)
+    second = queue.lease('w2', 2, lease_seconds=60)
+    assert leased_paths(first) == ['input/papers/a.txt', 'input/papers/b.txt']
+    assert leased_paths(second) == ['input/papers/c.txt']
+    assert queue.lease('w3', 2, lease_seconds=60) == []
+
+
+def test_expired_lease_is_reclaimed_and_completed_once(queue, clock):
+    queue.lease('crashed', 1, lease_seconds=60)
+    clock.now += 30
+    assert queue.lease('w2', 1, lease_seconds=60)[0]['path'] == 'input/papers/b.txt'
+
+    clock.now += 31
+    reclaimed = queue.lease('w2', 1, lease_seconds=60)
+    assert leased_paths(reclaimed) == ['input/papers/a.txt']
+    assert reclaimed[0]['attempts'] == 2
+
+    # Whichever worker finishes first commits; the other is told its work was not needed
+    assert queue.complete('w2', 'input/papers/a.txt', 'hash-a', '{"size": 1}')
+    assert not queue.complete('crashed', 'input/papers/a.txt', 'hash-a', '{"size": 2}')
+    finished = queue.finished()
+    assert leased_paths(finished) == ['input/papers/a.txt']
+    assert finished[0]['result']['size'] == 1
+
+
+def test_renewed_lease_is_not_reclaimed(queue, clock):
+    queue.lease('w1', 1, lease_seconds=60)
+    clock.now += 50
+    queue.renew('w1', ['input/papers/a.txt'], lease_seconds=60)
+    clock.now += 50
+    assert 'input/papers/a.txt' not in leased_paths(queue.lease('w2', 3, lease_seconds=60))
+
+
+def test_lease_expiring_max_attempts_times_fails_the_task(queue, clock):
+    for attempt in range(3):
+        assert 'input/papers/a.txt' in leased_paths(queue.lease(f"w{attempt}", 3, lease_seconds=60, max_attempts=3))
+        clock.now += 61
+    assert queue.lease('w9', 3, lease_seconds=60, max_attempts=3) == []
+    failures = {failure['path']: failure for failure in queue.failures()}
+    assert failures['input/papers/a.txt']['attempts'] == 3
+    assert 'lease expired' in failures['input/papers/a.txt']['error']
+    assert queue.outstanding() == 0
+
+
+def test_same_content_keeps_a_result_per_file_until_merged(queue, clock):
+    leased = queue.lease('w1', 3, lease_seconds=60)
+    for item in leased:
+        assert queue.complete('w1', item['path'], 'same-hash', '{"content": {"title": "%s"}}' % item['path'])
+    assert queue.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 3
+    assert [item['result']['content']['title'] for item in queue.finished()] == leased_paths(leased)
+
+    queue.mark_merged(leased_paths(leased)[:2])
+    assert leased_paths(queue.finished()) == ['input/papers/c.txt']
+    queue.mark_merged(['input/papers/c.txt'])
+    assert queue.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 0
+
+
+def test_results_keyed_by_hash_alone_are_dropped_and_their_tasks_queued_again(tmp_path, clock):
+    path = str(tmp_path / 'queue.sqlite3')
+    queue = WorkQueue(path)
+    queue.enqueue([{'path': 'input/papers/a.txt', 'category': 'papers', 'fingerprint': [1]}])
+    queue.lease('w1', 1, lease_seconds=60)
+    queue.complete('w1', 'input/papers/a.txt', 'hash-a', '{"size": 1}')
+    queue.conn.executescript("""
+        DROP TABLE results;
+        CREATE TABLE results (hash TEXT PRIMARY KEY, result TEXT NOT NULL, worker TEXT, finished REAL NOT NULL);
+    """)
+    queue.close()
+
+    queue = WorkQueue(path)
+    try:
+        assert queue.finished() == []
+        assert leased_paths(queue.lease('w2', 1, lease_seconds=60)) == ['input/papers/a.txt']
+        assert queue.complete('w2', 'input/papers/a.txt', 'hash-a', '{"size": 1}')
+        assert queue.finished()[0]['result']['size'] == 1
+    finally:
+        queue.close()
+
+
+def test_worker_waits_for_a_coordinator_that_started_after_it(queue, clock):
+    started = clock.now
+    assert not queue.coordinator_done(started, stale_after=300)
+    clock.now += 5
+    queue.heartbeat('coordinator-1')
+    assert not queue.coordinator_done(started, stale_after=300)
+    clock.now += 5
+    queue.release('coordinator-1')
+    assert queue.coordinator_done(started, stale_after=300)
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Input Directory Watcher
+Continuously ingests files as they land in input/, using inotify on Linux
+and periodic polling elsewhere
+"""
+
+import os
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+import logging
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyBackend:
+    """Recursive directory watch built on the Linux inotify syscalls
+
+    inotify reports a deleted or moved-away directory as one event, so
+    ``known_files`` lists the files previously seen below it; they are
+    reported as changed and found to be gone.
+    """
+
+    def __init__(self, root: Path, known_files: Optional[Callable[[Path], Iterable[Path]]] = None):
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name:
+            raise OSError("libc not found")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+        self.known_files = known_files
+        self.rescan_needed = False
+        self._watch_tree(root)
+
+    def _watch_tree(self, directory: Path):
+        """Add a watch for a directory and everything below it"""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), WATCH_MASK)
+        if wd < 0:
+            return
+        self.watches[wd] = directory
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                self._watch_tree(directory / entry.name)
+
+    def _unwatch_tree(self, directory: Path):
+        """Drop the watches of a directory moved out of the tree and everything below it"""
+        for wd, watched in list(self.watches.items()):
+            if watched == directory or directory in watched.parents:
+                self.libc.inotify_rm_watch(self.fd, wd)
+                del self.watches[wd]
+
+    def wait(self, timeout: float) -> Set[Path]:
+        """Return paths touched by events that arrive within the timeout"""
+        changed = set()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return changed
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            raw_name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length]
+            offset += EVENT_HEADER.size + length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; the caller must fall back to a scan
+                self.rescan_needed = True
+                continue
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            directory = self.watches.get(wd)
+            name = raw_name.rstrip(b'\0')
+            if directory is None or not name:
+                continue
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._watch_tree(path)
+                    # Files copied in before the watch existed
+                    changed.update(p for p in path.rglob('*') if p.is_file())
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    if mask & IN_MOVED_FROM:
+                        self._unwatch_tree(path)
+                    if self.known_files:
+                        changed.update(self.known_files(path))
+                continue
+            changed.add(path)
+        return changed
+
+    def close(self):
+        """Release the inotify descriptor"""
+        os.close(self.fd)
+
+
+class PollingBackend:
+    """Portable fallback that compares stat snapshots of the input tree"""
+
+    def __init__(self, root: Path, interval: float = 1.0):
+        self.root = root
+        self.interval = interval
+        self.rescan_needed = False
+        self.snapshot = self._take_snapshot()
+        self.last_poll = time.monotonic()
+
+    def _take_snapshot(self) -> Dict[Path, tuple]:
+        """Map every file below the root to (size, mtime_ns)"""
+        snapshot = {}
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                path = directory / entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(path)
+                    elif entry.is_file():
+                        st = entry.stat()
+                        snapshot[path] = (st.st_size, st.st_mtime_ns)
+                except OSError:
+                    continue
+        return snapshot
+
+    def wait(self, timeout: float) -> Set[Path]:
+        """Report files that differ once the poll interval has elapsed"""
+        remaining = self.last_poll + self.interval - time.monotonic()
+        if remaining > timeout:
+            time.sleep(timeout)
+            return set()
+        time.sleep(max(remaining, 0))
+        self.last_poll = time.monotonic()
+        current = self._take_snapshot()
+        changed = {path for path, stat in current.items() if self.snapshot.get(path) != stat}
+        changed.update(path for path in self.snapshot if path not in current)
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        """Nothing to release"""
+
+
+class SourceWatcher:
+    """Debounces filesystem events and feeds settled files to a SourceManager
+
+    A path is handed over once no new event has arrived for
+    ``debounce_seconds`` and its size and mtime have not changed for
+    ``stable_seconds``, so editor save bursts and large copies are
+    ingested once, after they finish.
+    """
+
+    def __init__(self, manager, debounce_seconds: float = 0.25,
+                 stable_seconds: float = 0.5, poll_interval: float = 1.0,
+                 force_polling: bool = False):
+        self.manager = manager
+        self.root = Path(manager.config['INPUT_DIR'])
+        self.debounce_seconds = debounce_seconds
+        self.stable_seconds = stable_seconds
+        self.logger = logging.getLogger(__name__)
+        self.backend = None
+        if not force_polling:
+            try:
+                self.backend = InotifyBackend(self.root, manager.source_paths_under)
+                self.logger.info(f"Watching {self.root} with inotify")
+            except (OSError, AttributeError) as e:
+                self.logger.info(f"inotify unavailable ({e}); falling back to polling")
+        if self.backend is None:
+            self.backend = PollingBackend(self.root, poll_interval)
+            self.logger.info(f"Polling {self.root} every {poll_interval}s")
+        self.pending = {}
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[tuple]:
+        """Size and mtime of a file, or None when it is gone"""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (st.st_size, st.st_mtime_ns)
+
+    def _settled(self, now: float) -> Set[Path]:
+        """Pop pending paths that are quiet and no longer changing"""
+        ready = set()
+        for path, state in list(self.pending.items()):
+            stat = self._stat(path)
+            if stat != state['stat']:
+                state['stat'] = stat
+                state['changed'] = now
+                continue
+            if (now - state['event'] >= self.debounce_seconds
+                    and now - state['changed'] >= self.stable_seconds):
+                ready.add(path)
+                del self.pending[path]
+        return ready
+
+    def run_once(self, timeout: float = 0.1) -> list:
+        """Wait for events once and ingest whatever has settled"""
+        now = time.monotonic()
+        for path in self.backend.wait(timeout):
+            state = self.pending.setdefault(path, {'stat': self._stat(path), 'changed': now})
+            state['event'] = now
+
+        if self.backend.rescan_needed:
+            self.backend.rescan_needed = False
+            self.logger.warning("Event queue overflowed; running a full scan")
+            return self.manager.run_integration_cycle()
+
+        ready = self._settled(time.monotonic())
+        if not ready:
+            return []
+        return self.manager.ingest_paths(ready)
+
+    def run(self):
+        """Watch until interrupted"""
+        try:
+            while True:
+                # Wake up often enough to notice files that have settled
+                self.run_once(timeout=min(self.debounce_seconds, self.stable_seconds) / 2)
+        except KeyboardInterrupt:
+            self.logger.info("Watch stopped")
+        finally:
+            self.backend.close()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Lease-Based Work Queue
+SQLite queue that splits extraction of a large input tree across worker processes
+"""
+
+import os
+import json
+import time
+import socket
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+QUEUE_STATES = ('pending', 'leased', 'done', 'failed')
+
+
+def default_worker_id() -> str:
+    """host:pid, unique across machines sharing a queue"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def pack_result(result: Dict, relevance: Optional[Dict] = None) -> str:
+    """JSON form of an extraction result and its relevance; the MinHash signature is hex-encoded"""
+    packed = {field: result.get(field) for field in ('content', 'size', 'extractor', 'version', 'cached', 'timings')}
+    packed['signature'] = result['signature'].hex() if result.get('signature') else None
+    packed['relevance'] = relevance
+    return json.dumps(packed, default=str)
+
+
+def unpack_result(file_hash: str, packed: Optional[str]) -> Dict:
+    """Extraction result in the shape process_source_file returns, plus 'relevance'
+
+    A task completed without a stored result had the hash it was queued
+    with, so its content is None (unchanged).
+    """
+    result = {'hash': file_hash, 'content': None, 'signature': None, 'error': None,
+              'size': 0, 'extractor': None, 'version': None, 'cached': False, 'archived': None,
+              'timings': {}, 'relevance': None}
+    if packed:
+        result.update(json.loads(packed))
+        if result['signature']:
+            result['signature'] = bytes.fromhex(result['signature'])
+    return result
+
+
+class WorkQueue:
+    """Files to extract, leased to workers in batches, with a result stored per file and content hash
+
+    Tasks move from ``pending`` to ``leased`` to ``done``, or to
+    ``failed`` after ``max_attempts``. Batches are claimed inside
+    ``BEGIN IMMEDIATE``, so two workers never lease the same file. A lease
+    that is neither completed nor renewed before it expires is handed out
+    again by the next ``lease`` call, which is how the files of a crashed
+    worker are retried. Results are inserted with ``INSERT OR IGNORE`` on
+    (hash, path) and a task is only completed while leased, so a worker
+    finishing after its lease expired commits no second result. Files with
+    the same content keep separate results, since titles and relevance can
+    depend on the file name. The coordinator merges finished tasks into
+    the source database and marks them merged.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            path TEXT PRIMARY KEY,
+            category TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            known_hash TEXT,
+            state TEXT NOT NULL DEFAULT 'pending',
+            worker TEXT,
+            lease_expires REAL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            hash TEXT,
+            error TEXT,
+            merged INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS results (
+            hash TEXT NOT NULL,
+            path TEXT NOT NULL,
+            result TEXT NOT NULL,
+            worker TEXT,
+            finished REAL NOT NULL,
+            PRIMARY KEY (hash, path)
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_state ON tasks(state, merged);
+    """
+
+    def __init__(self, path: str, journal_mode: str = 'wal', timeout: float = 60.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit; writes that must be atomic open their own transaction
+        self.conn = sqlite3.connect(str(self.path), timeout=timeout, isolation_level=None)
+        self.conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._drop_shared_results()
+        self.conn.executescript(self.SCHEMA)
+
+    def _drop_shared_results(self):
+        """Drop a results table keyed by hash alone, queueing its unmerged tasks again"""
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(results)")]
+        if not columns or 'path' in columns:
+            return
+        self._transaction([
+            ("DROP TABLE results", ()),
+            ("""UPDATE tasks SET state = 'pending', worker = NULL, lease_expires = NULL,
+                    attempts = 0, hash = NULL, error = NULL
+                WHERE state = 'done' AND merged = 0""", ())
+        ])
+
+    def _transaction(self, statements):
+        """Run (sql, params) pairs in one write transaction"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                self.conn.execute(sql, params)
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def enqueue(self, tasks: Iterable[Dict]) -> int:
+        """Add tasks ({path, category, fingerprint, known_hash}); returns how many were new or reset
+
+        A path already queued with the same fingerprint is left alone,
+        whatever its state; one with a new fingerprint starts over.
+        """
+        before = self.conn.total_changes
+        rows = [(task['path'], task['category'], json.dumps(task['fingerprint']), task.get('known_hash'))
+                for task in tasks]
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany(
+                """INSERT INTO tasks (path, category, fingerprint, known_hash) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(path) DO UPDATE SET
+                       category = excluded.category, fingerprint = excluded.fingerprint,
+                       known_hash = excluded.known_hash, state = 'pending', worker = NULL,
+                       lease_expires = NULL, attempts = 0, hash = NULL, error = NULL, merged = 0
+                   WHERE tasks.fingerprint != excluded.fingerprint OR tasks.state = 'failed'""",
+                rows
+            )
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+        return self.conn.total_changes - before
+
+    def lease(self, worker: str, limit: int, lease_seconds: float, max_attempts: int = 3) -> List[Dict]:
+        """Claim up to ``limit`` pending tasks, or tasks whose lease expired, for ``lease_seconds``"""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                """UPDATE tasks SET state = 'failed', worker = NULL,
+                       error = COALESCE(error, 'lease expired ' || attempts || ' times')
+                   WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?""",
+                (now, max_attempts)
+            )
+            rows = self.conn.execute(
+                """SELECT path, category, fingerprint, known_hash, attempts FROM tasks
+                   WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?)
+                   ORDER BY path LIMIT ?""",
+                (now, limit)
+            ).fetchall()
+            self.conn.executemany(
+                """UPDATE tasks SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1
+                   WHERE path = ?""",
+                [(worker, now + lease_seconds, row[0]) for row in rows]
+            )
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+        return [{'path': path, 'category': category, 'fingerprint': json.loads(fingerprint),
+                 'known_hash': known_hash, 'attempts': attempts + 1}
+                for path, category, fingerprint, known_hash, attempts in rows]
+
+    def renew(self, worker: str, paths: Iterable[str], lease_seconds: float):
+        """Extend this worker's leases on tasks it is still processing"""
+        expires = time.time() + lease_seconds
+        self._transaction(
+            ("UPDATE tasks SET lease_expires = ? WHERE path = ? AND worker = ? AND state = 'leased'",
+             (expires, path, worker))
+            for path in paths
+        )
+
+    def complete(self, worker: str, path: str, file_hash: str, packed: Optional[str] = None) -> bool:
+        """Store a task's result under its hash and path and mark it done; False when the task is no longer leased"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            if packed is not None:
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO results (hash, path, result, worker, finished) VALUES (?, ?, ?, ?, ?)",
+                    (file_hash, path, packed, worker, time.time())
+                )
+            updated = self.conn.execute(
+                """UPDATE tasks SET state = 'done', worker = ?, hash = ?, error = NULL, lease_expires = NULL
+                   WHERE path = ? AND state = 'leased'""",
+                (worker, file_hash, path)
+            ).rowcount
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+        return updated == 1
+
+    def fail(self, worker: str, path: str, error: str, max_attempts: int = 3):
+        """Record a processing error; the task is retried until it has been attempted ``max_attempts`` times"""
+        self._transaction([(
+            """UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                   worker = NULL, lease_expires = NULL, error = ?
+               WHERE path = ? AND state = 'leased' AND worker = ?""",
+            (max_attempts, error, path, worker)
+        )])
+
+    def finished(self, limit: int = 200) -> List[Dict]:
+        """Done tasks not yet merged into the source database, with their results"""
+        rows = self.conn.execute(
+            """SELECT t.path, t.category, t.fingerprint, t.known_hash, t.hash, r.result
+               FROM tasks t LEFT JOIN results r ON r.hash = t.hash AND r.path = t.path
+               WHERE t.state = 'done' AND t.merged = 0 ORDER BY t.path LIMIT ?""",
+            (limit,)
+        ).fetchall()
+        return [{'path': path, 'category': category, 'fingerprint': json.loads(fingerprint),
+                 'known_hash': known_hash, 'result': unpack_result(file_hash, packed)}
+                for path, category, fingerprint, known_hash, file_hash, packed in rows]
+
+    def mark_merged(self, paths: Iterable[str]):
+        """Record that tasks were merged and drop results no unmerged task needs"""
+        self._transaction(
+            [("UPDATE tasks SET merged = 1 WHERE path = ? AND state = 'done'", (path,)) for path in paths]
+            + [("""DELETE FROM results WHERE NOT EXISTS
+                     (SELECT 1 FROM tasks t WHERE t.path = results.path AND t.hash = results.hash
+                      AND t.state = 'done' AND t.merged = 0)""", ())]
+        )
+
+    def heartbeat(self, coordinator: str):
+        """Record that a coordinator is running and may still queue or wait for tasks"""
+        self._transaction([("INSERT OR REPLACE INTO meta (key, value) VALUES ('coordinator', ?)",
+                            (json.dumps([coordinator, time.time(), None]),))])
+
+    def release(self, coordinator: str):
+        """Record that a coordinator stopped"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'coordinator'").fetchone()
+        if row and json.loads(row[0])[0] == coordinator:
+            self._transaction([("UPDATE meta SET value = ? WHERE key = 'coordinator'",
+                                (json.dumps([coordinator, json.loads(row[0])[1], time.time()]),))])
+
+    def coordinator_done(self, since: float, stale_after: float) -> bool:
+        """Whether a coordinator running at or after ``since`` has stopped, or sent no heartbeat for ``stale_after`` seconds
+
+        False while no coordinator has run since then, so a worker started
+        before its coordinator waits for it.
+        """
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'coordinator'").fetchone()
+        if not row:
+            return False
+        _, heartbeat, stopped = json.loads(row[0])
+        if stopped is not None:
+            return stopped >= since
+        return heartbeat >= since and time.time() - heartbeat >= stale_after
+
+    def outstanding(self) -> int:
+        """Tasks still pending or leased"""
+        return self.conn.execute("SELECT COUNT(*) FROM tasks WHERE state IN ('pending', 'leased')").fetchone()[0]
+
+    def counts(self) -> Dict[str, int]:
+        """Tasks per state, plus 'unmerged' done tasks"""
+        counts = {state: 0 for state in QUEUE_STATES}
+        counts.update(self.conn.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state"))
+        counts['unmerged'] = self.conn.execute(
+            "SELECT COUNT(*) FROM tasks WHERE state = 'done' AND merged = 0"
+        ).fetchone()[0]
+        return counts
+
+    def failures(self) -> List[Dict]:
+        """Tasks that failed for good, with their last error"""
+        return [{'path': path, 'attempts': attempts, 'error': error} for path, attempts, error in self.conn.execute(
+            "SELECT path, attempts, error FROM tasks WHERE state = 'failed' ORDER BY path"
+        )]
+
+    def purge_merged(self) -> int:
+        """Forget merged tasks once a coordinated run is complete"""
+        before = self.conn.total_changes
+        self._transaction([("DELETE FROM tasks WHERE merged = 1", ())])
+        return self.conn.total_changes - before
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()